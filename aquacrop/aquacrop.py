@@ -1,17 +1,349 @@
 import atexit
+import importlib.util
+import logging
 import os
 import platform
 import shutil
-import subprocess
 import tempfile
 import urllib.request
+import warnings
 import zipfile
-from datetime import date, datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.error import URLError
 
+from aquacrop.timing import PhaseTimer
+from aquacrop.utils.files import (
+    default_working_root,
+    record_writes,
+    render_in_memory,
+)
 from aquacrop.utils.julianDayConverter import calculateAquaCropJulianDay
 
+logger = logging.getLogger(__name__)
+
+
+def download_aquacrop_executable(
+    url: str, target_dir: str, verbose: bool = True
+) -> str:
+    """
+    Download and extract the AquaCrop executable from the given URL using built-in Python libraries
+
+    Args:
+        url: URL to download the zip file from
+        target_dir: Directory to extract the executable to
+        verbose: Whether to print progress messages
+
+    Returns:
+        Path to the extracted executable
+    """
+
+    if verbose:
+        print(f"Downloading AquaCrop executable from {url}")
+
+    # Create target directory if it doesn't exist
+    os.makedirs(target_dir, exist_ok=True)
+
+    # Download the zip file to a temporary file
+    with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as temp_file:
+        try:
+            with urllib.request.urlopen(url) as response:
+                # Copy the downloaded data to our temporary file
+                shutil.copyfileobj(response, temp_file)
+
+        except URLError as e:
+            raise RuntimeError(f"Failed to download from {url}: {e}")
+
+    try:
+        # Extract the zip file
+        with zipfile.ZipFile(temp_file.name, "r") as zip_ref:
+            zip_ref.extractall(target_dir)
+
+        # Determine the executable name based on platform
+        system = platform.system().lower()
+        if system == "windows":
+            exe_name = "aquacrop.exe"
+        else:
+            exe_name = "aquacrop"
+
+        # Find the extracted executable
+        for root, dirs, files in os.walk(target_dir):
+            if exe_name in files:
+                exe_path = os.path.join(root, exe_name)
+
+                # Set executable permissions on Unix-like systems
+                if system != "windows":
+                    import stat
+
+                    os.chmod(
+                        exe_path,
+                        os.stat(exe_path).st_mode
+                        | stat.S_IXUSR
+                        | stat.S_IXGRP
+                        | stat.S_IXOTH,
+                    )
+
+                if verbose:
+                    print(f"Extracted AquaCrop executable to {exe_path}")
+                return exe_path
+
+        raise FileNotFoundError(f"Could not find {exe_name} in the extracted files")
+
+    finally:
+        # Clean up the temporary file
+        os.unlink(temp_file.name)
+
+
+# Resolved executable paths by root directory, shared by the whole process
+_executable_cache: Dict[str, str] = {}
+
+
+def find_aquacrop_executable(
+    root_directory: Optional[str] = None, verbose: bool = True
+) -> str:
+    """
+    Find the appropriate AquaCrop executable for the current platform
+
+    The executable is looked up in ``<root_directory>/model/<platform>`` and
+    downloaded from the AquaCrop releases page when it is missing. The result
+    is cached for the process, so later calls skip the platform detection and
+    permission checks as long as the executable still exists.
+
+    Args:
+        root_directory: Directory containing the ``model`` folder (defaults to
+            the parent directory of the aquacrop package)
+        verbose: Whether to print progress messages
+
+    Returns:
+        Path to the AquaCrop executable
+    """
+    import stat
+
+    if root_directory is None:
+        root_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    cached = _executable_cache.get(root_directory)
+    if cached and os.path.exists(cached):
+        return cached
+
+    system = platform.system().lower()
+    arch = platform.machine()
+
+    if verbose:
+        print(f"Detected platform: {system} ({arch})")
+
+    # Build the expected path based on platform
+    model_dir = os.path.join(root_directory, "model")
+
+    if system == "linux":
+        platform_dir = os.path.join(model_dir, "linux")
+        exe_path = os.path.join(platform_dir, "aquacrop")
+        download_url = "https://github.com/KUL-RSDA/AquaCrop/releases/download/v7.2/aquacrop-7.2-x86_64-linux.zip"
+    elif system == "darwin":  # macOS
+        platform_dir = os.path.join(model_dir, "macOS")
+        exe_path = os.path.join(platform_dir, "aquacrop")
+        download_url = "https://github.com/KUL-RSDA/AquaCrop/releases/download/v7.2/aquacrop-7.2-x86_64-macos.zip"
+    elif system == "windows":
+        platform_dir = os.path.join(model_dir, "windows")
+        exe_path = os.path.join(platform_dir, "aquacrop.exe")
+        download_url = "https://github.com/KUL-RSDA/AquaCrop/releases/download/v7.2/aquacrop-7.2-x86_64-windows.zip"
+    else:
+        raise RuntimeError(f"Unsupported platform: {system}")
+
+    if verbose:
+        print(f"Looking for executable at: {exe_path}")
+
+    # If executable doesn't exist, download it
+    if not os.path.exists(exe_path):
+        if verbose:
+            print(
+                f"AquaCrop executable not found at {exe_path}. Downloading from {download_url}"
+            )
+
+        try:
+            # Ensure the platform directory exists
+            os.makedirs(platform_dir, exist_ok=True)
+
+            # Try to download the executable
+            exe_path = download_aquacrop_executable(
+                download_url, platform_dir, verbose=verbose
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to download AquaCrop executable: {e}")
+
+    # Check if the file is executable
+    if not os.access(exe_path, os.X_OK) and system != "windows":
+        if verbose:
+            print(
+                f"Warning: The file at {exe_path} exists but is not marked as executable. Setting executable permissions."
+            )
+        os.chmod(
+            exe_path,
+            os.stat(exe_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH,
+        )
+
+    _executable_cache[root_directory] = exe_path
+    return exe_path
+
+
+def install_aquacrop_executable(executable_path: str, working_dir: str) -> str:
+    """
+    Place the AquaCrop executable into a working directory
+
+    AquaCrop requires the executable to be in the same directory as the input
+    files. The executable is hardlinked, or symlinked when hardlinks are not
+    possible (e.g. across file systems), and only copied as a last resort, so
+    that every run does not write a full copy of the binary.
+
+    Args:
+        executable_path: Path to the AquaCrop executable
+        working_dir: Working directory of the simulation
+
+    Returns:
+        Path to the executable inside the working directory
+    """
+    executable_path = os.path.abspath(executable_path)
+    destination = os.path.join(working_dir, os.path.basename(executable_path))
+
+    if os.path.lexists(destination):
+        # Already in place (e.g. a reused working directory)
+        if os.path.exists(destination) and os.path.samefile(
+            executable_path, destination
+        ):
+            return destination
+        os.remove(destination)
+
+    for place in (os.link, os.symlink):
+        try:
+            place(executable_path, destination)
+        except OSError:
+            continue
+        if os.access(destination, os.X_OK) or platform.system() == "Windows":
+            return destination
+        # Never chmod through a link, that would change the shared binary
+        os.remove(destination)
+        break
+
+    shutil.copy2(executable_path, destination)
+
+    # Make sure it's executable
+    os.chmod(destination, 0o755)
+
+    return destination
+
+
+def write_output_settings(
+    simul_dir: str,
+    daily: bool,
+    particular: bool,
+    daily_output_types: Optional[List[int]] = None,
+):
+    """
+    Write the DailyResults.SIM and ParticularResults.SIM output settings
+
+    Args:
+        simul_dir: SIMUL directory of the working directory
+        daily: Whether AquaCrop should write the daily output
+        particular: Whether AquaCrop should write the harvests and evaluation outputs
+        daily_output_types: Daily output types to enable (all when not given),
+            see output.daily_output_groups
+    """
+    from aquacrop.file_generators.SIMUL.daily_results_generator import (
+        generate_daily_results_settings,
+    )
+    from aquacrop.file_generators.SIMUL.particular_result_generator import (
+        generate_particular_results_settings,
+    )
+
+    if daily:
+        generate_daily_results_settings(
+            file_path=os.path.join(simul_dir, "DailyResults.SIM"),
+            output_types=(
+                daily_output_types
+                if daily_output_types is not None
+                else [1, 2, 3, 4, 5, 6, 7, 8]  # Enable all output types
+            ),
+        )
+
+    if particular:
+        generate_particular_results_settings(
+            file_path=os.path.join(simul_dir, "ParticularResults.SIM"),
+            output_types=[1, 2],  # Enable both harvest and evaluation outputs
+        )
+
+
+# File formats of AquaCrop.save_results
+RESULT_FORMATS = ("csv", "parquet", "feather")
+
+
+def _write_table(df, path: str, file_format: str, compression: Optional[str]):
+    """Write a DataFrame to path (without extension) in one of RESULT_FORMATS"""
+    if file_format == "csv":
+        df.to_csv(f"{path}.csv", index=False)
+        return
+
+    if not df.columns.is_unique:
+        # Arrow needs unique names, repeated ones get a suffix as in the parser
+        counts = {}
+        names = []
+        for name in df.columns:
+            names.append(f"{name}_{counts[name]}" if name in counts else name)
+            counts[name] = counts.get(name, 0) + 1
+        df = df.copy(deep=False)
+        df.columns = names
+
+    if file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        pq.write_table(
+            pa.Table.from_pandas(df, preserve_index=False),
+            f"{path}.parquet",
+            compression=compression,
+        )
+    else:
+        import pyarrow.feather as feather
+
+        feather.write_feather(df, f"{path}.feather", compression=compression)
+
+
+def _save_result_table(
+    data, output_dir: str, name: str, file_format: str, compression: Optional[str]
+):
+    """Save one result type, a DataFrame or a dictionary of DataFrames by run"""
+    if not isinstance(data, dict):
+        _write_table(data, os.path.join(output_dir, name), file_format, compression)
+        return
+
+    if file_format != "csv":
+        # One partition per run, without copying the runs into one table
+        for run_num, df in data.items():
+            partition = os.path.join(output_dir, name, f"Run={run_num}")
+            os.makedirs(partition, exist_ok=True)
+            _write_table(
+                df, os.path.join(partition, "part-0"), file_format, compression
+            )
+        return
+
+    for run_num, df in data.items():
+        _write_table(df, os.path.join(output_dir, f"{name}_run_{run_num}"), "csv", None)
+    if data:
+        import numpy as np
+        import pandas as pd
+
+        # Concatenated once, the run numbers are added without copying each run
+        combined = pd.concat(list(data.values()), ignore_index=True)
+        combined["Run"] = np.repeat(list(data), [len(df) for df in data.values()])
+        _write_table(
+            combined, os.path.join(output_dir, f"{name}_all_runs"), "csv", None
+        )
+
+
+# Subdirectories the AquaCrop executable expects in its working directory
+WORKING_SUBDIRECTORIES = ("DATA", "OUTP", "SIMUL", "LIST", "OBS", "PARAM")
+# Input files written by the last setup of a working directory, one path
+# relative to the working directory per line
+INPUTS_MANIFEST = "inputs.lst"
+
 
 class WeatherDataSufficiencyError(Exception):
     """Exception raised when weather data is insufficient for simulation period."""
@@ -49,6 +381,17 @@ class AquaCrop:
         need_seasonal_output=True,
         need_harvest_output=True,
         need_evaluation_output=True,
+        executable_path=None,
+        verbose=True,
+        input_cache=None,
+        climate_dir=None,
+        trim_weather=False,
+        weather_margin_days=0,
+        daily_columns=None,
+        compact_results=False,
+        result_cache=None,
+        executor=None,
+        timing_hook=None,
     ):
 
         # Handle both new simulation_periods approach and old separate parameters approach
@@ -80,6 +423,9 @@ class AquaCrop:
         self.irrigation = irrigation
         self.management = management
         self.climate = climate
+        if trim_weather and climate is not None:
+            # Only write (and validate) the records of the simulated window
+            self.climate = self._trim_weather(climate, weather_margin_days)
         self.calendar = calendar
         self.off_season = off_season
         self.observation = observation
@@ -92,15 +438,38 @@ class AquaCrop:
         self.working_dir = (
             os.path.abspath(working_dir)
             if working_dir
-            else tempfile.mkdtemp(prefix="aquacrop_")
+            else tempfile.mkdtemp(prefix="aquacrop_", dir=default_working_root())
         )
-        if self.working_dir is None:
-            self.working_dir = tempfile.mkdtemp(prefix="aquacrop_")
 
         self.need_daily_output = need_daily_output
+        # Optional subset of the daily columns; AquaCrop then only writes the
+        # output types holding them and only these columns are parsed
+        self.daily_columns = list(daily_columns) if daily_columns is not None else None
+        self.daily_output_types = None
+        if self.daily_columns is not None:
+            from aquacrop.output import daily_output_groups
+
+            self.daily_output_types = daily_output_groups(self.daily_columns)
+        # Parse results with small dtypes (see output.compact_frame)
+        self.compact_results = compact_results
+        self.result_cache = result_cache  # Optional cache.ResultCache
+        if executor is None:
+            from aquacrop.executors import SubprocessExecutor
+
+            executor = SubprocessExecutor()
+        self.executor = executor  # Backend running AquaCrop, see executors
+        self._result_key = None
+        # Timings of the phases of the last run, also attached to its results;
+        # timing_hook is called with each record (see timing.PhaseTimer)
+        self.timer = PhaseTimer(timing_hook)
         self.need_seasonal_output = need_seasonal_output
         self.need_harvest_output = need_harvest_output
         self.need_evaluation_output = need_evaluation_output
+        self.executable_path = executable_path
+        self.verbose = verbose
+        self.input_cache = input_cache  # Optional cache.InputFileCache
+        # Optional read-only store with the weather files (see Weather.generate_files)
+        self.climate_dir = os.path.abspath(climate_dir) if climate_dir else None
         self.results = None
 
         # Get the actual directory where the aquacrop package is installed
@@ -128,11 +497,36 @@ class AquaCrop:
             try:
                 shutil.rmtree(self.working_dir)
                 self.is_temp_dir = False  # Prevent multiple cleanup attempts
+                # Drop the atexit reference so long-lived processes can free us
+                atexit.unregister(self._cleanup)
             except Exception as e:
                 print(
                     f"Warning: Failed to clean up temporary directory {self.working_dir}: {e}"
                 )
 
+    def _trim_weather(self, climate, margin_days: int = 0):
+        """
+        Restrict the weather records to the simulation periods plus a margin
+
+        Weather that cannot be windowed (10-daily, monthly or not linked to a
+        specific year) is returned unchanged.
+
+        Args:
+            climate: Weather entity
+            margin_days: Extra days kept before and after the simulation
+
+        Returns:
+            Weather entity covering the simulation
+        """
+        if climate.record_type != 1 or climate.first_year == 1901:
+            return climate
+
+        return climate.window(
+            self.simulation_periods[0]["start_date"],
+            self.simulation_periods[-1]["end_date"],
+            margin_days=margin_days,
+        )
+
     def _check_weather_data_sufficiency(self) -> Dict[str, Any]:
         """
         Check if weather data is sufficient for the entire simulation period.
@@ -243,17 +637,13 @@ class AquaCrop:
 
     def _setup_working_dir(self):
         """Set up working directory with all necessary files"""
-        print(f"Setting up working directory at: {self.working_dir}")
+        self._log(f"Setting up working directory at: {self.working_dir}")
 
         # Create main directories
         if not self.working_dir:
             raise ValueError("Working directory is not set.")
-        os.makedirs(os.path.join(self.working_dir, "DATA"), exist_ok=True)
-        os.makedirs(os.path.join(self.working_dir, "OUTP"), exist_ok=True)
-        os.makedirs(os.path.join(self.working_dir, "SIMUL"), exist_ok=True)
-        os.makedirs(os.path.join(self.working_dir, "LIST"), exist_ok=True)
-        os.makedirs(os.path.join(self.working_dir, "OBS"), exist_ok=True)
-        os.makedirs(os.path.join(self.working_dir, "PARAM"), exist_ok=True)
+        for subdirectory in WORKING_SUBDIRECTORIES:
+            os.makedirs(os.path.join(self.working_dir, subdirectory), exist_ok=True)
 
         # Generate entity files
         data_dir = os.path.join(self.working_dir, "DATA")
@@ -262,65 +652,292 @@ class AquaCrop:
         param_dir = os.path.join(self.working_dir, "PARAM")
         simul_dir = os.path.join(self.working_dir, "SIMUL")
 
+        # Every file is rendered to memory first and written in one pass
+        with record_writes() as written, render_in_memory():
+            input_files = self._generate_input_files(data_dir, obs_dir)
+
+            # Generate parameter file if provided
+            if self.parameter:
+                self._generate_file(self.parameter, param_dir)
+
+            # Generate the project file with all periods
+            project_file = self._write_project_file(
+                os.path.join(list_dir, "PROJECT.PRM"), input_files
+            )
+
+            # Configure output settings
+            self._write_output_settings(simul_dir)
+
+        self._remove_stale_inputs(written)
+
+        # Return project file path
+        return project_file
+
+    def _remove_stale_inputs(self, written: Set[str]):
+        """
+        Remove the inputs of the previous setup that this one did not write
+
+        A reused working directory (see pool.WorkingDirPool) keeps the inputs
+        of its last run, so that identical files are not written again. Files
+        of that run this setup did not write (another irrigation file, a
+        parameter file AquaCrop would still find by project name, ...) must
+        not reach the simulation or the keys of its input files. Only files
+        listed in INPUTS_MANIFEST are removed, never files of the user.
+
+        Args:
+            written: Absolute paths written by this setup (see
+                utils.files.record_writes)
+        """
+        manifest = os.path.join(self.working_dir, INPUTS_MANIFEST)
+        working_dir = os.path.abspath(self.working_dir)
+        current = sorted(
+            os.path.relpath(path, working_dir)
+            for path in written
+            if os.path.dirname(path).startswith(working_dir + os.sep)
+        )
+
+        try:
+            with open(manifest, "r") as f:
+                previous = f.read().splitlines()
+        except FileNotFoundError:
+            previous = []
+
+        for relative_path in set(previous).difference(current):
+            path = os.path.join(working_dir, relative_path)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            # Drop project subdirectories left empty (e.g. DATA/<project>)
+            directory = os.path.dirname(path)
+            while os.path.dirname(directory) != working_dir and not os.listdir(
+                directory
+            ):
+                os.rmdir(directory)
+                directory = os.path.dirname(directory)
+
+        with open(manifest, "w") as f:
+            f.write("".join(f"{relative_path}\n" for relative_path in current))
+
+    def _setup_project(self, project_name: str) -> str:
+        """
+        Write the input files as one project of a shared working directory
+
+        The entity files go to DATA/<project_name>/ and OBS/<project_name>/ so
+        several projects can live next to each other, the project file is
+        LIST/<project_name>.PRM and the parameter file PARAM/<project_name>.PPn.
+        The working directory must already contain the AquaCrop subdirectories
+        and the output settings, see batch.run_multi_project.
+
+        Args:
+            project_name: Project name, used for the file names (and therefore
+                as the prefix of the output files: <project_name>PRMday.OUT, ...)
+
+        Returns:
+            Path to the project file
+        """
+        from aquacrop.file_generators.PARAM.ppn_generator import (
+            generate_parameter_file,
+        )
+
+        self._log(f"Setting up project {project_name} in: {self.working_dir}")
+
+        with render_in_memory():
+            input_files = self._generate_input_files(
+                os.path.join(self.working_dir, "DATA", project_name),
+                os.path.join(self.working_dir, "OBS", project_name),
+                co2_dir=os.path.join(self.working_dir, "SIMUL"),
+            )
+
+            # AquaCrop looks up the program parameters by project name
+            if self.parameter:
+                with self.timer.phase("generate", entity=type(self.parameter).__name__):
+                    generate_parameter_file(
+                        file_path=os.path.join(
+                            self.working_dir, "PARAM", f"{project_name}.PPn"
+                        ),
+                        params=self.parameter.params,
+                    )
+
+            return self._write_project_file(
+                os.path.join(self.working_dir, "LIST", f"{project_name}.PRM"),
+                input_files,
+                data_path=f"./DATA/{project_name}/",
+                obs_path=f"./OBS/{project_name}/",
+            )
+
+    def _generate_input_files(
+        self, data_dir: str, obs_dir: str, co2_dir: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate the input files of every entity
+
+        Args:
+            data_dir: Directory for the DATA files (climate, crop, soil, ...)
+            obs_dir: Directory for the observation file
+            co2_dir: Directory for the CO2 file (defaults to SIMUL next to data_dir)
+
+        Returns:
+            Dictionary with the generated file paths by entity ('climate' holds
+            the dictionary returned by Weather.generate_files, optional entities
+            that are not set map to None)
+        """
         # Generate climate files
         if self.climate is None:
             raise ValueError(
                 "Climate data is not provided. Please ensure 'self.climate' is set."
             )
-        climate_files = self.climate.generate_files(data_dir)
+        with self.timer.phase("generate", entity=type(self.climate).__name__):
+            if self.climate_dir:
+                climate_files = self._reference_climate_files(data_dir, co2_dir)
+            else:
+                climate_files = self._generate_climate_files(data_dir, co2_dir)
 
         # Generate crop file
         if self.crop is None:
             raise ValueError(
                 "Crop data is not provided. Please ensure 'self.crop' is set."
             )
-        crop_file = self.crop.generate_file(data_dir)
+        crop_file = self._generate_file(self.crop, data_dir)
 
         # Generate soil file
         if self.soil is None:
             raise ValueError(
                 "Soil data is not provided. Please ensure 'self.soil' is set."
             )
-        soil_file = self.soil.generate_file(data_dir)
+        soil_file = self._generate_file(self.soil, data_dir)
 
         # Generate irrigation file
         irrigation_file = None
         if self.irrigation:
-            irrigation_file = self.irrigation.generate_file(data_dir)
+            irrigation_file = self._generate_file(self.irrigation, data_dir)
 
         # Generate management file
         if self.management is None:
             raise ValueError(
                 "Management data is not provided. Please ensure 'self.management' is set."
             )
-        management_file = self.management.generate_file(data_dir)
-        # Generate parameter file if provided
-        if self.parameter:
-            self.parameter.generate_file(param_dir)
+        management_file = self._generate_file(self.management, data_dir)
 
         # Generate optional files if provided
         calendar_file = None
         if self.calendar:
-            calendar_file = self.calendar.generate_file(data_dir)
+            calendar_file = self._generate_file(self.calendar, data_dir)
 
         off_season_file = None
         if self.off_season:
-            off_season_file = self.off_season.generate_file(data_dir)
+            off_season_file = self._generate_file(self.off_season, data_dir)
 
         observation_file = None
         if self.observation:
-            observation_file = self.observation.generate_file(obs_dir)
+            observation_file = self._generate_file(self.observation, obs_dir)
 
         ground_water_file = None
         if self.ground_water:
-            ground_water_file = self.ground_water.generate_file(data_dir)
+            ground_water_file = self._generate_file(self.ground_water, data_dir)
 
         initial_conditions_file = None
         if self.initial_conditions:
-            initial_conditions_file = self.initial_conditions.generate_file(data_dir)
+            initial_conditions_file = self._generate_file(
+                self.initial_conditions, data_dir
+            )
 
-        # Generate project file
-        from aquacrop.file_generators.LIST.prm_generator import generate_project_file
+        return {
+            "climate": climate_files,
+            "crop": crop_file,
+            "soil": soil_file,
+            "irrigation": irrigation_file,
+            "management": management_file,
+            "calendar": calendar_file,
+            "off_season": off_season_file,
+            "observation": observation_file,
+            "ground_water": ground_water_file,
+            "initial_conditions": initial_conditions_file,
+        }
+
+    def _generate_file(self, entity, directory: str) -> str:
+        """Generate the file of an entity, through the input cache when set"""
+        with self.timer.phase("generate", entity=type(entity).__name__):
+            if self.input_cache is not None:
+                return self.input_cache.generate_file(entity, directory)
+            return entity.generate_file(directory)
+
+    def _generate_climate_files(
+        self, directory: str, co2_directory: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Generate the weather files, through the input cache when set"""
+        if self.input_cache is not None:
+            return self.input_cache.generate_files(
+                self.climate, directory, co2_directory=co2_directory
+            )
+        return self.climate.generate_files(directory, co2_directory=co2_directory)
+
+    def _reference_climate_files(
+        self, data_dir: str, co2_dir: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Use the weather files of the shared climate store instead of writing them
+
+        Only the CO2 file is written, as AquaCrop expects it in SIMUL/.
+
+        Args:
+            data_dir: DATA directory of the simulation
+            co2_dir: Directory for the CO2 file (defaults to SIMUL next to data_dir)
+
+        Returns:
+            Dictionary of file paths, as returned by Weather.generate_files
+
+        Raises:
+            FileNotFoundError: If a weather file is missing from the store
+        """
+        names = self.climate.file_names()
+        climate_files = {
+            key: os.path.join(self.climate_dir, names[key])
+            for key in ("climate", "temperature", "eto", "rainfall")
+        }
+        missing = [
+            os.path.basename(path)
+            for path in climate_files.values()
+            if not os.path.exists(path)
+        ]
+        if missing:
+            raise FileNotFoundError(
+                f"Climate store {self.climate_dir} is missing {', '.join(missing)}. "
+                f"Create it once with climate.generate_files({self.climate_dir!r})"
+            )
+
+        if co2_dir is None:
+            co2_dir = os.path.join(os.path.dirname(data_dir), "SIMUL")
+        climate_files["co2"] = self.climate.generate_co2_file(co2_dir)
+
+        return climate_files
+
+    def _build_periods(
+        self,
+        input_files: Dict[str, Any],
+        data_path: Optional[str] = None,
+        obs_path: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Build the project file period entries for all simulation periods
+
+        Args:
+            input_files: File paths as returned by _generate_input_files
+            data_path: Directory written in the project file for DATA files
+                (defaults to './DATA/')
+            obs_path: Directory written in the project file for the OBS file
+                (defaults to './OBS/')
+
+        Returns:
+            List of period dictionaries for generate_project_file
+        """
+        climate_files = input_files["climate"]
+        calendar_file = input_files["calendar"]
+        irrigation_file = input_files["irrigation"]
+        ground_water_file = input_files["ground_water"]
+        initial_conditions_file = input_files["initial_conditions"]
+        off_season_file = input_files["off_season"]
+        observation_file = input_files["observation"]
 
         # Initialize periods list
         periods = []
@@ -350,12 +967,12 @@ class AquaCrop:
                 "cal_file": (
                     os.path.basename(calendar_file) if calendar_file else "(None)"
                 ),
-                "cro_file": os.path.basename(crop_file),
+                "cro_file": os.path.basename(input_files["crop"]),
                 "irr_file": (
                     os.path.basename(irrigation_file) if irrigation_file else "(None)"
                 ),
-                "man_file": os.path.basename(management_file),
-                "sol_file": os.path.basename(soil_file),
+                "man_file": os.path.basename(input_files["management"]),
+                "sol_file": os.path.basename(input_files["soil"]),
                 "gwt_file": (
                     os.path.basename(ground_water_file)
                     if ground_water_file
@@ -378,37 +995,56 @@ class AquaCrop:
                     os.path.basename(observation_file) if observation_file else "(None)"
                 ),
             }
+            if data_path:
+                period["data_path"] = data_path
+            if obs_path:
+                period["obs_path"] = obs_path
+            if self.climate_dir:
+                # Weather files are read from the shared store
+                climate_path = os.path.join(self.climate_dir, "")
+                for kind in ("cli", "tnx", "eto", "plu"):
+                    period[f"{kind}_path"] = climate_path
             periods.append(period)
 
-        # Generate the project file with all periods
-        project_file = generate_project_file(
-            file_path=os.path.join(list_dir, "PROJECT.PRM"),
-            description=f"AquaCrop simulation for {os.path.basename(crop_file)}",
-            periods=periods,
-        )
+        return periods
 
-        # Configure output settings
-        from aquacrop.file_generators.SIMUL.daily_results_generator import (
-            generate_daily_results_settings,
-        )
-        from aquacrop.file_generators.SIMUL.particular_result_generator import (
-            generate_particular_results_settings,
-        )
+    def _write_project_file(
+        self,
+        file_path: str,
+        input_files: Dict[str, Any],
+        data_path: Optional[str] = None,
+        obs_path: Optional[str] = None,
+    ) -> str:
+        """Write the project (.PRM) file referencing the generated input files"""
+        from aquacrop.file_generators.LIST.prm_generator import generate_project_file
 
-        if self.need_daily_output:
-            generate_daily_results_settings(
-                file_path=os.path.join(simul_dir, "DailyResults.SIM"),
-                output_types=[1, 2, 3, 4, 5, 6, 7, 8],  # Enable all output types
+        with self.timer.phase("generate", entity="Project"):
+            return generate_project_file(
+                file_path=file_path,
+                description=f"AquaCrop simulation for {os.path.basename(input_files['crop'])}",
+                periods=self._build_periods(input_files, data_path, obs_path),
             )
 
-        if self.need_harvest_output or self.need_evaluation_output:
-            generate_particular_results_settings(
-                file_path=os.path.join(simul_dir, "ParticularResults.SIM"),
-                output_types=[1, 2],  # Enable both harvest and evaluation outputs
+    def _write_output_settings(self, simul_dir: str):
+        """Write the output settings needed by this simulation"""
+        with self.timer.phase("generate", entity="OutputSettings"):
+            write_output_settings(
+                simul_dir,
+                daily=self.need_daily_output,
+                particular=self.need_harvest_output or self.need_evaluation_output,
+                daily_output_types=self.daily_output_types,
             )
 
-        # Return project file path
-        return project_file
+    def _log(self, message: str):
+        """
+        Report progress on the 'aquacrop.aquacrop' logger
+
+        The message is also printed unless the simulation runs quietly
+        (verbose=False).
+        """
+        logger.info(message)
+        if self.verbose:
+            print(message)
 
     def _download_aquacrop_executable(self, url, target_dir):
         """
@@ -421,119 +1057,80 @@ class AquaCrop:
         Returns:
             Path to the extracted executable
         """
+        return download_aquacrop_executable(url, target_dir, verbose=self.verbose)
 
-        print(f"Downloading AquaCrop executable from {url}")
-
-        # Create target directory if it doesn't exist
-        os.makedirs(target_dir, exist_ok=True)
+    def _find_aquacrop_executable(self):
+        """Find the appropriate AquaCrop executable for the current platform"""
+        return find_aquacrop_executable(self.root_directory, verbose=self.verbose)
 
-        # Download the zip file to a temporary file
-        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as temp_file:
-            try:
-                with urllib.request.urlopen(url) as response:
-                    # Copy the downloaded data to our temporary file
-                    shutil.copyfileobj(response, temp_file)
+    def _prepare_run(
+        self, validate_data: bool, strict_validation: bool
+    ) -> Optional[Tuple[Optional[str], str]]:
+        """
+        Validate the inputs, set up the working directory and the executable
 
-            except URLError as e:
-                raise RuntimeError(f"Failed to download from {url}: {e}")
+        Returns:
+            Tuple of the executable installed in the working directory (None
+            when the executor does not need one) and the project file name,
+            or None when strict validation found insufficient weather data
+        """
+        # Each run gets its own timings, results of earlier runs keep theirs
+        self.timer = PhaseTimer(self.timer.hook)
 
-        try:
-            # Extract the zip file
-            with zipfile.ZipFile(temp_file.name, "r") as zip_ref:
-                zip_ref.extractall(target_dir)
-
-            # Determine the executable name based on platform
-            system = platform.system().lower()
-            if system == "windows":
-                exe_name = "aquacrop.exe"
-            else:
-                exe_name = "aquacrop"
-
-            # Find the extracted executable
-            for root, dirs, files in os.walk(target_dir):
-                if exe_name in files:
-                    exe_path = os.path.join(root, exe_name)
-
-                    # Set executable permissions on Unix-like systems
-                    if system != "windows":
-                        import stat
-
-                        os.chmod(
-                            exe_path,
-                            os.stat(exe_path).st_mode
-                            | stat.S_IXUSR
-                            | stat.S_IXGRP
-                            | stat.S_IXOTH,
+        # Validate weather data if requested
+        if validate_data:
+            with self.timer.phase("validation"):
+                data_status = self._validate_weather_data(strict=strict_validation)
+            if not data_status["all_sufficient"]:
+                self._log("Warning: Insufficient weather data for simulation period.")
+                for component in ["temperature", "eto", "rainfall"]:
+                    if not data_status[f"{component}_sufficient"]:
+                        self._log(
+                            f"  - {component.capitalize()}: has {data_status['available'][component]}, needs {data_status['required_entries']}"
                         )
+                if strict_validation:
+                    return None
 
-                    print(f"Extracted AquaCrop executable to {exe_path}")
-                    return exe_path
-
-            raise FileNotFoundError(f"Could not find {exe_name} in the extracted files")
-
-        finally:
-            # Clean up the temporary file
-            os.unlink(temp_file.name)
-
-    def _find_aquacrop_executable(self):
-        """Find the appropriate AquaCrop executable for the current platform"""
-        import os
-        import platform
-        import stat
+        # Set up working directory and files
+        with self.timer.phase("setup"):
+            project_file = self._setup_working_dir()
 
-        system = platform.system().lower()
-        arch = platform.machine()
+        self._log(f"Running AquaCrop simulation with project file: {project_file}")
+        if not self.executor.needs_executable:
+            return None, os.path.basename(project_file)
 
-        print(f"Detected platform: {system} ({arch})")
+        try:
+            # Find the AquaCrop executable
+            with self.timer.phase("executable_resolution") as details:
+                aquacrop_exe_source = (
+                    self.executable_path or self._find_aquacrop_executable()
+                )
+                details["executable"] = aquacrop_exe_source
 
-        # Build the expected path based on platform
-        model_dir = os.path.join(self.root_directory, "model")
-
-        if system == "linux":
-            platform_dir = os.path.join(model_dir, "linux")
-            exe_path = os.path.join(platform_dir, "aquacrop")
-            download_url = "https://github.com/KUL-RSDA/AquaCrop/releases/download/v7.2/aquacrop-7.2-x86_64-linux.zip"
-        elif system == "darwin":  # macOS
-            platform_dir = os.path.join(model_dir, "macOS")
-            exe_path = os.path.join(platform_dir, "aquacrop")
-            download_url = "https://github.com/KUL-RSDA/AquaCrop/releases/download/v7.2/aquacrop-7.2-x86_64-macos.zip"
-        elif system == "windows":
-            platform_dir = os.path.join(model_dir, "windows")
-            exe_path = os.path.join(platform_dir, "aquacrop.exe")
-            download_url = "https://github.com/KUL-RSDA/AquaCrop/releases/download/v7.2/aquacrop-7.2-x86_64-windows.zip"
-        else:
-            raise RuntimeError(f"Unsupported platform: {system}")
+            # Link the executable into the working directory
+            with self.timer.phase("executable_placement"):
+                aquacrop_exe_dest = install_aquacrop_executable(
+                    aquacrop_exe_source, self.working_dir
+                )
+        except Exception as e:
+            self._log(f"Error running AquaCrop: {e}")
+            raise
 
-        print(f"Looking for executable at: {exe_path}")
+        self._log(f"Using AquaCrop executable: {aquacrop_exe_dest}")
 
-        # If executable doesn't exist, download it
-        if not os.path.exists(exe_path):
-            print(
-                f"AquaCrop executable not found at {exe_path}. Downloading from {download_url}"
-            )
+        return aquacrop_exe_dest, os.path.basename(project_file)
 
-            try:
-                # Ensure the platform directory exists
-                os.makedirs(platform_dir, exist_ok=True)
+    def _finish_run(self, returncode: int, stderr: str):
+        """Check the exit status of AquaCrop and prepare the results"""
+        if returncode != 0:
+            raise RuntimeError(f"AquaCrop failed with code {returncode}: {stderr}")
 
-                # Try to download the executable
-                exe_path = self._download_aquacrop_executable(
-                    download_url, platform_dir
-                )
-            except Exception as e:
-                raise RuntimeError(f"Failed to download AquaCrop executable: {e}")
+        self._log("AquaCrop simulation completed successfully")
 
-        # Check if the file is executable
-        if not os.access(exe_path, os.X_OK) and system != "windows":
-            print(
-                f"Warning: The file at {exe_path} exists but is not marked as executable. Setting executable permissions."
-            )
-            os.chmod(
-                exe_path,
-                os.stat(exe_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH,
-            )
+        # Prepare the results, output files are parsed on demand
+        self._parse_results()
 
-        return exe_path
+        return self.results
 
     def run(self, validate_data: bool = True, strict_validation: bool = False):
         """
@@ -544,212 +1141,246 @@ class AquaCrop:
             strict_validation: If True, raise an error if weather data is insufficient
 
         Returns:
-            Simulation results
+            SimulationResults, with each section parsed on first access
 
         Raises:
             WeatherDataSufficiencyError: If weather data is insufficient and strict validation is enabled
         """
-        # Validate weather data if requested
-        if validate_data:
-            data_status = self._validate_weather_data(strict=strict_validation)
-            if not data_status["all_sufficient"]:
-                print("Warning: Insufficient weather data for simulation period.")
-                for component in ["temperature", "eto", "rainfall"]:
-                    if not data_status[f"{component}_sufficient"]:
-                        print(
-                            f"  - {component.capitalize()}: has {data_status['available'][component]}, needs {data_status['required_entries']}"
-                        )
-                if strict_validation:
-                    return None
+        prepared = self._prepare_run(validate_data, strict_validation)
+        if prepared is None:
+            return None
+        executable, project = prepared
+        if self._cached_results(executable) is not None:
+            return self.results
 
-        # Set up working directory and files
-        project_file = self._setup_working_dir()
+        # Run AquaCrop through the executor
+        try:
+            with self._execute_phase() as details:
+                execution = self.executor.execute(self.working_dir, project, executable)
+                details.update(
+                    returncode=execution.returncode,
+                    cpu_seconds=execution.cpu_seconds,
+                )
+            results = self._finish_run(execution.returncode, execution.stderr)
+            self._cache_results()
+            return results
 
-        print(f"Running AquaCrop simulation with project file: {project_file}")
+        except Exception as e:
+            self._log(f"Error running AquaCrop: {e}")
+            raise
 
-        # Run AquaCrop executable
-        try:
-            # Find the AquaCrop executable
-            aquacrop_exe_source = self._find_aquacrop_executable()
+    async def run_async(
+        self,
+        validate_data: bool = True,
+        strict_validation: bool = False,
+        executor=None,
+        load_results: bool = True,
+    ):
+        """
+        Run AquaCrop simulation without blocking the event loop
 
-            # Copy the executable to the working directory
-            # AquaCrop requires the executable to be in the same directory as the input files
-            aquacrop_exe_dest = os.path.join(
-                self.working_dir, os.path.basename(aquacrop_exe_source)
-            )
+        The input files are written and the results parsed in an executor,
+        and AquaCrop runs through Executor.execute_async of the backend (an
+        asyncio subprocess with SubprocessExecutor, which is killed if the
+        call is cancelled).
 
-            shutil.copy2(aquacrop_exe_source, aquacrop_exe_dest)
+        Args:
+            validate_data: Whether to validate weather data before running simulation
+            strict_validation: If True, raise an error if weather data is insufficient
+            executor: concurrent.futures executor for the blocking steps (the
+                default executor of the event loop when not given), not to be
+                confused with the backend running AquaCrop (self.executor)
+            load_results: Whether to parse every result section in the
+                executor, so that reading them later does not block
 
-            # Make sure it's executable
-            os.chmod(aquacrop_exe_dest, 0o755)
+        Returns:
+            SimulationResults, as returned by run()
 
-            print(f"Using AquaCrop executable: {aquacrop_exe_dest}")
+        Example:
+            results = await AquaCrop(...).run_async()
+        """
+        import asyncio
 
-            # Run AquaCrop with project file
-            result = subprocess.run(
-                [aquacrop_exe_dest, os.path.basename(project_file)],
-                cwd=self.working_dir,
-                capture_output=True,
-                text=True,
-            )
+        loop = asyncio.get_running_loop()
+        prepared = await loop.run_in_executor(
+            executor, self._prepare_run, validate_data, strict_validation
+        )
+        if prepared is None:
+            return None
+        executable, project = prepared
+        cached = await loop.run_in_executor(executor, self._cached_results, executable)
+        if cached is not None:
+            return cached
 
-            if result.returncode != 0:
-                raise RuntimeError(
-                    f"AquaCrop failed with code {result.returncode}: {result.stderr}"
+        try:
+            with self._execute_phase() as details:
+                execution = await self.executor.execute_async(
+                    self.working_dir, project, executable
+                )
+                details.update(
+                    returncode=execution.returncode,
+                    cpu_seconds=execution.cpu_seconds,
                 )
+            results = self._finish_run(execution.returncode, execution.stderr)
+        except Exception as e:
+            self._log(f"Error running AquaCrop: {e}")
+            raise
 
-            print(f"AquaCrop simulation completed successfully")
+        if load_results or self._result_key is not None:
+            await loop.run_in_executor(executor, results.load)
+        await loop.run_in_executor(executor, self._cache_results)
+        return results
+
+    def _execute_phase(self):
+        """Timer phase of the execution of AquaCrop by the backend"""
+        return self.timer.phase("execute", executor=type(self.executor).__name__)
+
+    def _result_sections(self) -> List[str]:
+        """Result sections requested by the need_*_output options"""
+        return [
+            section
+            for section, needed in (
+                ("day", self.need_daily_output),
+                ("season", self.need_seasonal_output),
+                ("harvests", self.need_harvest_output),
+                ("evaluation", self.need_evaluation_output),
+            )
+            if needed
+        ]
 
-            # Parse output files
-            self._parse_results()
+    def _cached_results(self, executable: str):
+        """
+        Look the simulation up in the result cache
 
-            return self.results
+        Must be called once the input files are written. The key is kept for
+        _cache_results.
 
-        except Exception as e:
-            print(f"Error running AquaCrop: {e}")
-            raise
+        Args:
+            executable: AquaCrop executable of the run (None when the executor
+                does not need one)
+
+        Returns:
+            Cached SimulationResults, or None on a miss (or without cache)
+        """
+        from aquacrop.output import SimulationResults
+
+        self._result_key = None
+        if self.result_cache is None:
+            return None
+
+        from aquacrop.executors import working_dir_input_files
+
+        # Weather files read from a shared store are included
+        input_files = working_dir_input_files(self.working_dir)
+
+        with self.timer.phase("result_cache", action="get") as details:
+            self._result_key = self.result_cache.key(
+                input_files,
+                executable,
+                {
+                    "sections": self._result_sections(),
+                    "daily_columns": self.daily_columns,
+                    "compact": self.compact_results,
+                    "executor": type(self.executor).__qualname__,
+                },
+            )
+            parsed = self.result_cache.get(self._result_key)
+            details["hit"] = parsed is not None
+        if parsed is None:
+            return None
+
+        self._log("Results found in the result cache")
+        self.results = SimulationResults.from_parsed(
+            parsed, compact=self.compact_results, timer=self.timer
+        )
+        return self.results
+
+    def _cache_results(self):
+        """Store the results of the run under the key of _cached_results"""
+        if self.result_cache is None or self._result_key is None:
+            return
+        self.results.load()
+        with self.timer.phase("result_cache", action="put"):
+            self.result_cache.put(
+                self._result_key,
+                {section: self.results[section] for section in self.results.sections},
+            )
 
-    def _parse_results(self):
-        """Parse AquaCrop output files and store results"""
-        from aquacrop.output import OutputReader
+    def _parse_results(self, prefix: Optional[str] = None):
+        """
+        Store the results of the simulation, parsed lazily from its output files
 
-        print(f"Parsing simulation results...")
+        Args:
+            prefix: Only parse the output files of the project with this output
+                prefix (used when several projects share a working directory)
+        """
+        from aquacrop.output import SimulationResults
+
+        # Each section is parsed when first read; the results keep this
+        # simulation (and so its temporary working directory) alive until then
+        self.results = SimulationResults(
+            os.path.join(self.working_dir, "OUTP"),
+            prefix=prefix,
+            sections=self._result_sections(),
+            day_columns=self.daily_columns,
+            owner=self,
+            compact=self.compact_results,
+            timer=self.timer,
+        )
 
-        # Create output reader and scan output directory
-        output_dir = os.path.join(self.working_dir, "OUTP")
-        reader = OutputReader(output_dir=output_dir)
-        reader.scan_directory()
+    def save_results(
+        self,
+        output_path=None,
+        file_format: str = "csv",
+        compression: Optional[str] = "zstd",
+    ):
+        """
+        Save results to the specified output directory
 
-        # Store results
-        self.results = {
-            "day": reader.get_day_data() if self.need_daily_output else None,
-            "season": reader.get_season_data() if self.need_seasonal_output else None,
-            "harvests": (
-                reader.get_harvests_data() if self.need_harvest_output else None
-            ),
-            "evaluation": {
-                "biomass": (
-                    reader.merge_biomass_evaluation()
-                    if self.need_evaluation_output
-                    else None
-                ),
-                "statistics": (
-                    reader.get_evaluation_statistics(assessment_type="biomass")
-                    if self.need_evaluation_output
-                    else None
-                ),
-            },
-        }
+        Each result type is written as a table named after it (daily_results,
+        seasonal_results, harvest_results, evaluation_biomass). Results with
+        several runs are written per run: as <name>_run_<n>.csv files plus a
+        combined <name>_all_runs.csv, or for the columnar formats as a dataset
+        partitioned by run (<name>/Run=<n>/part-0.parquet), which pyarrow and
+        pandas read back with the run as a column.
 
-        print(f"Results successfully parsed")
+        Args:
+            output_path: Output directory (defaults to working_dir/results)
+            file_format: 'csv', 'parquet' or 'feather'. The columnar formats
+                need pyarrow; without it the results are saved as CSV with a
+                warning.
+            compression: Compression codec of the columnar formats
 
-    def save_results(self, output_path=None):
-        """Save results to the specified output directory"""
+        Returns:
+            Path to the output directory
+        """
         if not self.results:
             raise ValueError("No results available. Run the simulation first.")
+        if file_format not in RESULT_FORMATS:
+            raise ValueError(
+                f"Unknown results format '{file_format}', use one of {RESULT_FORMATS}"
+            )
+        if file_format != "csv" and importlib.util.find_spec("pyarrow") is None:
+            warnings.warn(
+                f"pyarrow is not installed, saving results as CSV instead of {file_format}"
+            )
+            file_format = "csv"
 
         # Use the specified output path or default to working_dir/results
         output_dir = output_path or os.path.join(self.working_dir, "results")
         os.makedirs(output_dir, exist_ok=True)
 
-        print(f"Saving results to: {output_dir}")
-
-        # Save daily results (handling both single DataFrame and dictionary of DataFrames)
-        if self.results["day"] is not None:
-            if isinstance(self.results["day"], dict):
-                # For multiple runs, save each run to a separate file
-                for run_num, df in self.results["day"].items():
-                    run_file = os.path.join(
-                        output_dir, f"daily_results_run_{run_num}.csv"
-                    )
-                    df.to_csv(run_file, index=False)
-
-                # Also save a combined version if desired
-                from pandas import concat
-
-                all_runs = []
-                for run_num, df in self.results["day"].items():
-                    df_copy = df.copy()
-                    df_copy["Run"] = run_num
-                    all_runs.append(df_copy)
-
-                if all_runs:
-                    combined_df = concat(all_runs, ignore_index=True)
-                    combined_df.to_csv(
-                        os.path.join(output_dir, "daily_results_all_runs.csv"),
-                        index=False,
-                    )
-            else:
-                # Single DataFrame case (original behavior)
-                self.results["day"].to_csv(
-                    os.path.join(output_dir, "daily_results.csv"), index=False
-                )
-
-        # Handle other result types similarly...
-        if self.results["season"] is not None:
-            self.results["season"].to_csv(
-                os.path.join(output_dir, "seasonal_results.csv"), index=False
-            )
-
-        if self.results["harvests"] is not None:
-            if isinstance(self.results["harvests"], dict):
-                # For multiple runs, save each run to a separate file
-                for run_num, df in self.results["harvests"].items():
-                    run_file = os.path.join(
-                        output_dir, f"harvest_results_run_{run_num}.csv"
-                    )
-                    df.to_csv(run_file, index=False)
-
-                # Also save a combined version
-                all_runs = []
-                for run_num, df in self.results["harvests"].items():
-                    df_copy = df.copy()
-                    df_copy["Run"] = run_num
-                    all_runs.append(df_copy)
-
-                if all_runs:
-                    from pandas import concat
-
-                    combined_df = concat(all_runs, ignore_index=True)
-                    combined_df.to_csv(
-                        os.path.join(output_dir, "harvest_results_all_runs.csv"),
-                        index=False,
-                    )
-            else:
-                # Single DataFrame case
-                self.results["harvests"].to_csv(
-                    os.path.join(output_dir, "harvest_results.csv"), index=False
-                )
+        self._log(f"Saving results to: {output_dir}")
 
-        if self.results["evaluation"]["biomass"] is not None:
-            if isinstance(self.results["evaluation"]["biomass"], dict):
-                # For multiple runs, save each run to a separate file
-                for run_num, df in self.results["evaluation"]["biomass"].items():
-                    run_file = os.path.join(
-                        output_dir, f"evaluation_biomass_run_{run_num}.csv"
-                    )
-                    df.to_csv(run_file, index=False)
-
-                # Also save a combined version
-                all_runs = []
-                for run_num, df in self.results["evaluation"]["biomass"].items():
-                    df_copy = df.copy()
-                    df_copy["Run"] = run_num
-                    all_runs.append(df_copy)
-
-                if all_runs:
-                    from pandas import concat
-
-                    combined_df = concat(all_runs, ignore_index=True)
-                    combined_df.to_csv(
-                        os.path.join(output_dir, "evaluation_biomass_all_runs.csv"),
-                        index=False,
-                    )
-            else:
-                # Single DataFrame case
-                self.results["evaluation"]["biomass"].to_csv(
-                    os.path.join(output_dir, "evaluation_biomass.csv"), index=False
-                )
+        tables = [
+            ("daily_results", self.results["day"]),
+            ("seasonal_results", self.results["season"]),
+            ("harvest_results", self.results["harvests"]),
+            ("evaluation_biomass", self.results["evaluation"]["biomass"]),
+        ]
+        for name, data in tables:
+            if data is not None:
+                _save_result_table(data, output_dir, name, file_format, compression)
 
         # Save statistics as JSON
         if self.results["evaluation"]["statistics"] is not None:
@@ -758,5 +1389,5 @@ class AquaCrop:
             with open(os.path.join(output_dir, "evaluation_statistics.json"), "w") as f:
                 json.dump(self.results["evaluation"]["statistics"], f, indent=2)
 
-        print(f"Results successfully saved")
+        self._log("Results successfully saved")
         return output_dir
@@ -0,0 +1,539 @@
+"""
+Batch execution of many AquaCrop scenarios on a pool of worker processes
+(or concurrently from asyncio, see run_many_async)
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from aquacrop.aquacrop import (
+    WORKING_SUBDIRECTORIES,
+    AquaCrop,
+    find_aquacrop_executable,
+    install_aquacrop_executable,
+    write_output_settings,
+)
+from aquacrop.executors import Executor, SubprocessExecutor
+from aquacrop.pool import WorkingDirPool
+from aquacrop.utils.files import default_working_root
+
+# Working directory pool of the current (worker) process, see run_many
+_worker_pool: Optional[WorkingDirPool] = None
+
+
+@dataclass
+class ScenarioResult:
+    """
+    Outcome of a single scenario run by run_many
+    """
+
+    key: Any  # Scenario key (mapping key or position in the input sequence)
+    # Parsed results as returned by AquaCrop.run(), or what the extract
+    # function of run_many made of them
+    results: Optional[Any] = None
+    error: Optional[str] = None  # Formatted traceback when the scenario failed
+
+    @property
+    def ok(self) -> bool:
+        """Whether the scenario completed without raising"""
+        return self.error is None
+
+
+def _iter_configs(
+    configs: Union[Mapping[Any, Dict], Iterable[Dict]],
+) -> Iterator[Tuple[Any, Dict]]:
+    """Yield (key, config) pairs from a mapping or a plain sequence of configs"""
+    if isinstance(configs, Mapping):
+        yield from configs.items()
+    else:
+        yield from enumerate(configs)
+
+
+def _init_worker_pool(executable_path: str):
+    """Give the current process its own single-directory working pool"""
+    import multiprocessing.util
+
+    global _worker_pool
+    _worker_pool = WorkingDirPool(size=1, executable_path=executable_path)
+    # Worker processes end without running atexit handlers
+    multiprocessing.util.Finalize(_worker_pool, _worker_pool.close, exitpriority=10)
+
+
+def run_scenario(
+    key: Any,
+    config: Dict,
+    run_options: Optional[Dict] = None,
+    executable_path: Optional[str] = None,
+    extract: Optional[Callable[[Any], Any]] = None,
+) -> ScenarioResult:
+    """
+    Set up, run and parse one scenario in its own working directory
+
+    Any exception is caught and recorded on the returned ScenarioResult so
+    that a failing scenario never interrupts the rest of a batch. When the
+    process has a working directory pool (see run_many) and the config does
+    not set working_dir, the scenario runs in a leased pool directory.
+
+    Args:
+        key: Scenario key reported back on the result
+        config: Keyword arguments for AquaCrop (simulation_periods, crop, soil, ...)
+        run_options: Keyword arguments for AquaCrop.run()
+        executable_path: Pre-resolved AquaCrop executable
+        extract: Function reducing the results (see run_many)
+
+    Returns:
+        ScenarioResult with either the parsed results or the error traceback
+    """
+    if _worker_pool is not None and not config.get("working_dir"):
+        with _worker_pool.lease() as working_dir:
+            return _run_scenario(
+                key,
+                dict(config, working_dir=working_dir),
+                run_options,
+                executable_path,
+                extract,
+            )
+    return _run_scenario(key, config, run_options, executable_path, extract)
+
+
+def _run_scenario(
+    key: Any,
+    config: Dict,
+    run_options: Optional[Dict],
+    executable_path: Optional[str],
+    extract: Optional[Callable[[Any], Any]] = None,
+) -> ScenarioResult:
+    """Run one scenario, see run_scenario"""
+    simulation = None
+    try:
+        options = {"verbose": False, "executable_path": executable_path}
+        options.update(config)
+        simulation = AquaCrop(**options)
+        results = simulation.run(**(run_options or {}))
+        if extract is not None:
+            # Reduced before the working directory is removed or reused, only
+            # the extracted value is sent back
+            results = extract(results)
+        elif results is not None:
+            # Parse before the working directory is removed or reused
+            results.load()
+        return ScenarioResult(key=key, results=results)
+    except Exception:
+        return ScenarioResult(key=key, error=traceback.format_exc())
+    finally:
+        if simulation is not None:
+            simulation._cleanup()
+
+
+def run_many(
+    configs: Union[Mapping[Any, Dict], Iterable[Dict]],
+    workers: Optional[int] = None,
+    run_options: Optional[Dict] = None,
+    executable_path: Optional[str] = None,
+    max_pending: Optional[int] = None,
+    reuse_working_dirs: bool = False,
+    backend: Optional[Executor] = None,
+    extract: Optional[Callable[[Any], Any]] = None,
+) -> Iterator[ScenarioResult]:
+    """
+    Run many AquaCrop scenarios in parallel and stream their results
+
+    Each scenario is run by a worker process in its own working directory
+    (setup, executable and parsing). Results are yielded as soon as each
+    scenario finishes, so the order is not the input order; use
+    ScenarioResult.key to match them. Failed scenarios are yielded with
+    their error instead of stopping the batch.
+
+    Args:
+        configs: Mapping of scenario key to AquaCrop keyword arguments, or an
+            iterable of such dictionaries (keys are then their positions)
+        workers: Number of worker processes (defaults to the CPU count);
+            1 runs every scenario in the current process
+        run_options: Keyword arguments passed to every AquaCrop.run() call
+        executable_path: AquaCrop executable to use. Resolved once here when
+            not given, instead of once per scenario
+        max_pending: Maximum number of scenarios submitted but not yet
+            collected (defaults to four per worker), which bounds memory use
+            for very large batches
+        reuse_working_dirs: Give every worker a pre-built working directory
+            (see WorkingDirPool) that is reset between scenarios instead of
+            creating and removing a temporary directory per scenario
+        backend: Executor running AquaCrop for the scenarios that do not set
+            their own 'executor' (see aquacrop.executors). The executable is
+            not resolved when the backend does not need it.
+        extract: Function called in the worker with the results of each
+            scenario (None when strict validation skipped it); its return
+            value replaces ScenarioResult.results. Large studies use it to
+            send back a few numbers instead of whole tables. Must be
+            picklable (a module-level function or functools.partial of one)
+            when workers > 1.
+
+    Yields:
+        ScenarioResult for every scenario, in completion order
+    """
+    if executable_path is None and (backend is None or backend.needs_executable):
+        executable_path = find_aquacrop_executable(verbose=False)
+
+    workers = workers or os.cpu_count() or 1
+    scenarios = _iter_configs(configs)
+    if backend is not None:
+        scenarios = (
+            (key, dict({"executor": backend}, **config)) for key, config in scenarios
+        )
+
+    if workers == 1:
+        global _worker_pool
+        previous_pool = _worker_pool
+        if reuse_working_dirs:
+            _worker_pool = WorkingDirPool(size=1, executable_path=executable_path)
+        try:
+            for key, config in scenarios:
+                yield run_scenario(key, config, run_options, executable_path, extract)
+        finally:
+            if _worker_pool is not previous_pool:
+                _worker_pool.close()
+            _worker_pool = previous_pool
+        return
+
+    pool_options = {}
+    if reuse_working_dirs:
+        pool_options = {
+            "initializer": _init_worker_pool,
+            "initargs": (executable_path,),
+        }
+
+    max_pending = max_pending or workers * 4
+    with ProcessPoolExecutor(max_workers=workers, **pool_options) as process_pool:
+        # Scenario key of every submitted future
+        pending: Dict[Future, Any] = {}
+        exhausted = False
+        while pending or not exhausted:
+            # Keep the pool fed without materializing every submission at once
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    key, config = next(scenarios)
+                except StopIteration:
+                    exhausted = True
+                    break
+                try:
+                    future = process_pool.submit(
+                        run_scenario,
+                        key,
+                        config,
+                        run_options,
+                        executable_path,
+                        extract,
+                    )
+                except BrokenProcessPool:
+                    # A worker died, the pool takes no more scenarios
+                    yield ScenarioResult(key=key, error=traceback.format_exc())
+                    continue
+                pending[future] = key
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
+                try:
+                    yield future.result()
+                except Exception:
+                    # Crashed worker or result that could not be unpickled
+                    yield ScenarioResult(key=key, error=traceback.format_exc())
+
+
+async def run_scenario_async(
+    key: Any,
+    config: Dict,
+    run_options: Optional[Dict] = None,
+    executable_path: Optional[str] = None,
+    executor=None,
+) -> ScenarioResult:
+    """
+    Run a single scenario with AquaCrop.run_async, capturing any failure
+
+    Args:
+        key: Identifier of the scenario, returned in the result
+        config: Keyword arguments for AquaCrop (simulation_periods, crop, soil, ...)
+        run_options: Keyword arguments for AquaCrop.run_async()
+        executable_path: Pre-resolved AquaCrop executable
+        executor: Executor for the blocking steps (see AquaCrop.run_async)
+
+    Returns:
+        ScenarioResult with either the parsed results or the error traceback
+    """
+    import asyncio
+
+    simulation = None
+    try:
+        options = {"verbose": False, "executable_path": executable_path}
+        options.update(config)
+        simulation = AquaCrop(**options)
+        results = await simulation.run_async(executor=executor, **(run_options or {}))
+        if results is not None:
+            # Parse before the working directory is removed
+            await asyncio.get_running_loop().run_in_executor(executor, results.load)
+        return ScenarioResult(key=key, results=results)
+    except Exception:
+        return ScenarioResult(key=key, error=traceback.format_exc())
+    finally:
+        if simulation is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                executor, simulation._cleanup
+            )
+
+
+async def run_many_async(
+    configs: Union[Mapping[Any, Dict], Iterable[Dict]],
+    concurrency: Optional[int] = None,
+    run_options: Optional[Dict] = None,
+    executable_path: Optional[str] = None,
+    executor=None,
+    semaphore=None,
+) -> AsyncIterator[ScenarioResult]:
+    """
+    Run many AquaCrop scenarios concurrently from asyncio and stream the results
+
+    Scenarios are started as AquaCrop subprocesses while a semaphore allows
+    it, so the event loop stays free and at most that many simulations run
+    at once. Like run_many, results come in completion order and failed
+    scenarios are yielded with their error.
+
+    Args:
+        configs: Mapping of scenario key to AquaCrop keyword arguments, or an
+            iterable of such dictionaries (keys are then their positions)
+        concurrency: Maximum number of simultaneous simulations (defaults to
+            the CPU count), ignored when semaphore is given
+        run_options: Keyword arguments passed to every AquaCrop.run_async() call
+        executable_path: AquaCrop executable to use (resolved once when not given)
+        executor: Executor for the blocking steps (see AquaCrop.run_async)
+        semaphore: asyncio.Semaphore shared with other callers, to limit the
+            simulations of a whole service instead of one batch
+
+    Yields:
+        ScenarioResult for every scenario, in completion order
+
+    Example:
+        async for result in run_many_async(configs, concurrency=8):
+            ...
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    if executable_path is None:
+        executable_path = await loop.run_in_executor(
+            executor, lambda: find_aquacrop_executable(verbose=False)
+        )
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(concurrency or os.cpu_count() or 1)
+
+    pending = set()
+    try:
+        for key, config in _iter_configs(configs):
+            # Only start a scenario when a slot is free, which also bounds the
+            # number of tasks for very large batches
+            await semaphore.acquire()
+            task = asyncio.ensure_future(
+                run_scenario_async(key, config, run_options, executable_path, executor)
+            )
+            # Released even when the task is cancelled before it starts
+            task.add_done_callback(lambda _: semaphore.release())
+            pending.add(task)
+
+            finished = {task for task in pending if task.done()}
+            pending -= finished
+            for task in finished:
+                yield task.result()
+
+        while pending:
+            finished, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in finished:
+                yield task.result()
+    finally:
+        # The consumer stopped early or was cancelled
+        for task in pending:
+            task.cancel()
+
+
+def _project_names(keys: List[Any]) -> List[str]:
+    """Derive unique, file-system safe project names from scenario keys"""
+    names = []
+    used = set()
+    for position, key in enumerate(keys):
+        name = re.sub(r"[^A-Za-z0-9_-]", "_", str(key)) or f"P{position}"
+        candidate, suffix = name, position
+        # The suffixed name may be the name of another key ('a_2')
+        while candidate.lower() in used:
+            candidate = f"{name}_{suffix}"
+            suffix += 1
+        name = candidate
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+def run_multi_project(
+    configs: Union[Mapping[Any, Dict], Iterable[Dict]],
+    working_dir: Optional[str] = None,
+    executable_path: Optional[str] = None,
+    validate_data: bool = True,
+    strict_validation: bool = False,
+    executor: Optional[Executor] = None,
+) -> List[ScenarioResult]:
+    """
+    Run many scenarios as projects of a single AquaCrop invocation
+
+    AquaCrop loads every project file found in LIST/, so all scenarios are
+    written to one working directory (one LIST/<project>.PRM per scenario,
+    with its input files in DATA/<project>/) and the executable is started
+    once. The <project>PRMday.OUT, season and harvests outputs are then split
+    back per scenario. This avoids the process start-up and directory set-up
+    of every scenario, which dominate short seasonal runs.
+
+    All scenarios share the SIMUL directory, so they must use the same CO2
+    records and get the same output settings (the union of what the
+    scenarios need).
+
+    Args:
+        configs: Mapping of scenario key to AquaCrop keyword arguments, or an
+            iterable of such dictionaries (keys are then their positions)
+        working_dir: Shared working directory (a temporary directory that is
+            removed afterwards when not given)
+        executable_path: AquaCrop executable to use (resolved when not given)
+        validate_data: Whether to validate weather data before running
+        strict_validation: If True, scenarios with insufficient weather data
+            are reported as failed instead of being run
+        executor: Backend running AquaCrop on the shared working directory
+            (a SubprocessExecutor when not given, see aquacrop.executors)
+
+    Returns:
+        ScenarioResult for every scenario, in input order
+
+    Raises:
+        ValueError: If the scenarios use different CO2 records
+        RuntimeError: If the AquaCrop executable fails
+    """
+    scenarios = list(_iter_configs(configs))
+    names = _project_names([key for key, _ in scenarios])
+
+    is_temp_dir = working_dir is None
+    working_dir = os.path.abspath(
+        working_dir or tempfile.mkdtemp(prefix="aquacrop_", dir=default_working_root())
+    )
+
+    try:
+        for subdirectory in WORKING_SUBDIRECTORIES:
+            os.makedirs(os.path.join(working_dir, subdirectory), exist_ok=True)
+
+        # Only one MaunaLoa.CO2 can exist in SIMUL/
+        co2_records = {
+            repr(config["climate"].co2_records)
+            for _, config in scenarios
+            if config.get("climate") is not None
+        }
+        if len(co2_records) > 1:
+            raise ValueError(
+                "All scenarios of a multi-project run must use the same CO2 records"
+            )
+
+        # Write every scenario as a project of the shared working directory
+        results: Dict[str, ScenarioResult] = {}
+        simulations: Dict[str, AquaCrop] = {}
+        for (key, config), name in zip(scenarios, names):
+            try:
+                options = {"verbose": False}
+                options.update(config)
+                options["working_dir"] = working_dir
+                simulation = AquaCrop(**options)
+                if validate_data:
+                    status = simulation._validate_weather_data(strict=strict_validation)
+                    if strict_validation and not status["all_sufficient"]:
+                        raise ValueError("Insufficient weather data for simulation")
+                simulation._setup_project(name)
+                simulations[name] = simulation
+            except Exception:
+                results[name] = ScenarioResult(key=key, error=traceback.format_exc())
+
+        if simulations:
+            # One set of output settings is shared by all projects, the daily
+            # output holds the columns of every project
+            daily_types = [
+                s.daily_output_types
+                for s in simulations.values()
+                if s.need_daily_output
+            ]
+            write_output_settings(
+                os.path.join(working_dir, "SIMUL"),
+                daily=any(s.need_daily_output for s in simulations.values()),
+                particular=any(
+                    s.need_harvest_output or s.need_evaluation_output
+                    for s in simulations.values()
+                ),
+                daily_output_types=(
+                    None if None in daily_types else sorted(set().union(*daily_types))
+                ),
+            )
+
+            if executor is None:
+                executor = SubprocessExecutor()
+            executable = None
+            if executor.needs_executable:
+                if executable_path is None:
+                    executable_path = find_aquacrop_executable(verbose=False)
+                executable = install_aquacrop_executable(executable_path, working_dir)
+
+            # Without a project argument AquaCrop runs every project of LIST/
+            result = executor.execute(working_dir, executable=executable)
+            if result.returncode != 0:
+                raise RuntimeError(
+                    f"AquaCrop failed with code {result.returncode}: {result.stderr}"
+                )
+
+            for (key, _), name in zip(scenarios, names):
+                if name not in simulations:
+                    continue
+                try:
+                    simulation = simulations[name]
+                    output_dir = os.path.join(working_dir, "OUTP")
+                    if not any(
+                        filename.lower().startswith(f"{name.lower()}prm")
+                        for filename in os.listdir(output_dir)
+                    ):
+                        raise RuntimeError(f"AquaCrop produced no output for {name}")
+                    simulation._parse_results(prefix=f"{name}PRM")
+                    # Parse now, the shared directory may be removed below
+                    results[name] = ScenarioResult(
+                        key=key, results=simulation.results.load()
+                    )
+                except Exception:
+                    results[name] = ScenarioResult(
+                        key=key, error=traceback.format_exc()
+                    )
+
+        return [results[name] for name in names]
+
+    finally:
+        if is_temp_dir:
+            shutil.rmtree(working_dir, ignore_errors=True)
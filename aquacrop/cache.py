@@ -0,0 +1,426 @@
+"""
+Content-addressed caches of rendered AquaCrop input files and of results
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from aquacrop import __version__
+from aquacrop.utils.files import mark_written, render_in_memory
+
+# Bump when the rendering of any input file changes
+CACHE_FORMAT = 1
+
+
+def _update_fingerprint(digest, value: Any):
+    """Feed a canonical encoding of value into digest"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (date, datetime)):
+        digest.update(f"{type(value).__name__}:{value.isoformat()};".encode())
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}{{".encode())
+        for key in sorted(value, key=repr):
+            _update_fingerprint(digest, key)
+            _update_fingerprint(digest, value[key])
+        digest.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}[".encode())
+        for item in value:
+            _update_fingerprint(digest, item)
+        digest.update(b"]")
+    elif hasattr(value, "tobytes") and hasattr(value, "dtype"):
+        # numpy arrays and scalars
+        digest.update(f"array:{value.dtype}:{getattr(value, 'shape', ())};".encode())
+        digest.update(value.tobytes())
+    elif hasattr(value, "__dict__"):
+        cls = type(value)
+        digest.update(f"{cls.__module__}.{cls.__qualname__}(".encode())
+        _update_fingerprint(digest, vars(value))
+        digest.update(b")")
+    else:
+        raise TypeError(f"Cannot fingerprint value of type {type(value).__name__}")
+
+
+def fingerprint(entity: Any) -> str:
+    """
+    Compute a stable content fingerprint of an entity
+
+    Two entities of the same class with equal attributes (compared
+    recursively, including nested entities such as soil layers) get the same
+    fingerprint, across processes and sessions.
+
+    Args:
+        entity: Entity (Crop, Soil, Weather, ...)
+
+    Returns:
+        Hexadecimal SHA-256 digest
+    """
+    digest = hashlib.sha256(f"aquacrop:{__version__}:{CACHE_FORMAT};".encode())
+    _update_fingerprint(digest, entity)
+    return digest.hexdigest()
+
+
+def _link(source: str, target: str):
+    """
+    Hardlink source to target, copying when linking is not possible
+
+    A target already linked to source is kept. Either way the target counts
+    as written by the setup (see utils.files.record_writes), so a reused
+    working directory keeps it for the next run.
+    """
+    mark_written(target)
+    if os.path.lexists(target):
+        if os.path.exists(target) and os.path.samefile(source, target):
+            return
+        os.remove(target)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class InputFileCache:
+    """
+    On-disk cache of rendered input files keyed by entity fingerprint
+
+    Each entity is rendered once into <root>/<fingerprint>/ and its files are
+    hardlinked into the working directories afterwards, so entities shared by
+    many runs (crop, soil, weather, ...) are neither re-rendered nor rewritten.
+    Cached files must never be modified through a working directory: input
+    files are replaced by unlinking them first (see utils.files). They are
+    not made read-only, which would keep the links from being removed on
+    Windows.
+
+    Example:
+        cache = InputFileCache("/scratch/aquacrop_inputs")
+        AquaCrop(..., input_cache=cache).run()
+    """
+
+    # Subdirectories of a cache entry for the main and the CO2 directory
+    FILES = "files"
+    CO2 = "co2"
+    # File mapping the keys returned by the generate method to entry paths
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            root: Cache directory (a new temporary directory when not given)
+        """
+        self.root = os.path.abspath(root or tempfile.mkdtemp(prefix="aquacrop_inputs_"))
+        os.makedirs(self.root, exist_ok=True)
+
+    def _entry(self, entity: Any) -> Tuple[str, Dict[str, str]]:
+        """
+        Return the cache entry of an entity, rendering it when missing
+
+        Returns:
+            Tuple of the entry directory and its manifest, which maps the keys
+            returned by the entity's generate method to paths in the entry
+        """
+        entry = os.path.join(self.root, fingerprint(entity))
+        if not os.path.isdir(entry):
+            self._render(entity, entry)
+
+        with open(os.path.join(entry, self.MANIFEST), "r") as f:
+            return entry, json.load(f)
+
+    def _render(self, entity: Any, entry: str):
+        """Render the files of an entity into a new cache entry"""
+        # Render next to the entry and rename it into place, so concurrent
+        # processes never see a partially written entry
+        staging = tempfile.mkdtemp(prefix=".render_", dir=self.root)
+        try:
+            files_dir = os.path.join(staging, self.FILES)
+            # Written when the block exits, even inside an outer block
+            with render_in_memory():
+                if hasattr(entity, "generate_files"):
+                    generated = entity.generate_files(
+                        files_dir, co2_directory=os.path.join(staging, self.CO2)
+                    )
+                else:
+                    generated = {"file": entity.generate_file(files_dir)}
+
+            manifest = {
+                key: os.path.relpath(path, staging) for key, path in generated.items()
+            }
+            with open(os.path.join(staging, self.MANIFEST), "w") as f:
+                json.dump(manifest, f)
+
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another process stored the same entry first
+                if not os.path.isdir(entry):
+                    raise
+        finally:
+            if os.path.exists(staging):
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _place(
+        self, entry: str, relative_path: str, directory: str, co2_directory: str
+    ) -> str:
+        """Link one cached file to its place in the working directory"""
+        area, filename = os.path.split(relative_path)
+        target_dir = co2_directory if area == self.CO2 else directory
+        target = os.path.join(target_dir, filename)
+        _link(os.path.join(entry, relative_path), target)
+        return target
+
+    def generate_file(self, entity: Any, directory: str) -> str:
+        """
+        Cached equivalent of entity.generate_file(directory)
+
+        Args:
+            entity: Entity with a generate_file method
+            directory: Directory the file must appear in
+
+        Returns:
+            Path of the file in directory
+        """
+        entry, manifest = self._entry(entity)
+        return self._place(entry, manifest["file"], directory, directory)
+
+    def generate_files(
+        self, entity: Any, directory: str, co2_directory: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Cached equivalent of Weather.generate_files(directory, co2_directory)
+
+        Args:
+            entity: Weather entity
+            directory: Directory the weather files must appear in
+            co2_directory: Directory of the CO2 file (defaults to SIMUL next
+                to directory)
+
+        Returns:
+            Dictionary of file paths, as returned by Weather.generate_files
+        """
+        if co2_directory is None:
+            co2_directory = os.path.join(os.path.dirname(directory), "SIMUL")
+
+        entry, manifest = self._entry(entity)
+        return {
+            key: self._place(entry, relative_path, directory, co2_directory)
+            for key, relative_path in manifest.items()
+        }
+
+    def clear(self):
+        """Remove every cached entry"""
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+
+
+# Bump when the parsed results of identical outputs change (parser changes)
+RESULT_FORMAT = 1
+
+# Fingerprints of executables by (device, inode, size, mtime), see
+# executable_fingerprint
+_executable_fingerprints: Dict[Tuple[int, int, int, int], str] = {}
+
+
+def _update_file_digest(digest, path: str):
+    """Feed the content of a file into digest"""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+
+def executable_fingerprint(path: str) -> str:
+    """
+    Content fingerprint of an executable, computed once per file version
+
+    The file is identified by its inode rather than its path, so the links
+    placed in every working directory (see install_aquacrop_executable) share
+    the fingerprint of their source.
+
+    Args:
+        path: Path to the executable (links are followed)
+
+    Returns:
+        Hexadecimal SHA-256 digest of the file content
+    """
+    stat_result = os.stat(path)
+    version = (
+        stat_result.st_dev,
+        stat_result.st_ino,
+        stat_result.st_size,
+        stat_result.st_mtime_ns,
+    )
+    if version not in _executable_fingerprints:
+        digest = hashlib.sha256()
+        _update_file_digest(digest, path)
+        _executable_fingerprints[version] = digest.hexdigest()
+    return _executable_fingerprints[version]
+
+
+def _update_input_digest(digest, input_files: Dict[str, str]):
+    """Feed the names and contents of input files into digest"""
+    for name in sorted(input_files):
+        _update_fingerprint(digest, name)
+        _update_file_digest(digest, input_files[name])
+        digest.update(b";")
+
+
+def input_fingerprint(
+    input_files: Dict[str, str], options: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Content fingerprint of the input files of a simulation
+
+    Args:
+        input_files: Paths of the input files by name (their path relative to
+            the working directory, which the project file refers to)
+        options: Other settings to include in the fingerprint
+
+    Returns:
+        Hexadecimal SHA-256 digest
+    """
+    digest = hashlib.sha256(f"aquacrop-inputs:{CACHE_FORMAT};".encode())
+    _update_fingerprint(digest, options)
+    _update_input_digest(digest, input_files)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of parsed simulation results keyed by their inputs
+
+    The key is a hash of every input file AquaCrop reads, of the executable
+    and of the parse options, so a resubmitted scenario gets its results back
+    without running or parsing anything. Entries are compressed pickles;
+    once the cache exceeds max_bytes the least recently used ones are removed.
+
+    Example:
+        cache = ResultCache("/scratch/aquacrop_results", max_bytes=2 * 1024**3)
+        AquaCrop(..., result_cache=cache).run()
+    """
+
+    SUFFIX = ".pkl.gz"
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = 1024**3):
+        """
+        Initialize the cache
+
+        Args:
+            root: Cache directory (a new temporary directory when not given)
+            max_bytes: Total size of the entries above which the least
+                recently used ones are evicted
+        """
+        self.root = os.path.abspath(
+            root or tempfile.mkdtemp(prefix="aquacrop_results_")
+        )
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def key(
+        self,
+        input_files: Dict[str, str],
+        executable: Optional[str],
+        options: Dict[str, Any],
+    ) -> str:
+        """
+        Compute the key of a simulation
+
+        Args:
+            input_files: Paths of the input files by name (their path relative
+                to the working directory, which the project file refers to)
+            executable: Path to the AquaCrop executable (None for executors
+                without one, which should then be named in options)
+            options: Options changing the parsed results (sections, columns, ...)
+
+        Returns:
+            Hexadecimal SHA-256 digest
+        """
+        digest = hashlib.sha256(
+            f"aquacrop-results:{__version__}:{RESULT_FORMAT};".encode()
+        )
+        if executable is not None:
+            digest.update(executable_fingerprint(executable).encode())
+        _update_fingerprint(digest, options)
+        _update_input_digest(digest, input_files)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Path of the entry of a key"""
+        return os.path.join(self.root, key + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value of a key, or None
+
+        A hit marks the entry as recently used.
+        """
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store a value, then evict old entries if the cache is too large"""
+        fd, temporary = tempfile.mkstemp(prefix=".put_", dir=self.root)
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                filename="", fileobj=raw, mode="wb", compresslevel=6
+            ) as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self._path(key))
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        self._evict()
+
+    def _evict(self):
+        """Remove the least recently used entries beyond max_bytes"""
+        entries = []
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(self.SUFFIX):
+                try:
+                    stat_result = entry.stat()
+                except OSError:
+                    continue
+                entries.append(
+                    (stat_result.st_mtime_ns, stat_result.st_size, entry.path)
+                )
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached entries in bytes"""
+        return sum(
+            entry.stat().st_size
+            for entry in os.scandir(self.root)
+            if entry.name.endswith(self.SUFFIX)
+        )
+
+    def clear(self):
+        """Remove every cached entry"""
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
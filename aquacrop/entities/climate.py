@@ -1,5 +1,9 @@
 import os
-from typing import List, Dict, Any, Tuple, Optional
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Tuple, Optional, Union
+
+import numpy as np
+
 from aquacrop.file_generators.DATA.cli_generator import generate_climate_file
 from aquacrop.file_generators.DATA.tnx_generator import generate_temperature_file
 from aquacrop.file_generators.DATA.eto_generator import generate_eto_file
@@ -12,9 +16,9 @@ class Weather:
     rainfall and CO2 concentration
     """
     def __init__(self, location: str, 
-                 temperatures: List[Tuple[float, float]],  # List of (tmin, tmax) tuples
-                 eto_values: List[float],                 # List of ET0 values (mm/day)
-                 rainfall_values: List[float],            # List of rainfall values (mm)
+                 temperatures: Union[List[Tuple[float, float]], np.ndarray],  # (tmin, tmax) pairs
+                 eto_values: Union[List[float], np.ndarray],                 # ET0 values (mm/day)
+                 rainfall_values: Union[List[float], np.ndarray],            # Rainfall values (mm)
                  record_type: int = 1,                    # 1=daily, 2=10-daily, 3=monthly
                  first_day: int = 1,
                  first_month: int = 1,
@@ -25,9 +29,9 @@ class Weather:
         
         Args:
             location: Location name
-            temperatures: List of (tmin, tmax) tuples in °C
-            eto_values: List of reference evapotranspiration values in mm/day
-            rainfall_values: List of rainfall values in mm
+            temperatures: List of (tmin, tmax) tuples or array of shape (n, 2) in °C
+            eto_values: List or array of reference evapotranspiration values in mm/day
+            rainfall_values: List or array of rainfall values in mm
             record_type: Time step of records (1=daily, 2=10-daily, 3=monthly)
             first_day: First day of record
             first_month: First month of record
@@ -35,20 +39,28 @@ class Weather:
             co2_records: Optional list of (year, CO2 concentration) tuples
         """
         self.location = location
-        self.temperatures = temperatures
-        self.eto_values = eto_values
-        self.rainfall_values = rainfall_values
+        # Series are kept as float arrays (float64 inputs are not copied)
+        self.temperatures = np.asarray(temperatures, dtype=float).reshape(-1, 2)
+        self.eto_values = np.asarray(eto_values, dtype=float)
+        self.rainfall_values = np.asarray(rainfall_values, dtype=float)
         self.record_type = record_type
         self.first_day = first_day
         self.first_month = first_month
         self.first_year = first_year
         self.co2_records = co2_records
         
-    def generate_files(self, directory: str) -> Dict[str, str]:
-        """Generate all weather-related files in directory and return file paths"""
+    def generate_files(self, directory: str, co2_directory: Optional[str] = None) -> Dict[str, str]:
+        """
+        Generate all weather-related files in directory and return file paths
+
+        The CO2 file is written to co2_directory, which defaults to the SIMUL
+        directory next to directory.
+        """
+        names = self.file_names()
+
         # Generate temperature file
         tnx_file = generate_temperature_file(
-            file_path=f"{directory}/{self.location}.Tnx",
+            file_path=f"{directory}/{names['temperature']}",
             location=self.location,
             temperatures=self.temperatures,
             record_type=self.record_type,
@@ -59,7 +71,7 @@ class Weather:
         
         # Generate ETo file
         eto_file = generate_eto_file(
-            file_path=f"{directory}/{self.location}.ETo",
+            file_path=f"{directory}/{names['eto']}",
             location=self.location,
             eto_values=self.eto_values,
             record_type=self.record_type,
@@ -70,7 +82,7 @@ class Weather:
         
         # Generate rainfall file
         plu_file = generate_rainfall_file(
-            file_path=f"{directory}/{self.location}.PLU",
+            file_path=f"{directory}/{names['rainfall']}",
             location=self.location,
             rainfall_values=self.rainfall_values,
             record_type=self.record_type,
@@ -80,25 +92,18 @@ class Weather:
         )
         
         # Generate CO2 file
-        # TODO: This is a fortran bug, we need to call the file MaunaLoa.CO2
-        parent_directory = directory.split("/")[:-1]
-        co2_directory = os.path.join(os.path.dirname(directory), "SIMUL")
-
-        
-        co2_file = generate_co2_file(
-            file_path=os.path.join(co2_directory, "MaunaLoa.CO2"),
-            description=f"CO2 concentration for {self.location}",
-            records=self.co2_records
-        )
+        if co2_directory is None:
+            co2_directory = os.path.join(os.path.dirname(directory), "SIMUL")
+        co2_file = self.generate_co2_file(co2_directory)
         
         # Generate climate file that references the other files
         cli_file = generate_climate_file(
-            file_path=f"{directory}/{self.location}.CLI",
+            file_path=f"{directory}/{names['climate']}",
             location=self.location,
-            tnx_file=f"{self.location}.Tnx",
-            eto_file=f"{self.location}.ETo",
-            plu_file=f"{self.location}.PLU",
-            co2_file=f"MaunaLoa.CO2" # TODO: This is an error in the fortran code so we must call it like this
+            tnx_file=names['temperature'],
+            eto_file=names['eto'],
+            plu_file=names['rainfall'],
+            co2_file=names['co2']
         )
         
         return {
@@ -107,4 +112,69 @@ class Weather:
             'eto': eto_file,
             'rainfall': plu_file,
             'co2': co2_file
-        }
\ No newline at end of file
+        }
+
+    def window(self, start_date: date, end_date: date, margin_days: int = 0) -> "Weather":
+        """
+        Return a copy restricted to the records between two dates
+
+        The series are sliced without copying and the first day/month/year
+        are moved to the first record kept. The window is clipped to the
+        available records, so a series that does not cover it comes back
+        shorter (which the weather sufficiency check then reports).
+
+        Args:
+            start_date: First date needed
+            end_date: Last date needed
+            margin_days: Extra days kept before start_date and after end_date
+
+        Returns:
+            New Weather with the records of the window
+
+        Raises:
+            ValueError: If the records are not daily or not linked to a year
+        """
+        if self.record_type != 1:
+            raise ValueError("Only daily weather records can be windowed")
+        if self.first_year == 1901:
+            raise ValueError("Weather records not linked to a specific year cannot be windowed")
+
+        if isinstance(start_date, datetime):
+            start_date = start_date.date()
+        if isinstance(end_date, datetime):
+            end_date = end_date.date()
+
+        first_record = date(self.first_year, self.first_month, self.first_day)
+        first_index = max((start_date - timedelta(days=margin_days) - first_record).days, 0)
+        last_index = max((end_date + timedelta(days=margin_days) - first_record).days + 1, first_index)
+        first_kept = first_record + timedelta(days=first_index)
+
+        return Weather(
+            location=self.location,
+            temperatures=self.temperatures[first_index:last_index],
+            eto_values=self.eto_values[first_index:last_index],
+            rainfall_values=self.rainfall_values[first_index:last_index],
+            record_type=self.record_type,
+            first_day=first_kept.day,
+            first_month=first_kept.month,
+            first_year=first_kept.year,
+            co2_records=self.co2_records,
+        )
+
+    def file_names(self) -> Dict[str, str]:
+        """Return the names of the weather files, keyed like generate_files"""
+        return {
+            'climate': f"{self.location}.CLI",
+            'temperature': f"{self.location}.Tnx",
+            'eto': f"{self.location}.ETo",
+            'rainfall': f"{self.location}.PLU",
+            'co2': "MaunaLoa.CO2",  # TODO: This is a fortran bug, we need to call the file MaunaLoa.CO2
+        }
+
+    def generate_co2_file(self, directory: str) -> str:
+        """Generate the CO2 file in directory and return its path"""
+        return generate_co2_file(
+            file_path=os.path.join(directory, self.file_names()['co2']),
+            description=f"CO2 concentration for {self.location}",
+            records=self.co2_records
+        )
\ No newline at end of file
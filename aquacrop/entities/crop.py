@@ -2,9 +2,9 @@
 Crop file generator for AquaCrop (.CRO files) with parameter validation
 """
 
-import os
 from typing import Dict, Optional, List, Set, Any
 from aquacrop.constants import Constants
+from aquacrop.utils.files import write_text_file
 
 def validate_crop_parameters(params: Dict) -> List[str]:
     """
@@ -237,9 +237,7 @@ def generate_crop_file(
         content = "\n".join(lines)
         
         if file_path:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w') as f:
-                f.write(content)
+            write_text_file(file_path, content)
         
         return file_path
         
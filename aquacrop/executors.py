@@ -0,0 +1,331 @@
+"""
+Execution backends running AquaCrop on a prepared working directory
+
+AquaCrop.run() writes the input files, hands the working directory to an
+executor that must fill OUTP/, and parses the outputs. The executor is chosen
+with AquaCrop(executor=...):
+
+- SubprocessExecutor (default) runs the local AquaCrop executable
+- ReplayExecutor serves OUTP trees recorded earlier for identical inputs,
+  which runs the Python side without the Fortran binary (tests, CI,
+  benchmarks of the Python overhead)
+
+Custom backends (containers, remote workers, ...) subclass Executor.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from aquacrop.aquacrop import WORKING_SUBDIRECTORIES
+from aquacrop.timing import children_cpu_time
+
+
+@dataclass
+class ExecutionResult:
+    """
+    Outcome of one execution of AquaCrop
+    """
+
+    returncode: int  # 0 when AquaCrop completed
+    stdout: str = ""
+    stderr: str = ""
+    # CPU time (user + system) of the AquaCrop process, when the backend knows
+    cpu_seconds: Optional[float] = None
+
+
+def _external_input_files(working_dir: str) -> Dict[str, str]:
+    """
+    Input files read from outside a working directory
+
+    The project files of LIST/ give every input file as a name followed by
+    its quoted directory; files in absolute directories (e.g. the weather
+    files of a shared climate store) are outside the working directory.
+
+    Returns:
+        Paths of the existing external files, keyed by '<external>/<name>'
+    """
+    input_files = {}
+    list_dir = os.path.join(working_dir, "LIST")
+    if not os.path.isdir(list_dir):
+        return input_files
+    for entry in os.scandir(list_dir):
+        if not entry.name.upper().endswith(".PRM"):
+            continue
+        with open(entry.path) as f:
+            lines = [line.strip() for line in f]
+        for name, directory in zip(lines, lines[1:]):
+            if len(directory) < 2 or not directory[0] == directory[-1] == "'":
+                continue
+            path = os.path.join(directory[1:-1], name)
+            if os.path.isabs(path) and os.path.isfile(path):
+                input_files[f"<external>/{name}"] = path
+    return input_files
+
+
+def working_dir_input_files(working_dir: str) -> Dict[str, str]:
+    """
+    Input files of a working directory
+
+    A reused working directory only holds the inputs of its current setup:
+    files left by the previous run are removed once the new inputs are
+    written (see AquaCrop._remove_stale_inputs), so they never reach a key.
+
+    Args:
+        working_dir: AquaCrop working directory
+
+    Returns:
+        Paths of every file below the working directory except OUTP/, keyed by
+        their path relative to the working directory, and of the files its
+        projects read from other directories (see _external_input_files)
+    """
+    input_files = {}
+    for subdirectory in WORKING_SUBDIRECTORIES:
+        if subdirectory == "OUTP":
+            continue
+        top = os.path.join(working_dir, subdirectory)
+        for directory, _, filenames in os.walk(top):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                input_files[os.path.relpath(path, working_dir)] = path
+    input_files.update(_external_input_files(working_dir))
+    return input_files
+
+
+class Executor:
+    """
+    Base class of the execution backends
+
+    A backend gets a working directory with the input files in DATA/, LIST/,
+    SIMUL/, ... and must leave the AquaCrop outputs in its OUTP/ directory.
+    Subclasses implement execute, and execute_async when they can wait without
+    a thread. Executors are pickled into worker processes by batch.run_many,
+    so they should only hold picklable settings.
+
+    Example:
+        class DockerExecutor(Executor):
+            needs_executable = False
+
+            def execute(self, working_dir, project=None, executable=None):
+                result = subprocess.run(
+                    ["docker", "run", "-v", f"{working_dir}:/run", "aquacrop"],
+                    capture_output=True, text=True,
+                )
+                return ExecutionResult(result.returncode, result.stdout, result.stderr)
+    """
+
+    # Whether the AquaCrop executable must be installed in the working directory
+    needs_executable = True
+
+    def execute(
+        self,
+        working_dir: str,
+        project: Optional[str] = None,
+        executable: Optional[str] = None,
+    ) -> ExecutionResult:
+        """
+        Run AquaCrop on a working directory
+
+        Args:
+            working_dir: Working directory holding the input files
+            project: Project file of LIST/ to run (every project when not given)
+            executable: AquaCrop executable installed in the working directory
+                (None when needs_executable is False)
+
+        Returns:
+            ExecutionResult of the run
+        """
+        raise NotImplementedError("Executors must implement execute")
+
+    async def execute_async(
+        self,
+        working_dir: str,
+        project: Optional[str] = None,
+        executable: Optional[str] = None,
+    ) -> ExecutionResult:
+        """
+        Run AquaCrop without blocking the event loop (see execute)
+
+        The default implementation calls execute in a thread.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self.execute, working_dir, project, executable
+        )
+
+
+class SubprocessExecutor(Executor):
+    """
+    Run the local AquaCrop executable as a subprocess
+
+    The CPU time of AquaCrop is read from getrusage(RUSAGE_CHILDREN), which
+    covers every child of the process: it is only exact when no other child
+    process ends during the run (and None on Windows).
+    """
+
+    @staticmethod
+    def _cpu_seconds(cpu_before: Optional[float]) -> Optional[float]:
+        cpu_after = children_cpu_time()
+        if cpu_before is None or cpu_after is None:
+            return None
+        return cpu_after - cpu_before
+
+    @staticmethod
+    def _command(project: Optional[str], executable: Optional[str]):
+        if executable is None:
+            raise ValueError("SubprocessExecutor needs the AquaCrop executable")
+        return [executable] + ([project] if project else [])
+
+    def execute(
+        self,
+        working_dir: str,
+        project: Optional[str] = None,
+        executable: Optional[str] = None,
+    ) -> ExecutionResult:
+        cpu_before = children_cpu_time()
+        result = subprocess.run(
+            self._command(project, executable),
+            cwd=working_dir,
+            capture_output=True,
+            text=True,
+        )
+        return ExecutionResult(
+            result.returncode,
+            result.stdout,
+            result.stderr,
+            self._cpu_seconds(cpu_before),
+        )
+
+    async def execute_async(
+        self,
+        working_dir: str,
+        project: Optional[str] = None,
+        executable: Optional[str] = None,
+    ) -> ExecutionResult:
+        """Run AquaCrop as an asyncio subprocess, killed if the call is cancelled"""
+        import asyncio
+
+        cpu_before = children_cpu_time()
+        process = await asyncio.create_subprocess_exec(
+            *self._command(project, executable),
+            cwd=working_dir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        return ExecutionResult(
+            process.returncode,
+            stdout.decode(errors="replace"),
+            stderr.decode(errors="replace"),
+            self._cpu_seconds(cpu_before),
+        )
+
+
+class ReplayExecutor(Executor):
+    """
+    Serve OUTP trees recorded for identical inputs
+
+    Recordings are stored as <root>/<input hash>/ copies of OUTP/, where the
+    hash covers every input file of the working directory (see
+    cache.input_fingerprint) and the project. Missing recordings are produced
+    by the record_with executor when given, and are an error otherwise.
+
+    Example:
+        # Record once with the real executable...
+        recorder = ReplayExecutor("tests/recordings", record_with=SubprocessExecutor())
+        AquaCrop(..., executor=recorder).run()
+        # ...then replay without it
+        AquaCrop(..., executor=ReplayExecutor("tests/recordings")).run()
+    """
+
+    def __init__(self, root: str, record_with: Optional[Executor] = None):
+        """
+        Initialize the executor
+
+        Args:
+            root: Directory of the recordings
+            record_with: Executor producing (and recording) the outputs of
+                inputs without a recording
+        """
+        self.root = os.path.abspath(root)
+        self.record_with = record_with
+
+    @property
+    def needs_executable(self) -> bool:
+        return self.record_with is not None and self.record_with.needs_executable
+
+    def key(self, working_dir: str, project: Optional[str] = None) -> str:
+        """
+        Input hash of a working directory, naming its recording
+
+        Args:
+            working_dir: Working directory holding the input files
+            project: Project file that is run (every project when not given)
+
+        Returns:
+            Hexadecimal SHA-256 digest
+        """
+        from aquacrop.cache import input_fingerprint
+
+        return input_fingerprint(
+            working_dir_input_files(working_dir), {"project": project}
+        )
+
+    def has_recording(self, working_dir: str, project: Optional[str] = None) -> bool:
+        """Whether outputs are recorded for the inputs of a working directory"""
+        return os.path.isdir(os.path.join(self.root, self.key(working_dir, project)))
+
+    def execute(
+        self,
+        working_dir: str,
+        project: Optional[str] = None,
+        executable: Optional[str] = None,
+    ) -> ExecutionResult:
+        key = self.key(working_dir, project)
+        recording = os.path.join(self.root, key)
+        output_dir = os.path.join(working_dir, "OUTP")
+
+        if not os.path.isdir(recording):
+            if self.record_with is None:
+                raise RuntimeError(
+                    f"No recorded outputs for inputs {key} in {self.root}"
+                )
+            result = self.record_with.execute(working_dir, project, executable)
+            if result.returncode == 0:
+                self._record(output_dir, recording)
+            return result
+
+        os.makedirs(output_dir, exist_ok=True)
+        for entry in os.scandir(recording):
+            shutil.copyfile(entry.path, os.path.join(output_dir, entry.name))
+        return ExecutionResult(0)
+
+    def _record(self, output_dir: str, recording: str):
+        """Copy an OUTP tree into a new recording"""
+        os.makedirs(self.root, exist_ok=True)
+        # Copy next to the recording and rename it into place, so concurrent
+        # processes never replay a partial recording
+        staging = tempfile.mkdtemp(prefix=".record_", dir=self.root)
+        try:
+            for entry in os.scandir(output_dir):
+                if entry.is_file() and not entry.name.endswith(".idx.npz"):
+                    shutil.copyfile(entry.path, os.path.join(staging, entry.name))
+            try:
+                os.rename(staging, recording)
+            except OSError:
+                # Another process recorded the same inputs first
+                if not os.path.isdir(recording):
+                    raise
+        finally:
+            if os.path.exists(staging):
+                shutil.rmtree(staging, ignore_errors=True)
@@ -0,0 +1,6 @@
+"""
+Studies made of many AquaCrop runs (sensitivity analyses, ...)
+
+The studies vary entity parameters of a base AquaCrop configuration (see
+parameters.ParameterRange) and run the scenarios with batch.run_many.
+"""
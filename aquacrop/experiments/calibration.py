@@ -0,0 +1,328 @@
+"""
+Calibration of entity parameters against field observations
+
+calibrate() searches parameter ranges (see parameters.ParameterRange) with
+differential evolution. Every generation runs as one parallel batch with
+batch.run_many. The workers only send back the observed/simulated pairs of
+the evaluation output, from which the statistic is computed:
+
+- 'rmse' and 'cv_rmse' (minimized)
+- 'ef' (Nash-Sutcliffe efficiency), 'd' (Willmott's index of agreement) and
+  'pearson_r' (minimized as 1 - value)
+
+The statistics are recomputed from the pairs because the values printed in
+the evaluation files are rounded to two decimals, which would give the
+optimizer flat steps instead of a slope.
+
+Example:
+    result = calibrate(
+        config,  # AquaCrop keyword arguments, with an Observation
+        [
+            ParameterRange("crop.water_productivity", 15, 20, step=0.1),
+            ParameterRange("crop.harvest_index", 0.30, 0.50, step=0.01),
+        ],
+        statistic="rmse",
+        generations=40,
+        workers=8,
+    )
+    result.best, result.statistics
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from aquacrop.experiments.optimizers import DifferentialEvolution
+from aquacrop.experiments.parameters import (
+    ParameterRange,
+    apply_parameters,
+    parameter_ranges,
+    sample_values,
+)
+from aquacrop.experiments.runs import run_candidates, shared_inputs
+
+logger = logging.getLogger(__name__)
+
+# Statistics to maximize, minimized as 1 - value
+MAXIMIZED_STATISTICS = ("ef", "d", "pearson_r")
+STATISTICS = ("rmse", "cv_rmse") + MAXIMIZED_STATISTICS
+# Statistics ordered like the sum of squared errors for a given set of
+# observations, which allows the early rejection of candidates
+SSE_STATISTICS = ("rmse", "cv_rmse", "ef")
+
+
+def evaluation_statistics(
+    observed: Sequence[float], simulated: Sequence[float]
+) -> Dict[str, float]:
+    """
+    Goodness-of-fit statistics of simulated against observed values
+
+    The statistics of the AquaCrop evaluation files, without their rounding.
+
+    Args:
+        observed: Observed values
+        simulated: Simulated values, paired with observed
+
+    Returns:
+        Dictionary with 'n', 'avg_observed', 'avg_simulated', 'pearson_r',
+        'rmse', 'cv_rmse' (%), 'ef' and 'd'; NaN where undefined
+    """
+    observed = np.asarray(observed, dtype=float)
+    simulated = np.asarray(simulated, dtype=float)
+    n = len(observed)
+    if n == 0:
+        return dict({name: np.nan for name in STATISTICS}, n=0)
+
+    mean_observed = observed.mean()
+    sse = float(np.sum((simulated - observed) ** 2))
+    rmse = np.sqrt(sse / n)
+    spread = float(np.sum((observed - mean_observed) ** 2))
+    agreement = float(
+        np.sum(
+            (np.abs(simulated - mean_observed) + np.abs(observed - mean_observed)) ** 2
+        )
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pearson_r = (
+            float(np.corrcoef(observed, simulated)[0, 1]) if n > 1 else float("nan")
+        )
+        return {
+            "n": n,
+            "avg_observed": float(mean_observed),
+            "avg_simulated": float(simulated.mean()),
+            "pearson_r": pearson_r,
+            "rmse": float(rmse),
+            "cv_rmse": float(100 * rmse / mean_observed),
+            "ef": 1 - sse / spread if spread else float("nan"),
+            "d": 1 - sse / agreement if agreement else float("nan"),
+        }
+
+
+def statistic_loss(statistics: Mapping[str, float], statistic: str) -> float:
+    """Loss to minimize for a statistic of evaluation_statistics"""
+    value = statistics[statistic]
+    if statistic in MAXIMIZED_STATISTICS:
+        value = 1 - value
+    return float(value) if np.isfinite(value) else np.inf
+
+
+def evaluation_pairs(results) -> np.ndarray:
+    """
+    Observed and simulated biomass of every observation of a simulation
+
+    The extraction run in the workers by calibrate (see batch.run_many).
+
+    Args:
+        results: Results returned by AquaCrop.run()
+
+    Returns:
+        Array of shape (observations, 2) with the observed and simulated
+        values, over every simulated season
+    """
+    pairs = results["evaluation"]["biomass"]
+    if pairs is None or pairs.empty:
+        return np.empty((0, 2))
+    values = pairs[["Observed", "Simulated"]].to_numpy(dtype=float)
+    return values[np.isfinite(values).all(axis=1)]
+
+
+@dataclass
+class CalibrationResult:
+    """
+    Outcome of calibrate
+    """
+
+    parameters: List[ParameterRange]
+    best: Dict[str, Any]  # Best parameter values, keyed by path
+    loss: float  # Loss of the best values
+    # Statistics of the best values (see evaluation_statistics), empty with
+    # a custom objective
+    statistics: Dict[str, float]
+    config: Dict  # Base configuration with the best values applied
+    generations: int
+    evaluations: int = 0  # Simulations run (screening runs included)
+    cache_hits: int = 0  # Candidates whose loss was known already
+    rejected: int = 0  # Candidates stopped after their screening run
+    # Best loss after every generation
+    history: List[float] = field(default_factory=list)
+
+
+def calibrate(
+    config: Dict,
+    parameters: Union[Mapping[str, Tuple[float, float]], Sequence[ParameterRange]],
+    statistic: str = "rmse",
+    objective: Optional[Callable[[Any], float]] = None,
+    generations: int = 50,
+    population_size: Optional[int] = None,
+    tolerance: float = 1e-4,
+    screen_periods: Optional[int] = None,
+    seed: Optional[int] = None,
+    input_cache=None,
+    **batch_options,
+) -> CalibrationResult:
+    """
+    Calibrate parameters by differential evolution
+
+    Each generation is evaluated as one parallel batch. Candidates whose
+    parameter values were evaluated before (as often happens with integer
+    parameters) are not run again. With screen_periods, the candidates of a
+    generation are first run on the first simulation periods only: those
+    whose squared errors on these periods already exceed the total of the
+    population member they compete with cannot replace it, and are stopped
+    there. This rejection is exact, so the search itself is unchanged; it
+    saves time when many candidates are hopeless and seasons are many.
+
+    Args:
+        config: Base AquaCrop keyword arguments, with an observation
+        parameters: Parameter ranges, as ParameterRange objects or a mapping
+            of path (e.g. 'crop.water_productivity') to (low, high)
+        statistic: Biomass statistic to optimize (see STATISTICS)
+        objective: Function of the results returning the loss to minimize,
+            replacing statistic (must be picklable, see batch.run_many)
+        generations: Maximum number of generations after the initial one
+        population_size: Candidates per generation (see DifferentialEvolution)
+        tolerance: Stop when the losses of the population spread less than
+            this fraction of their mean
+        screen_periods: Number of simulation periods of the screening runs
+            (no screening when not given); only for 'rmse', 'cv_rmse' and
+            'ef' without objective
+        seed: Seed of the optimizer
+        input_cache: InputFileCache to use (a temporary one that is removed
+            afterwards when neither given nor set in config)
+        **batch_options: Options of batch.run_many (workers, backend,
+            executable_path, ...)
+
+    Returns:
+        CalibrationResult with the best parameter values
+
+    Raises:
+        ValueError: If the statistic is unknown, screening is not possible
+            or a parameter does not exist
+        RuntimeError: If every candidate of the initial population failed
+    """
+    if objective is None and statistic not in STATISTICS:
+        raise ValueError(
+            f"Unknown statistic {statistic!r}, expected one of {STATISTICS}"
+        )
+    if screen_periods is not None:
+        if objective is not None or statistic not in SSE_STATISTICS:
+            raise ValueError(
+                f"Screening runs need one of the statistics {SSE_STATISTICS}"
+            )
+        if not 0 < screen_periods < len(config["simulation_periods"]):
+            raise ValueError("screen_periods must be fewer than the simulation periods")
+
+    ranges = parameter_ranges(parameters, config)
+    optimizer = DifferentialEvolution(len(ranges), population_size, seed=seed)
+    extract = objective or evaluation_pairs
+
+    batch_options.setdefault("reuse_working_dirs", True)
+
+    # Loss, squared errors and statistics of every evaluated set of values
+    evaluated: Dict[Tuple, Tuple[float, float, Dict[str, float]]] = {}
+    member_sse = np.full(optimizer.population_size, np.inf)
+    result = CalibrationResult(
+        parameters=ranges,
+        best={},
+        loss=np.inf,
+        statistics={},
+        config={},
+        generations=0,
+    )
+
+    def score(outcome) -> Tuple[float, float, Dict[str, float]]:
+        """Loss, squared errors and statistics of the outcome of a run"""
+        if outcome is None:
+            return np.inf, np.inf, {}
+        if objective is not None:
+            loss = float(outcome)
+            return (loss if np.isfinite(loss) else np.inf), np.nan, {}
+        observed, simulated = outcome[:, 0], outcome[:, 1]
+        statistics = evaluation_statistics(observed, simulated)
+        return (
+            statistic_loss(statistics, statistic),
+            float(np.sum((simulated - observed) ** 2)),
+            statistics,
+        )
+
+    with shared_inputs(config, input_cache) as base:
+        for generation in range(generations + 1):
+            trials = optimizer.ask()
+            values = [sample_values(ranges, trial) for trial in trials]
+            keys = [tuple(value.values()) for value in values]
+
+            losses = np.full(len(trials), np.inf)
+            sse = np.full(len(trials), np.inf)
+            pending: Dict[Tuple, List[int]] = {}
+            for member, key in enumerate(keys):
+                if key in evaluated:
+                    losses[member], sse[member], _ = evaluated[key]
+                    result.cache_hits += 1
+                else:
+                    pending.setdefault(key, []).append(member)
+
+            if screen_periods is not None and optimizer.losses is not None:
+                # Screening runs on the first periods; the squared errors can
+                # only grow with the remaining ones
+                screened = run_candidates(
+                    {
+                        members[0]: dict(
+                            apply_parameters(base, values[members[0]]),
+                            simulation_periods=base["simulation_periods"][
+                                :screen_periods
+                            ],
+                        )
+                        for members in pending.values()
+                    },
+                    extract,
+                    batch_options,
+                )
+                result.evaluations += len(screened)
+                for key, members in list(pending.items()):
+                    partial = score(screened[members[0]])[1]
+                    bound = max(member_sse[member] for member in members)
+                    if partial > bound:
+                        result.rejected += len(members)
+                        del pending[key]
+
+            outcomes = run_candidates(
+                {
+                    members[0]: apply_parameters(base, values[members[0]])
+                    for members in pending.values()
+                },
+                extract,
+                batch_options,
+            )
+            result.evaluations += len(outcomes)
+            for key, members in pending.items():
+                evaluated[key] = score(outcomes[members[0]])
+                losses[members], sse[members], _ = evaluated[key]
+
+            if generation == 0 and not np.isfinite(losses).any():
+                raise RuntimeError(
+                    "Every candidate of the initial population failed, check "
+                    "the configuration and that it has an observation"
+                )
+
+            replaced = optimizer.tell(trials, losses)
+            member_sse[replaced] = sse[replaced]
+            result.generations = generation
+            result.history.append(optimizer.best_loss)
+            logger.info(
+                "Generation %d: best loss %.6g (%d runs, %d cached, %d rejected)",
+                generation,
+                optimizer.best_loss,
+                result.evaluations,
+                result.cache_hits,
+                result.rejected,
+            )
+            if generation and optimizer.converged(tolerance):
+                break
+
+    result.best = sample_values(ranges, optimizer.best)
+    result.loss = optimizer.best_loss
+    result.statistics = evaluated[tuple(result.best.values())][2]
+    result.config = apply_parameters(config, result.best)
+    return result
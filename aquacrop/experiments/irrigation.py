@@ -0,0 +1,276 @@
+"""
+Optimization of irrigation schedules under a water budget
+
+optimize_irrigation() searches parameters of the Irrigation entity with
+differential evolution (see optimizers.DifferentialEvolution) to maximize a
+season output, yield ('Y(dry)') or water productivity ('WPet'), while the
+seasonal irrigation ('Irri') stays within a budget. Typical parameters are
+the timing and depth of fixed events (mode 1, see event_ranges) or the
+thresholds of generation rules (mode 2), e.g.
+'irrigation.generation_rules.0.time_value'.
+
+Every generation runs as one parallel batch (batch.run_many). Only the
+irrigation entity differs between candidates, so with the shared input
+cache only its .IRR file is rendered per candidate.
+
+Example:
+    result = optimize_irrigation(
+        config,  # with an Irrigation of six events
+        event_ranges(config["irrigation"], days=(20, 120), depths=(0, 60)),
+        budget=250,
+        maximize="Y(dry)",
+        workers=8,
+    )
+    result.irrigation.params["irrigation_events"], result.outputs
+"""
+
+import functools
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from aquacrop.experiments.optimizers import DifferentialEvolution
+from aquacrop.experiments.parameters import (
+    ParameterRange,
+    apply_parameters,
+    parameter_ranges,
+    sample_values,
+)
+from aquacrop.experiments.runs import run_candidates, shared_inputs
+from aquacrop.experiments.sensitivity import season_outputs
+
+logger = logging.getLogger(__name__)
+
+# Season output with the applied irrigation (mm)
+IRRIGATION_COLUMN = "Irri"
+
+
+def event_ranges(
+    irrigation,
+    days: Optional[Tuple[int, int]] = None,
+    depths: Optional[Tuple[float, float]] = None,
+) -> List[ParameterRange]:
+    """
+    Parameter ranges of the events of a fixed schedule (irrigation mode 1)
+
+    Args:
+        irrigation: Irrigation entity whose events are optimized; its number
+            of events is kept
+        days: Range of the event days (not optimized when not given)
+        depths: Range of the event depths in mm (not optimized when not given)
+
+    Returns:
+        ParameterRange for the day and/or depth of every event (days as
+        integers, depths in whole mm as written to the .IRR file)
+
+    Raises:
+        ValueError: If the irrigation has no events
+    """
+    events = irrigation.params.get("irrigation_events") or []
+    if irrigation.params.get("irrigation_mode") != 1 or not events:
+        raise ValueError("Event ranges need an irrigation of mode 1 with events")
+
+    ranges = []
+    for position in range(len(events)):
+        path = f"irrigation.irrigation_events.{position}"
+        if days is not None:
+            ranges.append(ParameterRange(f"{path}.day", *days, integer=True))
+        if depths is not None:
+            ranges.append(ParameterRange(f"{path}.depth", *depths, integer=True))
+    return ranges
+
+
+def scheduled_depth(irrigation) -> Optional[float]:
+    """
+    Total depth of the events of a fixed schedule, known before running
+
+    Returns:
+        Sum of the event depths in mm, or None when the schedule is generated
+        by AquaCrop (modes 2 and 3)
+    """
+    if irrigation is None:
+        return 0.0
+    if irrigation.params.get("irrigation_mode") != 1:
+        return None
+    return float(
+        sum(event["depth"] for event in irrigation.params["irrigation_events"])
+    )
+
+
+def _sort_events(config: Dict) -> Dict:
+    """Order the events of a candidate by day, merging those of the same day"""
+    irrigation = config.get("irrigation")
+    if irrigation is None or irrigation.params.get("irrigation_mode") != 1:
+        return config
+    merged: Dict[int, Dict] = {}
+    for event in sorted(irrigation.params["irrigation_events"], key=lambda e: e["day"]):
+        if event["day"] in merged:
+            merged[event["day"]]["depth"] += event["depth"]
+        else:
+            merged[event["day"]] = dict(event)
+    irrigation.params["irrigation_events"] = list(merged.values())
+    return config
+
+
+@dataclass
+class IrrigationResult:
+    """
+    Outcome of optimize_irrigation
+    """
+
+    parameters: List[ParameterRange]
+    best: Dict[str, Any]  # Best parameter values, keyed by path
+    irrigation: Any  # Irrigation entity with the best values
+    outputs: Dict[str, float]  # Season outputs of the best schedule
+    feasible: bool  # Whether the best schedule stays within the budget
+    config: Dict  # Base configuration with the best irrigation
+    generations: int
+    evaluations: int = 0  # Simulations run
+    cache_hits: int = 0  # Candidates whose outputs were known already
+    rejected: int = 0  # Fixed schedules over budget, not run
+    # Best loss after every generation (see optimize_irrigation)
+    history: List[float] = field(default_factory=list)
+
+
+def optimize_irrigation(
+    config: Dict,
+    parameters: Union[Mapping[str, Tuple[float, float]], Sequence[ParameterRange]],
+    budget: Optional[float] = None,
+    maximize: str = "Y(dry)",
+    generations: int = 30,
+    population_size: Optional[int] = None,
+    tolerance: float = 1e-4,
+    seed: Optional[int] = None,
+    input_cache=None,
+    **batch_options,
+) -> IrrigationResult:
+    """
+    Search the irrigation parameters maximizing a season output
+
+    Schedules within the budget are ranked by the output (the loss is its
+    opposite); schedules over budget are ranked by their excess irrigation
+    in mm, so they always rank below any schedule within budget and the
+    search is led back to the feasible ones without a penalty weight to tune.
+    Fixed schedules (mode 1) whose events already exceed the budget are
+    rejected without running them; generated schedules are checked against
+    the irrigation AquaCrop applied. Outputs are averaged over the simulated
+    seasons.
+
+    Args:
+        config: Base AquaCrop keyword arguments, with an irrigation
+        parameters: Parameter ranges (paths starting with 'irrigation.'),
+            as ParameterRange objects or a mapping of path to (low, high)
+        budget: Maximum seasonal irrigation in mm (no limit when not given)
+        maximize: Season output column to maximize ('Y(dry)' for yield,
+            'WPet' for water productivity, ...)
+        generations: Maximum number of generations after the initial one
+        population_size: Candidates per generation (see DifferentialEvolution)
+        tolerance: Stop when the losses of the population spread less than
+            this fraction of their mean
+        seed: Seed of the optimizer
+        input_cache: InputFileCache to use (see runs.shared_inputs)
+        **batch_options: Options of batch.run_many (workers, backend,
+            executable_path, ...)
+
+    Returns:
+        IrrigationResult with the best schedule and its outputs
+
+    Raises:
+        ValueError: If config has no irrigation or a parameter is not one
+            of the irrigation
+        RuntimeError: If every candidate of the initial population failed
+    """
+    if config.get("irrigation") is None:
+        raise ValueError("Irrigation optimization needs an irrigation entity")
+    ranges = parameter_ranges(parameters, config)
+    others = [r.path for r in ranges if not r.path.startswith("irrigation.")]
+    if others:
+        raise ValueError(f"Not irrigation parameters: {', '.join(others)}")
+
+    optimizer = DifferentialEvolution(len(ranges), population_size, seed=seed)
+    extract = functools.partial(season_outputs, columns=(maximize, IRRIGATION_COLUMN))
+    batch_options.setdefault("reuse_working_dirs", True)
+
+    def loss(value: float, irrigation: float) -> float:
+        if budget is not None and irrigation > budget:
+            return irrigation - budget
+        return -value if np.isfinite(value) and np.isfinite(irrigation) else np.inf
+
+    # Season outputs (value, irrigation) of every evaluated set of values
+    evaluated: Dict[Tuple, Tuple[float, float]] = {}
+    result = IrrigationResult(
+        parameters=ranges,
+        best={},
+        irrigation=None,
+        outputs={},
+        feasible=False,
+        config={},
+        generations=0,
+    )
+
+    with shared_inputs(config, input_cache) as base:
+        for generation in range(generations + 1):
+            trials = optimizer.ask()
+            values = [sample_values(ranges, trial) for trial in trials]
+            keys = [tuple(value.values()) for value in values]
+
+            losses = np.full(len(trials), np.inf)
+            candidates: Dict[int, Dict] = {}
+            members: Dict[Tuple, List[int]] = {}
+            for member, key in enumerate(keys):
+                if key in evaluated:
+                    losses[member] = loss(*evaluated[key])
+                    result.cache_hits += 1
+                    continue
+                if key in members:
+                    members[key].append(member)
+                    continue
+                candidate = _sort_events(apply_parameters(base, values[member]))
+                planned = scheduled_depth(candidate["irrigation"])
+                if budget is not None and planned is not None and planned > budget:
+                    # Over budget whatever AquaCrop makes of it
+                    evaluated[key] = (np.nan, planned)
+                    losses[member] = planned - budget
+                    result.rejected += 1
+                    continue
+                members[key] = [member]
+                candidates[member] = candidate
+
+            outcomes = run_candidates(candidates, extract, batch_options)
+            result.evaluations += len(outcomes)
+            for key, group in members.items():
+                outcome = outcomes[group[0]]
+                evaluated[key] = (
+                    tuple(outcome) if outcome is not None else (np.nan, np.nan)
+                )
+                losses[group] = loss(*evaluated[key])
+
+            if generation == 0 and not np.isfinite(losses).any():
+                raise RuntimeError(
+                    "Every candidate of the initial population failed or was "
+                    "rejected, check the configuration and the budget"
+                )
+
+            optimizer.tell(trials, losses)
+            result.generations = generation
+            result.history.append(optimizer.best_loss)
+            logger.info(
+                "Generation %d: best loss %.6g (%d runs, %d cached, %d rejected)",
+                generation,
+                optimizer.best_loss,
+                result.evaluations,
+                result.cache_hits,
+                result.rejected,
+            )
+            if generation and optimizer.converged(tolerance):
+                break
+
+    result.best = sample_values(ranges, optimizer.best)
+    value, irrigation = evaluated[tuple(result.best.values())]
+    result.outputs = {maximize: float(value), IRRIGATION_COLUMN: float(irrigation)}
+    result.feasible = budget is None or irrigation <= budget
+    result.config = _sort_events(apply_parameters(config, result.best))
+    result.irrigation = result.config["irrigation"]
+    return result
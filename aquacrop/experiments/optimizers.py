@@ -0,0 +1,149 @@
+"""
+Population-based optimizers over the unit hypercube
+
+Optimizers follow an ask/tell interface so that every generation can be
+evaluated as one parallel batch:
+
+    optimizer = DifferentialEvolution(n_parameters=3, seed=0)
+    for _ in range(50):
+        trials = optimizer.ask()
+        optimizer.tell(trials, [loss(trial) for trial in trials])
+    optimizer.best, optimizer.best_loss
+"""
+
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+def latin_hypercube(
+    samples: int, dimensions: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Latin hypercube sample of the unit hypercube"""
+    strata = np.argsort(rng.random((samples, dimensions)), axis=0)
+    return (strata + rng.random((samples, dimensions))) / samples
+
+
+class DifferentialEvolution:
+    """
+    Differential evolution (DE/rand/1/bin) minimizing a loss over [0, 1]^k
+
+    Each generation, every member of the population (its target) gets a
+    trial vector mixing three other members; the trial replaces its target
+    when its loss is not higher. Losses may be inf for rejected or failed
+    trials, which then never replace their target.
+    """
+
+    def __init__(
+        self,
+        n_parameters: int,
+        population_size: Optional[int] = None,
+        mutation: Union[float, Tuple[float, float]] = (0.5, 1.0),
+        crossover: float = 0.7,
+        seed: Union[None, int, np.random.Generator] = None,
+    ):
+        """
+        Initialize the optimizer
+
+        Args:
+            n_parameters: Number of parameters (k)
+            population_size: Number of members (defaults to 10 * k, at least 8)
+            mutation: Differential weight F, or a (low, high) range from which
+                it is drawn every generation (dithering)
+            crossover: Crossover probability CR
+            seed: Seed or numpy Generator
+        """
+        self.n_parameters = n_parameters
+        self.population_size = population_size or max(8, 10 * n_parameters)
+        if self.population_size < 4:
+            raise ValueError("Differential evolution needs at least 4 members")
+        self.mutation = mutation
+        self.crossover = crossover
+        self.rng = np.random.default_rng(seed)
+        self.population = latin_hypercube(self.population_size, n_parameters, self.rng)
+        self.losses: Optional[np.ndarray] = None  # Set by the first tell
+        self.generation = 0
+
+    def ask(self) -> np.ndarray:
+        """
+        Trial vectors to evaluate
+
+        Returns:
+            Array of shape (population_size, k); row i is the trial of
+            member i (the initial population on the first call)
+        """
+        if self.losses is None:
+            return self.population.copy()
+
+        size, k = self.population.shape
+        if isinstance(self.mutation, tuple):
+            weight = self.rng.uniform(*self.mutation)
+        else:
+            weight = self.mutation
+
+        # Three distinct members other than the target for every trial
+        others = np.array(
+            [
+                self.rng.choice(np.delete(np.arange(size), member), 3, replace=False)
+                for member in range(size)
+            ]
+        )
+        base, first, second = (self.population[others[:, i]] for i in range(3))
+        mutants = base + weight * (first - second)
+
+        crossed = self.rng.random((size, k)) < self.crossover
+        # Every trial takes at least one parameter of its mutant
+        crossed[np.arange(size), self.rng.integers(0, k, size)] = True
+        trials = np.where(crossed, mutants, self.population)
+
+        # Parameters leaving the hypercube are put back between the target
+        # and the bound they crossed
+        low, high = trials < 0, trials > 1
+        trials[low] = self.population[low] / 2
+        trials[high] = (self.population[high] + 1) / 2
+        return trials
+
+    def tell(self, trials: np.ndarray, losses: Sequence[float]) -> np.ndarray:
+        """
+        Report the losses of the trials returned by ask
+
+        Args:
+            trials: Trials, as returned by ask
+            losses: Loss of every trial (inf when rejected or failed)
+
+        Returns:
+            Boolean array telling which members were replaced by their trial
+        """
+        losses = np.asarray(losses, dtype=float)
+        losses = np.where(np.isnan(losses), np.inf, losses)
+        if self.losses is None:
+            self.population = np.array(trials, dtype=float)
+            self.losses = losses
+            replaced = np.ones(len(losses), dtype=bool)
+        else:
+            replaced = losses <= self.losses
+            self.population[replaced] = trials[replaced]
+            self.losses[replaced] = losses[replaced]
+        self.generation += 1
+        return replaced
+
+    @property
+    def best(self) -> np.ndarray:
+        """Member with the lowest loss"""
+        return self.population[int(np.argmin(self.losses))]
+
+    @property
+    def best_loss(self) -> float:
+        return float(np.min(self.losses))
+
+    def converged(self, tolerance: float, absolute_tolerance: float = 0.0) -> bool:
+        """
+        Whether the losses of the population have (nearly) all become equal
+
+        True when every loss is finite and their standard deviation is at most
+        absolute_tolerance + tolerance * |mean loss|.
+        """
+        if self.losses is None or not np.isfinite(self.losses).all():
+            return False
+        spread = absolute_tolerance + tolerance * abs(float(np.mean(self.losses)))
+        return float(np.std(self.losses)) <= spread
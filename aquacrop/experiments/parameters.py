@@ -0,0 +1,202 @@
+"""
+Parameters of an AquaCrop configuration varied by the experiments
+
+A parameter is addressed by a dotted path starting with an AquaCrop keyword
+argument, e.g.:
+
+- 'crop.water_productivity' (a key of Crop.params)
+- 'management.fertility_stress' (a key of FieldManagement.params)
+- 'soil.curve_number' (an attribute)
+- 'soil.soil_layers.0.fc' (an attribute of the first soil layer)
+"""
+
+import copy
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+@dataclass
+class ParameterRange:
+    """
+    Range of one parameter of an experiment
+    """
+
+    path: str  # Dotted path of the parameter, see the module docstring
+    low: float
+    high: float
+    # Whether values are rounded to integers (days, curve number, ...); when
+    # None, follows the type of the value in the base configuration
+    integer: Optional[bool] = None
+    # Values are rounded to multiples of step, e.g. the precision with which
+    # the parameter is written to its input file (0.1 for crop water
+    # productivity), so that equal files get equal values
+    step: Optional[float] = None
+
+    def scale(self, unit: np.ndarray) -> np.ndarray:
+        """Map values of [0, 1] to the range"""
+        return self.low + np.asarray(unit, dtype=float) * (self.high - self.low)
+
+
+def parameter_ranges(
+    parameters: Union[Mapping[str, Tuple[float, float]], Sequence[ParameterRange]],
+    config: Optional[Dict] = None,
+) -> List[ParameterRange]:
+    """
+    Normalize parameter ranges
+
+    Args:
+        parameters: ParameterRange objects, or a mapping of path to (low, high)
+        config: Base AquaCrop configuration, used to check the paths and to
+            resolve ParameterRange.integer when not set
+
+    Returns:
+        List of ParameterRange
+
+    Raises:
+        ValueError: If a range is empty or a path does not exist in config
+    """
+    if isinstance(parameters, Mapping):
+        ranges = [
+            ParameterRange(path, low, high) for path, (low, high) in parameters.items()
+        ]
+    else:
+        ranges = [copy.copy(parameter) for parameter in parameters]
+
+    for parameter in ranges:
+        if not parameter.high > parameter.low:
+            raise ValueError(
+                f"Empty range for {parameter.path}: [{parameter.low}, {parameter.high}]"
+            )
+        if config is not None:
+            value = get_parameter(config, parameter.path)
+            if parameter.integer is None:
+                parameter.integer = isinstance(
+                    value, (int, np.integer)
+                ) and not isinstance(value, bool)
+    return ranges
+
+
+def _split(path: str) -> List[str]:
+    parts = path.split(".")
+    if len(parts) < 2 or not all(parts):
+        raise ValueError(
+            f"Invalid parameter path {path!r}, expected e.g. 'crop.kc_max'"
+        )
+    return parts
+
+
+def _child(container: Any, part: str, path: str) -> Tuple[Any, Any]:
+    """
+    Locate one step of a path
+
+    Returns:
+        Tuple of the object holding the value (dict, list or entity) and the
+        key, index or attribute name of the value in it
+    """
+    if isinstance(container, dict):
+        if part in container:
+            return container, part
+    elif isinstance(container, (list, tuple)):
+        if part.isdigit() and int(part) < len(container):
+            return container, int(part)
+    else:
+        params = getattr(container, "params", None)
+        if isinstance(params, dict) and part in params:
+            return params, part
+        if hasattr(container, part):
+            return container, part
+    raise ValueError(f"Parameter {path!r} not found ({part!r} does not exist)")
+
+
+def _get(holder: Any, key: Any) -> Any:
+    if isinstance(holder, (dict, list, tuple)):
+        return holder[key]
+    return getattr(holder, key)
+
+
+def get_parameter(config: Dict, path: str) -> Any:
+    """
+    Value of a parameter in an AquaCrop configuration
+
+    Args:
+        config: AquaCrop keyword arguments
+        path: Dotted path of the parameter
+
+    Returns:
+        Current value
+
+    Raises:
+        ValueError: If the path does not exist
+    """
+    value = config
+    for part in _split(path):
+        value = _get(*_child(value, part, path))
+    return value
+
+
+def apply_parameters(config: Dict, values: Mapping[str, Any]) -> Dict:
+    """
+    Copy of a configuration with some parameters changed
+
+    Only the entities holding a changed parameter are copied; the others are
+    shared with config, so the input files of an InputFileCache are reused
+    for them instead of being rendered again.
+
+    Args:
+        config: Base AquaCrop keyword arguments (not modified)
+        values: New value of each parameter, keyed by path
+
+    Returns:
+        New configuration
+
+    Raises:
+        ValueError: If a path does not exist
+    """
+    result = dict(config)
+    copied = set()
+    for path, value in values.items():
+        parts = _split(path)
+        if parts[0] not in copied:
+            if parts[0] not in result:
+                raise ValueError(
+                    f"Parameter {path!r} not found ({parts[0]!r} is not set)"
+                )
+            result[parts[0]] = copy.deepcopy(result[parts[0]])
+            copied.add(parts[0])
+
+        container = result
+        for part in parts[:-1]:
+            container = _get(*_child(container, part, path))
+        holder, key = _child(container, parts[-1], path)
+        if isinstance(holder, (dict, list)):
+            holder[key] = value
+        elif isinstance(holder, tuple):
+            raise ValueError(f"Parameter {path!r} is held in a tuple")
+        else:
+            setattr(holder, key, value)
+    return result
+
+
+def sample_values(
+    ranges: Sequence[ParameterRange], sample: np.ndarray
+) -> Dict[str, Any]:
+    """
+    Parameter values of one sample of the unit hypercube
+
+    Args:
+        ranges: Parameter ranges
+        sample: One value of [0, 1] per parameter
+
+    Returns:
+        Values keyed by path, as expected by apply_parameters
+    """
+    values = {}
+    for parameter, unit in zip(ranges, sample):
+        value = float(parameter.scale(unit))
+        if parameter.step:
+            # Rounded again to drop the floating point noise of the product
+            value = round(round(value / parameter.step) * parameter.step, 10)
+        values[parameter.path] = int(round(value)) if parameter.integer else value
+    return values
@@ -0,0 +1,75 @@
+"""
+Running the scenarios of an experiment
+"""
+
+import logging
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Mapping
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def shared_inputs(config: Dict, input_cache=None) -> Iterator[Dict]:
+    """
+    Base configuration whose scenarios share rendered input files
+
+    Scenarios derived from it with parameters.apply_parameters only copy
+    the entities they change, so through a common InputFileCache the files
+    of the other entities are rendered once and hardlinked afterwards; only
+    the files of the changed entities are rendered per scenario.
+
+    Args:
+        config: Base AquaCrop keyword arguments
+        input_cache: InputFileCache to use. When neither given nor set in
+            config, a temporary one is created next to the working
+            directories and removed on exit
+
+    Yields:
+        Copy of config with the input cache set
+    """
+    from aquacrop.cache import InputFileCache
+    from aquacrop.utils.files import default_working_root
+
+    own_cache = input_cache is None and config.get("input_cache") is None
+    if own_cache:
+        input_cache = InputFileCache(
+            tempfile.mkdtemp(prefix="aquacrop_inputs_", dir=default_working_root())
+        )
+    try:
+        if input_cache is None:
+            yield dict(config)
+        else:
+            yield dict(config, input_cache=input_cache)
+    finally:
+        if own_cache:
+            shutil.rmtree(input_cache.root, ignore_errors=True)
+
+
+def run_candidates(
+    configs: Mapping[Any, Dict],
+    extract: Callable[[Any], Any],
+    batch_options: Dict,
+) -> Dict[Any, Any]:
+    """
+    Run scenarios with batch.run_many and collect their extracted values
+
+    Args:
+        configs: AquaCrop keyword arguments by scenario key
+        extract: Function reducing the results in the workers
+        batch_options: Options of batch.run_many
+
+    Returns:
+        Extracted value by scenario key, None for the failed scenarios
+        (whose traceback is logged at DEBUG level)
+    """
+    from aquacrop.batch import run_many
+
+    outcomes = {}
+    for result in run_many(configs, extract=extract, **batch_options):
+        if not result.ok:
+            logger.debug("Scenario %s failed:\n%s", result.key, result.error)
+        outcomes[result.key] = result.results if result.ok else None
+    return outcomes
@@ -0,0 +1,393 @@
+"""
+Global sensitivity analysis of AquaCrop outputs to entity parameters
+
+Two methods are provided, both running their designs through batch.run_many:
+
+- Morris elementary effects (morris_design, morris_indices): r * (k + 1) runs
+  for k parameters, to screen many parameters for the influential ones
+- Sobol indices with the Saltelli design (saltelli_design, sobol_indices):
+  N * (k + 2) runs, first-order (S1) and total (ST) indices
+
+Example:
+    result = run_sensitivity(
+        config,
+        {"crop.water_productivity": (15, 20), "crop.kc_max": (1.0, 1.2)},
+        method="sobol",
+        samples=256,
+        outputs=["Y(dry)", "BioMass"],
+        workers=8,
+    )
+    result.indices["ST"]  # shape (outputs, parameters)
+"""
+
+import functools
+import logging
+import warnings
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from aquacrop.experiments.parameters import (
+    ParameterRange,
+    apply_parameters,
+    parameter_ranges,
+    sample_values,
+)
+from aquacrop.experiments.runs import shared_inputs
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("morris", "sobol")
+
+
+def morris_design(
+    n_parameters: int,
+    trajectories: int,
+    levels: int = 4,
+    seed: Union[None, int, np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Random one-at-a-time trajectories of the Morris method
+
+    Each trajectory starts at a random point of a grid of the unit hypercube
+    and moves every parameter once by delta = levels / (2 * (levels - 1)).
+
+    Args:
+        n_parameters: Number of parameters (k)
+        trajectories: Number of trajectories (r), usually 10 to 50
+        levels: Number of grid levels, even
+        seed: Seed or numpy Generator
+
+    Returns:
+        Array of shape (trajectories * (k + 1), k) with values in [0, 1],
+        trajectory after trajectory
+
+    Raises:
+        ValueError: If levels is not an even number of at least 2
+    """
+    if levels < 2 or levels % 2:
+        raise ValueError(f"Morris levels must be an even number, got {levels}")
+    rng = np.random.default_rng(seed)
+    k = n_parameters
+    delta = levels / (2 * (levels - 1))
+    steps = np.tril(np.ones((k + 1, k)), -1)
+
+    design = np.empty((trajectories, k + 1, k))
+    for trajectory in range(trajectories):
+        # Base point on the grid, low enough to move up by delta
+        base = rng.integers(0, levels // 2, size=k) / (levels - 1)
+        directions = rng.choice([-1.0, 1.0], size=k)
+        points = base + delta / 2 * ((2 * steps - 1) * directions + 1)
+        design[trajectory] = points[:, rng.permutation(k)]
+    return design.reshape(-1, k)
+
+
+def morris_indices(design: np.ndarray, outputs: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Morris statistics of the elementary effects
+
+    Args:
+        design: Design returned by morris_design, shape (r * (k + 1), k)
+        outputs: Model outputs of every design row, shape (r * (k + 1), m) or
+            (r * (k + 1),); NaN for failed runs, whose effects are ignored
+
+    Returns:
+        Dictionary of arrays of shape (m, k): 'mu' (mean effect), 'mu_star'
+        (mean absolute effect, the ranking measure) and 'sigma' (standard
+        deviation, high for non-linear effects and interactions)
+    """
+    k = design.shape[1]
+    outputs = np.asarray(outputs, dtype=float).reshape(len(design), -1)
+    points = design.reshape(-1, k + 1, k)
+    values = outputs.reshape(len(points), k + 1, -1)
+
+    # Consecutive points of a trajectory differ in one parameter
+    moves = np.diff(points, axis=1)
+    moved = np.abs(moves).argmax(axis=2)
+    steps = np.take_along_axis(moves, moved[:, :, None], axis=2)
+    effects_by_move = np.diff(values, axis=1) / steps
+
+    effects = np.empty_like(effects_by_move)
+    effects[np.arange(len(points))[:, None], moved] = effects_by_move
+
+    with warnings.catch_warnings():
+        # Parameters whose effects all come from failed runs are NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return {
+            "mu": np.nanmean(effects, axis=0).T,
+            "mu_star": np.nanmean(np.abs(effects), axis=0).T,
+            "sigma": np.nanstd(effects, axis=0, ddof=1).T,
+        }
+
+
+def _base_samples(samples: int, dimensions: int, rng: np.random.Generator):
+    """Points of the unit hypercube, quasi-random when scipy is installed"""
+    try:
+        from scipy.stats import qmc
+    except ImportError:
+        return rng.random((samples, dimensions))
+    return qmc.Sobol(d=dimensions, scramble=True, seed=rng).random(samples)
+
+
+def saltelli_design(
+    n_parameters: int,
+    samples: int,
+    seed: Union[None, int, np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Saltelli design for first-order and total Sobol indices
+
+    Two independent sample matrices A and B of the unit hypercube are drawn
+    (a scrambled Sobol' sequence with scipy, uniform random points without),
+    and k matrices AB_i that are A with the column i of B.
+
+    Args:
+        n_parameters: Number of parameters (k)
+        samples: Number of base samples (N), preferably a power of two
+        seed: Seed or numpy Generator
+
+    Returns:
+        Array of shape (N * (k + 2), k): the rows of A, AB_1, ..., AB_k, B
+    """
+    rng = np.random.default_rng(seed)
+    k = n_parameters
+    base = _base_samples(samples, 2 * k, rng)
+    a, b = base[:, :k], base[:, k:]
+
+    blocks = [a]
+    for i in range(k):
+        ab = a.copy()
+        ab[:, i] = b[:, i]
+        blocks.append(ab)
+    blocks.append(b)
+    return np.concatenate(blocks)
+
+
+def _sobol_estimates(
+    fa: np.ndarray, fab: np.ndarray, fb: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """S1 (Saltelli 2010) and ST (Jansen) estimates of one output"""
+    variance = np.var(np.concatenate([fa, fb]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first = np.mean(fb * (fab - fa), axis=1) / variance
+        total = 0.5 * np.mean((fa - fab) ** 2, axis=1) / variance
+    return first, total
+
+
+def sobol_indices(
+    outputs: np.ndarray,
+    n_parameters: int,
+    resamples: int = 100,
+    seed: Union[None, int, np.random.Generator] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    First-order and total Sobol indices of a Saltelli design
+
+    Args:
+        outputs: Model outputs of every row of saltelli_design, shape
+            (N * (k + 2), m) or (N * (k + 2),). Base samples with a failed
+            (NaN) run in any of their k + 2 rows are left out
+        n_parameters: Number of parameters (k)
+        resamples: Bootstrap resamples for the confidence intervals (0 for
+            none)
+        seed: Seed or numpy Generator of the bootstrap
+
+    Returns:
+        Dictionary of arrays of shape (m, k): 'S1' and 'ST', and with
+        resamples 'S1_conf' and 'ST_conf' (half-width of the 95% intervals)
+    """
+    k = n_parameters
+    outputs = np.asarray(outputs, dtype=float).reshape(len(outputs), -1)
+    blocks = outputs.reshape(k + 2, -1, outputs.shape[1])
+    rng = np.random.default_rng(seed)
+
+    names = ["S1", "ST"] + (["S1_conf", "ST_conf"] if resamples else [])
+    indices = {name: np.full((blocks.shape[2], k), np.nan) for name in names}
+    for output in range(blocks.shape[2]):
+        values = blocks[:, :, output]
+        values = values[:, np.isfinite(values).all(axis=0)]
+        if values.shape[1] < 2:
+            continue
+        fa, fab, fb = values[0], values[1:-1], values[-1]
+        indices["S1"][output], indices["ST"][output] = _sobol_estimates(fa, fab, fb)
+
+        if resamples:
+            draws = rng.integers(0, len(fa), size=(resamples, len(fa)))
+            estimates = [_sobol_estimates(fa[d], fab[:, d], fb[d]) for d in draws]
+            first, total = (np.array(estimate) for estimate in zip(*estimates))
+            indices["S1_conf"][output] = 1.96 * np.nanstd(first, axis=0, ddof=1)
+            indices["ST_conf"][output] = 1.96 * np.nanstd(total, axis=0, ddof=1)
+    return indices
+
+
+def season_outputs(results, columns: Sequence[str]) -> np.ndarray:
+    """
+    Season output values of a simulation, averaged over its seasons
+
+    The default output extraction of run_sensitivity; it runs in the workers
+    so only these numbers are sent back.
+
+    Args:
+        results: Results returned by AquaCrop.run()
+        columns: Columns of the season output (e.g. 'Y(dry)', 'BioMass')
+
+    Returns:
+        One value per column
+    """
+    season = results["season"]
+    return season[list(columns)].astype(float).mean().to_numpy()
+
+
+@dataclass
+class SensitivityResult:
+    """
+    Outcome of run_sensitivity
+    """
+
+    method: str  # 'morris' or 'sobol'
+    parameters: List[ParameterRange]
+    design: np.ndarray  # Unit hypercube design, shape (runs, k)
+    outputs: np.ndarray  # Output values of every run, shape (runs, m), NaN when failed
+    output_names: List[str]
+    # Indices by name, each of shape (m, k), see morris_indices and sobol_indices
+    indices: Dict[str, np.ndarray] = field(default_factory=dict)
+    errors: Dict[int, str] = field(default_factory=dict)  # Traceback by design row
+
+    @property
+    def parameter_names(self) -> List[str]:
+        return [parameter.path for parameter in self.parameters]
+
+    def to_frame(self, name: str):
+        """
+        One index as a DataFrame with a row per output and a column per parameter
+        """
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.indices[name], index=self.output_names, columns=self.parameter_names
+        )
+
+
+def run_sensitivity(
+    config: Dict,
+    parameters: Union[Mapping[str, Tuple[float, float]], Sequence[ParameterRange]],
+    method: str = "sobol",
+    samples: int = 64,
+    outputs: Sequence[str] = ("Y(dry)", "BioMass"),
+    extract: Optional[Callable[[Any], Any]] = None,
+    levels: int = 4,
+    resamples: int = 100,
+    seed: Optional[int] = None,
+    input_cache=None,
+    **batch_options,
+) -> SensitivityResult:
+    """
+    Run a sensitivity analysis of AquaCrop outputs to parameters
+
+    Every design row becomes a scenario: a copy of config where only the
+    entities holding sampled parameters are copied. All scenarios share an
+    InputFileCache, so the files of the unchanged entities (weather, ...)
+    are rendered once and hardlinked, and the scenarios run in parallel with
+    batch.run_many, which reuses working directories unless told otherwise.
+    Failed runs are reported in SensitivityResult.errors and left out of the
+    indices.
+
+    Args:
+        config: Base AquaCrop keyword arguments
+        parameters: Parameter ranges, as ParameterRange objects or a mapping
+            of path (e.g. 'crop.water_productivity') to (low, high)
+        method: 'sobol' or 'morris'
+        samples: Base samples N of the Saltelli design (N * (k + 2) runs),
+            or Morris trajectories r (r * (k + 1) runs)
+        outputs: Season output columns to analyse, averaged over the seasons
+        extract: Function of the results returning the output values,
+            replacing outputs (must be picklable, see batch.run_many)
+        levels: Grid levels of the Morris design
+        resamples: Bootstrap resamples of the Sobol confidence intervals
+        seed: Seed of the design and of the bootstrap
+        input_cache: InputFileCache to use (a temporary one that is removed
+            afterwards when neither given nor set in config)
+        **batch_options: Options of batch.run_many (workers, backend,
+            executable_path, ...)
+
+    Returns:
+        SensitivityResult with the design, outputs and indices
+
+    Raises:
+        ValueError: If the method is unknown or a parameter does not exist
+        RuntimeError: If every run failed
+    """
+    from aquacrop.batch import run_many
+
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+    ranges = parameter_ranges(parameters, config)
+    rng = np.random.default_rng(seed)
+    if method == "morris":
+        design = morris_design(len(ranges), samples, levels, rng)
+    else:
+        design = saltelli_design(len(ranges), samples, rng)
+
+    output_names = list(outputs)
+    if extract is None:
+        extract = functools.partial(season_outputs, columns=tuple(outputs))
+    else:
+        output_names = []
+
+    def scenarios(base: Dict) -> Iterator[Dict]:
+        for row in design:
+            yield apply_parameters(base, sample_values(ranges, row))
+
+    batch_options.setdefault("reuse_working_dirs", True)
+    values: Dict[int, np.ndarray] = {}
+    errors: Dict[int, str] = {}
+    with shared_inputs(config, input_cache) as base:
+        for result in run_many(scenarios(base), extract=extract, **batch_options):
+            if result.ok and result.results is not None:
+                values[result.key] = np.atleast_1d(
+                    np.asarray(result.results, dtype=float)
+                )
+            else:
+                errors[result.key] = result.error or "Insufficient weather data"
+
+    if not values:
+        raise RuntimeError(
+            f"Every run of the sensitivity analysis failed, first error:\n"
+            f"{errors[min(errors)]}"
+        )
+    if errors:
+        logger.warning("%d of %d runs failed", len(errors), len(design))
+
+    width = len(next(iter(values.values())))
+    output_values = np.full((len(design), width), np.nan)
+    for row, value in values.items():
+        output_values[row] = value
+    if not output_names:
+        output_names = [f"output_{position}" for position in range(width)]
+
+    if method == "morris":
+        indices = morris_indices(design, output_values)
+    else:
+        indices = sobol_indices(output_values, len(ranges), resamples, rng)
+
+    return SensitivityResult(
+        method=method,
+        parameters=ranges,
+        design=design,
+        outputs=output_values,
+        output_names=output_names,
+        indices=indices,
+        errors=errors,
+    )
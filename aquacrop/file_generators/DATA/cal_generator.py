@@ -2,8 +2,8 @@
 Calendar file generator for AquaCrop (.CAL files)
 """
 
-import os
 from aquacrop.constants import Constants
+from aquacrop.utils.files import write_text_file
 
 def generate_calendar_file(
     file_path: str,
@@ -104,9 +104,7 @@ def generate_calendar_file(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
 
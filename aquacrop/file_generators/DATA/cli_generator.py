@@ -2,8 +2,8 @@
 Climate file generator for AquaCrop (.CLI files)
 """
 
-import os
 from aquacrop.constants import Constants
+from aquacrop.utils.files import write_text_file
 
 def generate_climate_file(
     file_path: str,
@@ -40,8 +40,6 @@ def generate_climate_file(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
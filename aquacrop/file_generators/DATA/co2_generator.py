@@ -2,8 +2,8 @@
 CO2 file generator for AquaCrop (.CO2 files)
 """
 
-import os
 from typing import List, Dict, Tuple, Optional
+from aquacrop.utils.files import write_text_file
 
 def generate_co2_file(
     file_path: str,
@@ -59,8 +59,6 @@ def generate_co2_file(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
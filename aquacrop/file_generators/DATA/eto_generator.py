@@ -2,13 +2,17 @@
 ET0 file generator for AquaCrop (.ETO files)
 """
 
-import os
-from typing import List
+from typing import List, Union
+
+import numpy as np
+
+from aquacrop.utils.files import write_text_file
+from aquacrop.utils.formatting import format_one_decimal
 
 def generate_eto_file(
     file_path: str,
     location: str,
-    eto_values: List[float],
+    eto_values: Union[List[float], np.ndarray],
     record_type: int = 1,
     first_day: int = 1,
     first_month: int = 1,
@@ -49,14 +53,12 @@ def generate_eto_file(
         "======================="
     ]
     
-    for eto in eto_values:
-        lines.append(f"{eto:.1f}")
+    if len(eto_values):
+        lines.append(format_one_decimal([eto_values]))
     
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
@@ -1,11 +1,11 @@
 """
 Groundwater file generator for AquaCrop (.GWT files)
 """
-import os
 from typing import List, Optional, Dict, Union
 from datetime import datetime
 
 from aquacrop.constants import Constants
+from aquacrop.utils.files import write_text_file
 
 def generate_groundwater_file(
     file_path: str,
@@ -83,9 +83,7 @@ def generate_groundwater_file(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
 
@@ -1,6 +1,6 @@
-import os
 from typing import List, Optional, Dict, Union
 from aquacrop.constants import Constants
+from aquacrop.utils.files import write_text_file
 
 def generate_irrigation_file(
     file_path: str,
@@ -99,9 +99,7 @@ def generate_irrigation_file(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
 
@@ -1,9 +1,9 @@
 """
 Management file generator for AquaCrop (.MAN files)
 """
-import os
 from typing import List, Optional, Dict
 from aquacrop.constants import Constants
+from aquacrop.utils.files import write_text_file
 
 def generate_management_file(
     file_path: str,
@@ -141,8 +141,6 @@ def generate_management_file(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
@@ -2,11 +2,11 @@
 Off-season conditions file generator for AquaCrop (.OFF files)
 """
 
-import os
 from datetime import datetime
 from typing import Dict, List, Optional, Union
 
 from aquacrop.constants import Constants
+from aquacrop.utils.files import write_text_file
 
 
 def generate_offseason_file(
@@ -104,9 +104,7 @@ def generate_offseason_file(
     content = "\n".join(lines)
 
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "w") as f:
-            f.write(content)
+        write_text_file(file_path, content)
 
     return file_path
 
@@ -2,12 +2,17 @@
 Rainfall file generator for AquaCrop (.PLU files)
 """
 
-import os
-from typing import List
+from typing import List, Union
+
+import numpy as np
+
+from aquacrop.utils.files import write_text_file
+from aquacrop.utils.formatting import format_one_decimal
+
 def generate_rainfall_file(
     file_path: str,
     location: str,
-    rainfall_values: List[float],
+    rainfall_values: Union[List[float], np.ndarray],
     record_type: int = 1,
     first_day: int = 1,
     first_month: int = 1,
@@ -50,14 +55,12 @@ def generate_rainfall_file(
         "======================="
     ]
     
-    for rain in rainfall_values:
-        lines.append(f"{rain:.1f}")
+    if len(rainfall_values):
+        lines.append(format_one_decimal([rainfall_values]))
     
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
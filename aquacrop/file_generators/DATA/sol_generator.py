@@ -2,9 +2,9 @@
 Soil file generator for AquaCrop (.SOL files)
 """
 
-import os
 from typing import List, Dict
 from aquacrop.constants import Constants
+from aquacrop.utils.files import write_text_file
 
 def generate_soil_file(
     file_path: str,
@@ -66,8 +66,6 @@ def generate_soil_file(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
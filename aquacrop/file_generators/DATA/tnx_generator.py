@@ -2,13 +2,17 @@
 Temperature file generator for AquaCrop (.Tnx files)
 """
 
-import os
-from typing import List, Tuple
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from aquacrop.utils.files import write_text_file
+from aquacrop.utils.formatting import format_one_decimal
 
 def generate_temperature_file(
     file_path: str,
     location: str,
-    temperatures: List[Tuple[float, float]],  # List of (tmin, tmax) tuples
+    temperatures: Union[List[Tuple[float, float]], np.ndarray],  # (tmin, tmax) pairs
     record_type: int = 1,
     first_day: int = 1,
     first_month: int = 1,
@@ -21,7 +25,7 @@ def generate_temperature_file(
     Args:
         file_path: Path to write the file
         location: Location description
-        temperatures: List of (tmin, tmax) tuples
+        temperatures: List of (tmin, tmax) tuples or array of shape (n, 2)
         record_type: Record type (1=daily, 2=10-daily, 3=monthly)
         first_day: First day of record
         first_month: First month of record
@@ -50,14 +54,13 @@ def generate_temperature_file(
         "========================"
     ]
     
-    for tmin, tmax in temperatures:
-        lines.append(f"{tmin:.1f}\t{tmax:.1f}")
+    temperatures = np.asarray(temperatures, dtype=float).reshape(-1, 2)
+    if len(temperatures):
+        lines.append(format_one_decimal([temperatures[:, 0], temperatures[:, 1]], "\t"))
     
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
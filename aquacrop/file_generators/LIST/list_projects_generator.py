@@ -2,8 +2,8 @@
 CO2 file generator for AquaCrop (.CO2 files)
 """
 
-import os
 from typing import List, Dict, Tuple
+from aquacrop.utils.files import write_text_file
 
 def generate_co2_file(
     file_path: str,
@@ -36,9 +36,7 @@ def generate_co2_file(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
 
@@ -2,10 +2,10 @@
 Project file generator for AquaCrop (.PRM and .PRO files)
 """
 
-import os
 from typing import Dict, List, Optional
 from aquacrop.utils.julianDayConverter import convertJulianToDateString
 from aquacrop.constants import Constants
+from aquacrop.utils.files import write_text_file
 def generate_project_file(
     file_path: str,
     description: str,
@@ -38,6 +38,11 @@ def generate_project_file(
             - sw0_file: Initial conditions file name
             - off_file: Off-season file name
             - obs_file: Observations file name
+            - data_path: Optional directory of the DATA files (default './DATA/')
+            - obs_path: Optional directory of the OBS file (default './OBS/')
+            - <kind>_path: Optional directory of one file, overriding data_path
+              (kind is cli, tnx, eto, plu, cal, cro, irr, man, sol, gwt, sw0 or
+              off), and co2_path for the CO2 file (default './SIMUL/')
         version: AquaCrop version
     
     Returns:
@@ -69,56 +74,60 @@ def generate_project_file(
         lines.append(f"  {last_day_crop}         : Last day of cropping period - {last_date_crop_str}")
         
         # Define path strings
-        data_path = "'./DATA/'"
-        simul_path = "'./SIMUL/'"
-        obs_path = "'./OBS/'"
+        default_data_path = period.get('data_path', './DATA/')
+        simul_path = f"'{period.get('co2_path', './SIMUL/')}'"
+        obs_path = f"'{period.get('obs_path', './OBS/')}'"
         none_str = "(None)"
+
+        # Quoted directory of one file, falling back to the DATA directory
+        def path_of(kind):
+            return f"'{period.get(f'{kind}_path', default_data_path)}'"
         
         # Add file references
         lines.append("-- 1. Climate (CLI) file")
         lines.append(f"   {period.get('cli_file', none_str)}")
-        lines.append(f"   {data_path if period.get('cli_file') else none_str}")
+        lines.append(f"   {path_of('cli') if period.get('cli_file') else none_str}")
         
         lines.append("   1.1 Temperature (Tnx or TMP) file")
         lines.append(f"   {period.get('tnx_file', none_str)}")
-        lines.append(f"   {data_path if period.get('tnx_file') else none_str}")
+        lines.append(f"   {path_of('tnx') if period.get('tnx_file') else none_str}")
         
         lines.append("   1.2 Reference ET (ETo) file")
         lines.append(f"   {period.get('eto_file', none_str)}")
-        lines.append(f"   {data_path if period.get('eto_file') else none_str}")
+        lines.append(f"   {path_of('eto') if period.get('eto_file') else none_str}")
         
         lines.append("   1.3 Rain (PLU) file")
         lines.append(f"   {period.get('plu_file', none_str)}")
-        lines.append(f"   {data_path if period.get('plu_file') else none_str}")
+        lines.append(f"   {path_of('plu') if period.get('plu_file') else none_str}")
         
         # TODO: This is a fortran bug, we need to call the file MaunaLoa.CO2
         lines.append("   1.4 Atmospheric CO2 concentration (CO2) file")
         lines.append("   MaunaLoa.CO2")
-        lines.append("   './SIMUL/'")
+        lines.append(f"   {simul_path}")
         
         lines.append("-- 2. Calendar (CAL) file")
         lines.append(f"   {period.get('cal_file', none_str)}")
-        lines.append(f"   {data_path if period.get('cal_file') else none_str}")
+        lines.append(f"   {path_of('cal') if period.get('cal_file') else none_str}")
         
         lines.append("-- 3. Crop (CRO) file")
         lines.append(f"   {period.get('cro_file', none_str)}")
-        lines.append(f"   {data_path if period.get('cro_file') else none_str}")
+        lines.append(f"   {path_of('cro') if period.get('cro_file') else none_str}")
         
         lines.append("-- 4. Irrigation management (IRR) file")
         lines.append(f"   {period.get('irr_file', none_str)}")
-        lines.append(f"   {data_path if period.get('irr_file') and period.get('irr_file') != none_str else none_str}")
+        lines.append(f"   {path_of('irr') if period.get('irr_file') and period.get('irr_file') != none_str else none_str}")
         
         lines.append("-- 5. Field management (MAN) file")
         lines.append(f"   {period.get('man_file', none_str)}")
-        lines.append(f"   {data_path if period.get('man_file') else none_str}")
+        lines.append(f"   {path_of('man') if period.get('man_file') else none_str}")
         
         lines.append("-- 6. Soil profile (SOL) file")
         lines.append(f"   {period.get('sol_file', none_str)}")
-        lines.append(f"   {data_path if period.get('sol_file') else none_str}")
+        lines.append(f"   {path_of('sol') if period.get('sol_file') else none_str}")
         
         lines.append("-- 7. Groundwater table (GWT) file")
         lines.append(f"   {period.get('gwt_file', none_str)}")
-        lines.append(f"   {data_path if period.get('gwt_file') and period.get('gwt_file') != none_str else none_str}")
+        lines.append(f"   {path_of('gwt') if period.get('gwt_file') and period.get('gwt_file') != none_str else none_str}")
         
         lines.append("-- 8. Initial conditions (SW0) file")
         init_cond = period.get('sw0_file', none_str)
@@ -128,13 +137,13 @@ def generate_project_file(
         elif init_cond == "KeepSWC":
             init_desc = "Keep soil water profile of previous run"
         else:
-            init_desc = none_str if not init_cond or init_cond in [none_str, "(None)"] else data_path
+            init_desc = none_str if not init_cond or init_cond in [none_str, "(None)"] else path_of('sw0')
         lines.append(f"   {init_cond}")
         lines.append(f"   {init_desc}")
         
         lines.append("-- 9. Off-season conditions (OFF) file")
         lines.append(f"   {period.get('off_file', none_str)}")
-        lines.append(f"   {data_path if period.get('off_file') and period.get('off_file') != none_str else none_str}")
+        lines.append(f"   {path_of('off') if period.get('off_file') and period.get('off_file') != none_str else none_str}")
         
         lines.append("-- 10. Field data (OBS) file")
         lines.append(f"   {period.get('obs_file', none_str)}")
@@ -143,8 +152,6 @@ def generate_project_file(
     # Write the file
     content = "\n".join(lines)
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
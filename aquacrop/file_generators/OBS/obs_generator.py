@@ -2,9 +2,9 @@
 Observations file generator for AquaCrop (.OBS files)
 """
 
-import os
 from typing import List, Dict, Tuple, Optional
 from aquacrop.constants import Constants
+from aquacrop.utils.files import write_text_file
 def generate_observation_file(
     file_path: str,
     location: str,
@@ -70,8 +70,6 @@ def generate_observation_file(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
@@ -2,8 +2,8 @@
 Parameter file generator for AquaCrop (.PP1 and .PPn files)
 """
 
-import os
 from typing import Dict, Optional
+from aquacrop.utils.files import write_text_file
 
 def generate_parameter_file(
     file_path: str,
@@ -111,8 +111,6 @@ def generate_parameter_file(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
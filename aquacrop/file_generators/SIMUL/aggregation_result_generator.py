@@ -2,7 +2,7 @@
 Aggregation Results settings generator for AquaCrop (AggregationResults.SIM)
 """
 
-import os
+from aquacrop.utils.files import write_text_file
 
 def generate_aggregation_results_settings(
     file_path: str,
@@ -37,8 +37,6 @@ def generate_aggregation_results_settings(
     content = f" {aggregation_level} : Time aggregation for intermediate results (0 = {level_descriptions[0]} ; 1 = {level_descriptions[1]}; 2 = {level_descriptions[2]}; 3 = {level_descriptions[3]})"
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
@@ -2,8 +2,8 @@
 Particular Results settings generator for AquaCrop (ParticularResults.SIM)
 """
 
-import os
 from typing import List, Optional
+from aquacrop.utils.files import write_text_file
 
 def generate_particular_results_settings(
     file_path: str,
@@ -44,8 +44,6 @@ def generate_particular_results_settings(
     content = "\n".join(lines)
     
     if file_path:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        write_text_file(file_path, content)
     
     return file_path
\ No newline at end of file
@@ -0,0 +1,303 @@
+"""
+Byte-offset index of AquaCrop daily output files for random access
+"""
+
+import mmap
+import os
+import re
+from datetime import date
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Bump when the layout of the cached index changes
+INDEX_FORMAT = 1
+
+_RUN_PATTERN = re.compile(rb"Run:\s+(\d+)")
+_HEADER_PATTERN = re.compile(rb"Day Month\s+Year\s+DAP Stage[^\n]*")
+# Data rows start with the day, month and year of the row. Matching from the
+# line break before the row is much faster than a multiline '^', and the first
+# line of a file is never a data row (rows follow a header line).
+_ROW_PATTERN = re.compile(rb"\n[ \t]*(\d+)[ \t]+(\d+)[ \t]+(\d+)[ \t]")
+
+
+def _to_datetime64(days: np.ndarray, months: np.ndarray, years: np.ndarray):
+    """Combine day, month and year arrays into datetime64[D] values"""
+    month_index = (years - 1970) * 12 + (months - 1)
+    return month_index.astype("datetime64[M]").astype("datetime64[D]") + (days - 1)
+
+
+class OutputIndex:
+    """
+    Byte offsets of the runs, table headers and dated rows of a daily output
+
+    The index is built by scanning a memory map of the file, without reading
+    it into memory, and cached next to it as '<file>.idx.npz'. The cache is
+    only used while the size and modification time of the file match.
+
+    Example:
+        index = OutputIndex.load("OUTP/OttawaPRMday.OUT")
+        rows = index.rows_between(date(2015, 6, 1), date(2015, 6, 30))
+        for run, text in index.read_rows(rows):
+            ...
+    """
+
+    SUFFIX = ".idx.npz"
+
+    def __init__(
+        self,
+        filepath: str,
+        run_numbers: np.ndarray,
+        run_offsets: np.ndarray,
+        header_offsets: np.ndarray,
+        row_offsets: np.ndarray,
+        row_runs: np.ndarray,
+        row_dates: np.ndarray,
+    ):
+        """
+        Initialize the index (use build or load to create one)
+
+        Args:
+            filepath: Path to the indexed file
+            run_numbers: Number of every run, in file order
+            run_offsets: Offset of the 'Run:' marker of every run
+            header_offsets: Start and end offsets of the table header line of
+                every run, shape (runs, 2), -1 for runs without a table
+            row_offsets: Offset of every data row
+            row_runs: Position (in run_numbers) of the run of every data row
+            row_dates: Date of every data row (datetime64[D])
+        """
+        self.filepath = filepath
+        self.run_numbers = run_numbers
+        self.run_offsets = run_offsets
+        self.header_offsets = header_offsets
+        self.row_offsets = row_offsets
+        self.row_runs = row_runs
+        self.row_dates = row_dates
+
+    @classmethod
+    def cache_path(cls, filepath: str) -> str:
+        """Path of the cached index of a file"""
+        return filepath + cls.SUFFIX
+
+    @staticmethod
+    def _signature(filepath: str) -> np.ndarray:
+        """Format, size and modification time the cached index must match"""
+        stat = os.stat(filepath)
+        return np.array([INDEX_FORMAT, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+    @classmethod
+    def build(cls, filepath: str) -> "OutputIndex":
+        """
+        Index a daily output file
+
+        Args:
+            filepath: Path to the daily output file
+
+        Returns:
+            OutputIndex of the file
+        """
+        empty = np.array([], dtype=np.int64)
+        if os.path.getsize(filepath) == 0:
+            return cls(
+                filepath,
+                empty,
+                empty,
+                np.empty((0, 2), dtype=np.int64),
+                empty,
+                empty,
+                np.array([], dtype="datetime64[D]"),
+            )
+
+        with open(filepath, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            runs = [(m.start(), int(m.group(1))) for m in _RUN_PATTERN.finditer(mm)]
+            if not runs:
+                # A file without markers is a single run numbered 1
+                runs = [(0, 1)]
+            headers = [(m.start(), m.end()) for m in _HEADER_PATTERN.finditer(mm)]
+            rows = [
+                (m.start() + 1, int(m.group(1)), int(m.group(2)), int(m.group(3)))
+                for m in _ROW_PATTERN.finditer(mm)
+            ]
+
+        run_offsets = np.array([offset for offset, _ in runs], dtype=np.int64)
+        run_numbers = np.array([number for _, number in runs], dtype=np.int64)
+
+        # The table header of a run is the first one after its marker
+        header_offsets = np.full((len(runs), 2), -1, dtype=np.int64)
+        for start, end in headers:
+            run = np.searchsorted(run_offsets, start, side="right") - 1
+            if run >= 0 and header_offsets[run, 0] < 0:
+                header_offsets[run] = (start, end)
+
+        row_table = np.array(rows, dtype=np.int64).reshape(-1, 4)
+        row_offsets = row_table[:, 0]
+        row_runs = np.searchsorted(run_offsets, row_offsets, side="right") - 1
+        # Only rows below the header of their run are data rows
+        row_headers = header_offsets[np.maximum(row_runs, 0)]
+        keep = (
+            (row_runs >= 0)
+            & (row_headers[:, 0] >= 0)
+            & (row_offsets > row_headers[:, 1])
+        )
+        row_table = row_table[keep]
+
+        return cls(
+            filepath,
+            run_numbers,
+            run_offsets,
+            header_offsets,
+            row_table[:, 0],
+            row_runs[keep],
+            _to_datetime64(row_table[:, 1], row_table[:, 2], row_table[:, 3]),
+        )
+
+    @classmethod
+    def load(cls, filepath: str, cache: bool = True) -> "OutputIndex":
+        """
+        Load the cached index of a file, building (and caching) it when needed
+
+        Args:
+            filepath: Path to the daily output file
+            cache: Whether to read and write the cached index next to the file
+
+        Returns:
+            OutputIndex of the file
+        """
+        if not cache:
+            return cls.build(filepath)
+
+        cache_path = cls.cache_path(filepath)
+        signature = cls._signature(filepath)
+        try:
+            with np.load(cache_path) as stored:
+                if np.array_equal(stored["signature"], signature):
+                    return cls(
+                        filepath,
+                        stored["run_numbers"],
+                        stored["run_offsets"],
+                        stored["header_offsets"],
+                        stored["row_offsets"],
+                        stored["row_runs"],
+                        stored["row_dates"],
+                    )
+        except (OSError, KeyError, ValueError):
+            pass
+
+        index = cls.build(filepath)
+        index.save(signature)
+        return index
+
+    def save(self, signature: Optional[np.ndarray] = None):
+        """
+        Cache the index next to its file
+
+        The index is written to a temporary file and renamed into place, and
+        not cached at all when the directory is not writable.
+
+        Args:
+            signature: Signature of the file when indexed (read from the file
+                when not given)
+        """
+        if signature is None:
+            signature = self._signature(self.filepath)
+        cache_path = self.cache_path(self.filepath)
+        temporary = f"{cache_path}.{os.getpid()}.tmp.npz"
+        try:
+            np.savez(
+                temporary,
+                signature=signature,
+                run_numbers=self.run_numbers,
+                run_offsets=self.run_offsets,
+                header_offsets=self.header_offsets,
+                row_offsets=self.row_offsets,
+                row_runs=self.row_runs,
+                row_dates=self.row_dates,
+            )
+            os.replace(temporary, cache_path)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def _run_position(self, run_number: int) -> int:
+        """Position of a run in run_numbers"""
+        positions = np.flatnonzero(self.run_numbers == run_number)
+        if not len(positions):
+            raise KeyError(f"Run {run_number} is not in {self.filepath}")
+        return int(positions[0])
+
+    def run_rows(self, run_number: int) -> np.ndarray:
+        """
+        Rows of one run
+
+        Args:
+            run_number: Run number, as in the 'Run:' marker
+
+        Returns:
+            Row positions (indices into row_offsets)
+        """
+        return np.flatnonzero(self.row_runs == self._run_position(run_number))
+
+    def rows_between(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        run_number: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Rows dated within a period (both ends included)
+
+        Args:
+            start_date: First date (unbounded when not given)
+            end_date: Last date (unbounded when not given)
+            run_number: Only rows of this run (all runs when not given)
+
+        Returns:
+            Row positions (indices into row_offsets)
+        """
+        mask = np.ones(len(self.row_offsets), dtype=bool)
+        if start_date is not None:
+            mask &= self.row_dates >= np.datetime64(start_date, "D")
+        if end_date is not None:
+            mask &= self.row_dates <= np.datetime64(end_date, "D")
+        if run_number is not None:
+            mask &= self.row_runs == self._run_position(run_number)
+        return np.flatnonzero(mask)
+
+    def read_rows(self, rows: np.ndarray) -> Tuple[Tuple[int, str], ...]:
+        """
+        Read the text of some rows, grouped by run
+
+        Args:
+            rows: Row positions (indices into row_offsets)
+
+        Returns:
+            Tuples of the run number and a table text (the header line of the
+            run followed by the rows), one per run holding some of the rows
+        """
+        rows = np.sort(np.asarray(rows, dtype=np.int64))
+        if not len(rows):
+            return ()
+
+        sections = []
+        with open(self.filepath, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            for run in np.unique(self.row_runs[rows]):
+                header_start, header_end = self.header_offsets[run]
+                lines = [mm[header_start:header_end]]
+
+                run_rows = rows[self.row_runs[rows] == run]
+                # Consecutive rows are read as one block
+                breaks = np.flatnonzero(np.diff(run_rows) != 1) + 1
+                for block in np.split(run_rows, breaks):
+                    start = self.row_offsets[block[0]]
+                    end = mm.find(b"\n", self.row_offsets[block[-1]])
+                    lines.append(mm[start : end if end >= 0 else len(mm)])
+
+                text = b"\n".join(lines).decode().replace("\r\n", "\n")
+                sections.append((int(self.run_numbers[run]), text))
+
+        return tuple(sections)
@@ -0,0 +1,130 @@
+"""
+Pool of pre-built AquaCrop working directories that are reused between runs
+"""
+
+import os
+import queue
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from aquacrop.aquacrop import WORKING_SUBDIRECTORIES, install_aquacrop_executable
+from aquacrop.utils.files import default_working_root
+
+
+class WorkingDirPool:
+    """
+    Fixed-size pool of ready-to-use working directories
+
+    Every directory is created once with the AquaCrop subdirectories and the
+    executable already in place. A simulation leases a directory, runs in it
+    and gives it back. On release only the outputs are cleared: the inputs of
+    the last run stay, so the next run with the same crop, soil, weather, ...
+    finds identical files and keeps them (see utils.files), instead of
+    creating and deleting the whole tree for every run. The next run removes
+    the inputs it did not write itself once its own are in place (see
+    AquaCrop._remove_stale_inputs).
+
+    Example:
+        pool = WorkingDirPool(size=2, executable_path=exe)
+        with pool.lease() as working_dir:
+            AquaCrop(working_dir=working_dir, ...).run()
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        root: Optional[str] = None,
+        executable_path: Optional[str] = None,
+    ):
+        """
+        Initialize the pool and build its working directories
+
+        Args:
+            size: Number of working directories
+            root: Directory holding the working directories (a temporary
+                directory that is removed by close() when not given)
+            executable_path: AquaCrop executable to place in every directory
+        """
+        if size < 1:
+            raise ValueError("The pool size must be at least 1")
+
+        self.size = size
+        self.is_temp_root = root is None
+        self.root = os.path.abspath(
+            root
+            or tempfile.mkdtemp(prefix="aquacrop_pool_", dir=default_working_root())
+        )
+        self.executable_path = executable_path
+
+        self._available: "queue.Queue[str]" = queue.Queue()
+
+        for index in range(size):
+            directory = os.path.join(self.root, f"slot_{index}")
+            self._build(directory)
+            self._available.put(directory)
+
+    def _build(self, directory: str):
+        """Create one working directory"""
+        for subdirectory in WORKING_SUBDIRECTORIES:
+            os.makedirs(os.path.join(directory, subdirectory), exist_ok=True)
+
+        if self.executable_path:
+            install_aquacrop_executable(self.executable_path, directory)
+
+    def _reset(self, directory: str):
+        """Clear the outputs of a returned directory"""
+        output_dir = os.path.join(directory, "OUTP")
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Restore the executable if it was removed or replaced
+        if self.executable_path:
+            install_aquacrop_executable(self.executable_path, directory)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Lease a working directory for the duration of the context
+
+        Args:
+            timeout: Seconds to wait for a free directory (waits forever when
+                None)
+
+        Yields:
+            Path to the leased working directory
+
+        Raises:
+            TimeoutError: If no directory became free within timeout
+        """
+        try:
+            directory = self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No working directory became available within {timeout} seconds"
+            )
+
+        try:
+            yield directory
+        finally:
+            try:
+                self._reset(directory)
+            except OSError:
+                # Rebuild from scratch rather than hand out a dirty directory
+                shutil.rmtree(directory, ignore_errors=True)
+                self._build(directory)
+            self._available.put(directory)
+
+    def close(self):
+        """Remove the working directories of a temporary pool"""
+        if self.is_temp_root and os.path.exists(self.root):
+            shutil.rmtree(self.root, ignore_errors=True)
+            self.is_temp_root = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
@@ -0,0 +1,454 @@
+"""
+Regional runs over a table of sites, with results as cell x year x variable arrays
+
+run_regional() runs one simulation per site (cell), with one simulation
+period per year, and gathers the season outputs into a single NumPy array.
+The sites are described by a table with one row per cell:
+
+- 'soil': key of the cell soil in soils (or a Soil when soils is not given)
+- 'weather': key of the cell weather, passed to weather (a mapping or a
+  loading function)
+- 'management': optional key of the field management in managements (or a
+  FieldManagement); cells without one use the management of config
+- 'planting_date': date whose month and day are the planting date of every
+  year
+
+Cells are scheduled in chunks: every worker process task runs a chunk of
+cells (see batch.run_many) and sends back only its block of the array, so
+neither the per-scenario task overhead nor the result tables grow with the
+number of cells.
+
+Example:
+    sites = pd.DataFrame(
+        {
+            "soil": ["loam", "clay"],
+            "weather": ["station_12", "station_40"],
+            "planting_date": [date(2000, 5, 1), date(2000, 5, 15)],
+            "lat": [37.9, 38.1],
+            "lon": [-4.8, -4.6],
+        },
+        index=["c0", "c1"],
+    )
+    result = run_regional(
+        sites, range(2001, 2011), crop, soils, load_weather, workers=32
+    )
+    result.variable("Y(dry)")  # cells x years
+    result.to_netcdf("yields.nc")  # needs xarray
+"""
+
+import calendar
+import functools
+import logging
+import os
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from aquacrop.aquacrop import find_aquacrop_executable
+from aquacrop.executors import Executor
+
+logger = logging.getLogger(__name__)
+
+# Season output columns gathered by default
+DEFAULT_VARIABLES = ("Y(dry)", "BioMass", "Irri", "WPet")
+# Columns of the site table
+SITE_COLUMNS = ("soil", "weather", "management", "planting_date")
+
+# Inputs shared by the chunks of the current (worker) process, see run_regional
+_site_inputs: Optional[Dict] = None
+
+
+def _in_year(planting_date, year: int) -> date:
+    """Month and day of a planting date in a given year (Feb 29 as Feb 28)"""
+    planting_date = pd.Timestamp(planting_date)
+    day = min(planting_date.day, calendar.monthrange(year, planting_date.month)[1])
+    return date(year, planting_date.month, day)
+
+
+def site_periods(
+    planting_date, years: Sequence[int], season_days: Optional[int] = None
+) -> List[Dict]:
+    """
+    Simulation periods of a site, one per year starting at planting
+
+    Args:
+        planting_date: Date whose month and day are used every year
+        years: Years of the periods
+        season_days: Length of the periods in days (by default they last
+            until the day before the planting date of the next year)
+
+    Returns:
+        Simulation periods as expected by AquaCrop
+    """
+    periods = []
+    for year in years:
+        start = _in_year(planting_date, year)
+        if season_days is None:
+            end = _in_year(planting_date, year + 1) - timedelta(days=1)
+        else:
+            end = start + timedelta(days=season_days - 1)
+        periods.append({"start_date": start, "end_date": end, "planting_date": start})
+    return periods
+
+
+def season_values(
+    results, years: Sequence[int], variables: Sequence[str]
+) -> np.ndarray:
+    """
+    Season outputs of a site as a years x variables array
+
+    Args:
+        results: Results returned by AquaCrop.run() for the periods of years
+        years: Years of the simulation periods, in order
+        variables: Season output columns
+
+    Returns:
+        Array of shape (years, variables), NaN for the seasons missing from
+        the output
+    """
+    values = np.full((len(years), len(variables)), np.nan)
+    season = results["season"] if results is not None else None
+    if season is None or season.empty:
+        return values
+    # Season n of the output is the simulation period n
+    runs = season["RunNr"].astype(int).to_numpy() - 1
+    kept = (runs >= 0) & (runs < len(years))
+    values[runs[kept]] = season[list(variables)].astype(float).to_numpy()[kept]
+    return values
+
+
+def _entity(table: Optional[Mapping], key: Any):
+    """Entity for a key of the site table, None for a missing value"""
+    if key is None or (isinstance(key, float) and np.isnan(key)):
+        return None
+    return table[key] if table is not None else key
+
+
+def _site_config(site: Mapping[str, Any], inputs: Dict) -> Dict:
+    """AquaCrop keyword arguments of a row of the site table"""
+    weather = inputs["weather"]
+    climate = (
+        weather(site["weather"]) if callable(weather) else weather[site["weather"]]
+    )
+    config = dict(inputs["config"])
+    config.update(
+        simulation_periods=site_periods(
+            site["planting_date"], inputs["years"], inputs["season_days"]
+        ),
+        crop=inputs["crop"],
+        soil=_entity(inputs["soils"], site["soil"]),
+        climate=climate,
+    )
+    management = _entity(inputs["managements"], site.get("management"))
+    if management is not None:
+        config["management"] = management
+    return config
+
+
+def _init_site_inputs(inputs: Dict):
+    """Give the current worker process the inputs shared by the chunks"""
+    global _site_inputs
+    _site_inputs = inputs
+
+
+def run_chunk(
+    positions: Sequence[int],
+    sites: Sequence[Mapping[str, Any]],
+    inputs: Optional[Dict] = None,
+) -> Tuple[Sequence[int], np.ndarray, Dict[int, str]]:
+    """
+    Run a chunk of sites one after the other in the current process
+
+    Args:
+        positions: Positions of the sites in the site table
+        sites: Rows of the site table
+        inputs: Inputs shared by the chunks (those given to the worker
+            process when not given, see run_regional)
+
+    Returns:
+        Positions, their array of shape (sites, years, variables) and the
+        traceback of every failed site by position
+    """
+    from aquacrop.batch import run_many
+
+    inputs = inputs or _site_inputs
+    years, variables = inputs["years"], inputs["variables"]
+    values = np.full((len(positions), len(years), len(variables)), np.nan)
+    errors: Dict[int, str] = {}
+
+    def configs() -> Iterator[Tuple[int, Dict]]:
+        for index, site in enumerate(sites):
+            try:
+                yield index, _site_config(site, inputs)
+            except Exception:
+                errors[positions[index]] = traceback.format_exc()
+
+    results = run_many(
+        dict(configs()),
+        workers=1,
+        run_options=inputs["run_options"],
+        executable_path=inputs["executable_path"],
+        reuse_working_dirs=inputs["reuse_working_dirs"],
+        backend=inputs["backend"],
+        extract=functools.partial(season_values, years=years, variables=variables),
+    )
+    for result in results:
+        if result.ok:
+            values[result.key] = result.results
+        else:
+            errors[positions[result.key]] = result.error
+    return positions, values.astype(inputs["dtype"]), errors
+
+
+@dataclass
+class RegionalResult:
+    """
+    Outcome of run_regional
+    """
+
+    cells: np.ndarray  # Cell ids (index of the site table)
+    years: np.ndarray
+    variables: List[str]
+    data: np.ndarray  # Shape (cells, years, variables), NaN where missing
+    # Traceback of every failed cell, by cell id
+    errors: Dict[Any, str] = field(default_factory=dict)
+    sites: Optional[pd.DataFrame] = field(default=None, repr=False)
+
+    def variable(self, name: str) -> np.ndarray:
+        """Values of a variable, of shape (cells, years)"""
+        return self.data[:, :, self.variables.index(name)]
+
+    def to_xarray(self):
+        """
+        Results as an xarray DataArray with dimensions (cell, year, variable)
+
+        Numeric columns of the site table (coordinates, elevation, ...) are
+        added as coordinates along the cell dimension.
+
+        Raises:
+            ImportError: If xarray is not installed
+        """
+        try:
+            import xarray as xr
+        except ImportError as error:
+            raise ImportError(
+                "xarray is needed to export regional results "
+                "(pip install pyaquacrop[netcdf])"
+            ) from error
+
+        coords = {"cell": self.cells, "year": self.years, "variable": self.variables}
+        if self.sites is not None:
+            for column in self.sites.columns:
+                if column not in SITE_COLUMNS and pd.api.types.is_numeric_dtype(
+                    self.sites[column]
+                ):
+                    coords[column] = ("cell", self.sites[column].to_numpy())
+        return xr.DataArray(
+            self.data,
+            dims=("cell", "year", "variable"),
+            coords=coords,
+            name="season",
+        )
+
+    def to_netcdf(self, path: str, **kwargs) -> str:
+        """
+        Save the results as NetCDF (see to_xarray)
+
+        Args:
+            path: Output file
+            **kwargs: Keyword arguments of xarray.DataArray.to_netcdf
+
+        Returns:
+            Path to the output file
+        """
+        data = self.to_xarray()
+        # Cell ids and variable names as plain strings, which NetCDF can store
+        data = data.assign_coords(
+            cell=data["cell"].astype(str), variable=data["variable"].astype(str)
+        )
+        data.to_netcdf(path, **kwargs)
+        return path
+
+
+def run_regional(
+    sites: pd.DataFrame,
+    years: Sequence[int],
+    crop,
+    soils: Optional[Mapping[Any, Any]],
+    weather: Union[Mapping[Any, Any], Callable[[Any], Any]],
+    managements: Optional[Mapping[Any, Any]] = None,
+    variables: Sequence[str] = DEFAULT_VARIABLES,
+    season_days: Optional[int] = None,
+    chunk_size: int = 256,
+    workers: Optional[int] = None,
+    config: Optional[Dict] = None,
+    run_options: Optional[Dict] = None,
+    executable_path: Optional[str] = None,
+    reuse_working_dirs: bool = True,
+    backend: Optional[Executor] = None,
+    dtype=np.float32,
+) -> RegionalResult:
+    """
+    Run every site of a table for the given years
+
+    The shared inputs (crop, soils, managements, weather and config) are
+    sent once to every worker process, and chunks only carry their rows of
+    the site table. With many cells, pass weather as a function loading the
+    weather of a key (from files, a database, ...) rather than a mapping of
+    every weather, and an input_cache in config so that the files of the
+    crop and of repeated soils are rendered once (see cache.InputFileCache).
+
+    Args:
+        sites: Site table, one row per cell (see the module documentation),
+            whose index gives the cell ids
+        years: Simulated years, one simulation period each
+        crop: Crop of every site
+        soils: Soils by the keys of the 'soil' column (None when the column
+            holds Soil entities)
+        weather: Mapping or function giving the Weather of the keys of the
+            'weather' column
+        managements: Field managements by the keys of the 'management'
+            column (None when the column holds FieldManagement entities)
+        variables: Season output columns to gather
+        season_days: Length of the simulation periods (see site_periods)
+        chunk_size: Number of sites run by a worker task
+        workers: Number of worker processes (defaults to the CPU count); 1
+            runs every chunk in the current process
+        config: Other AquaCrop keyword arguments shared by every site
+            (irrigation, initial_conditions, input_cache, ...)
+        run_options: Keyword arguments passed to every AquaCrop.run() call
+        executable_path: AquaCrop executable to use (resolved once when not
+            given)
+        reuse_working_dirs: Run the sites of a chunk in one reused working
+            directory (see batch.run_many)
+        backend: Executor running AquaCrop (see aquacrop.executors)
+        dtype: Data type of the result array
+
+    Returns:
+        RegionalResult with the (cells, years, variables) array
+
+    Raises:
+        ValueError: If the site table lacks a column or season_days is out
+            of range
+    """
+    missing = [c for c in ("soil", "weather", "planting_date") if c not in sites]
+    if missing:
+        raise ValueError(f"Site table without column(s): {', '.join(missing)}")
+    if season_days is not None and not 0 < season_days <= 365:
+        raise ValueError("season_days must be between 1 and 365")
+    if executable_path is None and (backend is None or backend.needs_executable):
+        executable_path = find_aquacrop_executable(verbose=False)
+
+    years = list(years)
+    variables = list(variables)
+    inputs = {
+        "years": years,
+        "variables": variables,
+        "season_days": season_days,
+        "crop": crop,
+        "soils": soils,
+        "weather": weather,
+        "managements": managements,
+        "config": dict({"verbose": False}, **(config or {})),
+        "run_options": run_options,
+        "executable_path": executable_path,
+        "reuse_working_dirs": reuse_working_dirs,
+        "backend": backend,
+        "dtype": dtype,
+    }
+    columns = [c for c in SITE_COLUMNS if c in sites]
+    data = np.full((len(sites), len(years), len(variables)), np.nan, dtype=dtype)
+    errors: Dict[Any, str] = {}
+    cells = sites.index.to_numpy()
+    finished = 0
+
+    def chunks() -> Iterator[Tuple[List[int], List[Dict]]]:
+        for start in range(0, len(sites), chunk_size):
+            rows = sites.iloc[start : start + chunk_size][columns]
+            yield list(range(start, start + len(rows))), rows.to_dict("records")
+
+    def collect(positions, values, failed):
+        nonlocal finished
+        data[positions] = values
+        for position, error in failed.items():
+            errors[cells[position]] = error
+        finished += len(positions)
+        logger.info(
+            "Regional run: %d of %d sites done, %d failed",
+            finished,
+            len(sites),
+            len(errors),
+        )
+
+    def lost(positions):
+        """Record the sites of a chunk whose block never came back as failed"""
+        error = traceback.format_exc()
+        collect(positions, np.nan, dict.fromkeys(positions, error))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for positions, rows in chunks():
+            collect(*run_chunk(positions, rows, inputs))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_site_inputs,
+            initargs=(inputs,),
+        ) as process_pool:
+            # Positions of the sites of every submitted chunk
+            pending: Dict[Future, List[int]] = {}
+            remaining = chunks()
+            exhausted = False
+            while pending or not exhausted:
+                # Bound the chunks waiting in memory, see batch.run_many
+                while not exhausted and len(pending) < workers * 2:
+                    try:
+                        positions, rows = next(remaining)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    try:
+                        future = process_pool.submit(run_chunk, positions, rows)
+                    except BrokenProcessPool:
+                        # A worker died, the pool takes no more chunks
+                        lost(positions)
+                        continue
+                    pending[future] = positions
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    positions = pending.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception:
+                        # Crashed worker or block that could not be unpickled
+                        lost(positions)
+                    else:
+                        collect(*outcome)
+
+    return RegionalResult(
+        cells=cells,
+        years=np.array(years),
+        variables=variables,
+        data=data,
+        errors=errors,
+        sites=sites,
+    )
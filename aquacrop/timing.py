@@ -0,0 +1,120 @@
+"""
+Timing of the phases of a simulation run
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def children_cpu_time() -> Optional[float]:
+    """
+    CPU time (user + system, in seconds) of the finished child processes
+
+    Returns:
+        Total since the start of the process, or None where getrusage is not
+        available (Windows)
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class PhaseTimer:
+    """
+    Wall-clock timings of the phases of a run
+
+    Every phase is recorded as a dictionary with its name, its duration in
+    seconds and phase-specific details (entity, file, ...). Records are logged
+    at DEBUG level on the 'aquacrop.timing' logger and passed to the hook.
+
+    Example:
+        timer = PhaseTimer(hook=print)
+        with timer.phase("generate", entity="Crop") as details:
+            details["file"] = crop.generate_file("DATA")
+        timer.summary()  # {'generate': 0.0012}
+    """
+
+    def __init__(self, hook: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize the timer
+
+        Args:
+            hook: Called with every record as soon as its phase ends
+        """
+        self.hook = hook
+        self.records: List[Dict[str, Any]] = []
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __repr__(self) -> str:
+        phases = ", ".join(
+            f"{name}={seconds:.4f}s" for name, seconds in self.summary().items()
+        )
+        return f"PhaseTimer({phases})"
+
+    def __getstate__(self):
+        # Hooks (often closures) stay in the process that set them
+        state = self.__dict__.copy()
+        state["hook"] = None
+        return state
+
+    @contextmanager
+    def phase(self, name: str, **details) -> Iterator[Dict[str, Any]]:
+        """
+        Time the block as one phase
+
+        Args:
+            name: Phase name
+            **details: Details stored with the record
+
+        Yields:
+            The details, to which the block can add entries
+        """
+        start = time.perf_counter()
+        try:
+            yield details
+        finally:
+            self.add(name, time.perf_counter() - start, **details)
+
+    def add(self, name: str, seconds: float, **details):
+        """Record a phase timed elsewhere"""
+        record = {"phase": name, "seconds": seconds, **details}
+        self.records.append(record)
+        logger.debug(
+            "%s took %.4f s %s",
+            name,
+            seconds,
+            details or "",
+            extra={"aquacrop_timing": record},
+        )
+        if self.hook is not None:
+            self.hook(record)
+
+    def total(self, name: str) -> float:
+        """Total duration of the phases with a name"""
+        return sum(
+            record["seconds"] for record in self.records if record["phase"] == name
+        )
+
+    def summary(self) -> Dict[str, float]:
+        """Total duration by phase name, in order of first occurrence"""
+        totals: Dict[str, float] = {}
+        for record in self.records:
+            totals[record["phase"]] = (
+                totals.get(record["phase"], 0.0) + record["seconds"]
+            )
+        return totals
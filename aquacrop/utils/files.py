@@ -0,0 +1,187 @@
+"""
+Writing of AquaCrop input files, directly or rendered in memory first
+"""
+
+import contextvars
+import locale
+import os
+import shutil
+from contextlib import contextmanager
+from stat import S_ISREG
+from typing import Dict, Iterator, Optional, Set
+
+# Free space a tmpfs needs to be used as the default working root
+MIN_WORKING_ROOT_BYTES = 512 * 1024**2
+# Environment variable overriding the default working root ("" disables it)
+WORKING_ROOT_VARIABLE = "AQUACROP_WORKING_ROOT"
+_TMPFS_CANDIDATES = ("/dev/shm",)
+
+# Files rendered by the innermost render_in_memory block, by path
+_rendered: contextvars.ContextVar[Optional[Dict[str, bytes]]] = contextvars.ContextVar(
+    "aquacrop_rendered_files", default=None
+)
+# Paths of the files written by the innermost record_writes block
+_written: contextvars.ContextVar[Optional[Set[str]]] = contextvars.ContextVar(
+    "aquacrop_written_files", default=None
+)
+
+
+def _encode(content: str) -> bytes:
+    """Encode text exactly like a file opened with open(path, 'w') would"""
+    if os.linesep != "\n":
+        content = content.replace("\n", os.linesep)
+    return content.encode(locale.getpreferredencoding(False))
+
+
+def _replace_file(file_path: str, data: bytes):
+    """
+    Write a file, unlinking any previous one first
+
+    Input files may be hardlinks into a shared cache (see cache.InputFileCache),
+    which must never be modified in place. A regular file that already holds
+    data (left by the previous run of a reused working directory, see
+    pool.WorkingDirPool) is kept as it is.
+    """
+    try:
+        stat = os.lstat(file_path)
+    except FileNotFoundError:
+        stat = None
+    if stat is not None:
+        if S_ISREG(stat.st_mode) and stat.st_nlink == 1 and stat.st_size == len(data):
+            with open(file_path, "rb") as f:
+                unchanged = f.read() == data
+            if unchanged:
+                mark_written(file_path)
+                return
+        os.unlink(file_path)
+    with open(file_path, "wb") as f:
+        f.write(data)
+    mark_written(file_path)
+
+
+def mark_written(file_path: str):
+    """
+    Report an input file as written to the enclosing record_writes block
+
+    Args:
+        file_path: Path of the file, written or found already up to date
+    """
+    written = _written.get()
+    if written is not None:
+        written.add(os.path.abspath(file_path))
+
+
+@contextmanager
+def record_writes() -> Iterator[Set[str]]:
+    """
+    Record the input files written in the block
+
+    Files kept because they were already up to date and files linked from the
+    input cache count as written. Files rendered inside a render_in_memory
+    block are recorded when the render block writes them.
+
+    Example:
+        with record_writes() as written:
+            with render_in_memory():
+                crop.generate_file("DATA")
+        # written == {"/abs/DATA/Ottawa.CRO"}
+
+    Yields:
+        The absolute paths written so far
+    """
+    written: Set[str] = set()
+    token = _written.set(written)
+    try:
+        yield written
+    finally:
+        _written.reset(token)
+
+
+def write_files(files: Dict[str, bytes]):
+    """
+    Write rendered files in one pass
+
+    Args:
+        files: File content by path
+    """
+    created = set()
+    for file_path, data in files.items():
+        directory = os.path.dirname(file_path)
+        if directory not in created:
+            os.makedirs(directory, exist_ok=True)
+            created.add(directory)
+        _replace_file(file_path, data)
+
+
+def write_text_file(file_path: str, content: str):
+    """
+    Write an input file, or keep it in memory inside a render_in_memory block
+
+    Args:
+        file_path: Path of the file
+        content: Text of the file
+    """
+    rendered = _rendered.get()
+    if rendered is not None:
+        rendered[os.path.abspath(file_path)] = _encode(content)
+        return
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    _replace_file(file_path, _encode(content))
+
+
+@contextmanager
+def render_in_memory() -> Iterator[Dict[str, bytes]]:
+    """
+    Render the input files written in the block to memory, then write them
+
+    The generators only encode their files inside the block; every file is
+    written in one pass when the block exits without error (nothing is written
+    otherwise). Blocks can be nested, each one writes its own files.
+
+    Example:
+        with render_in_memory() as files:
+            crop.generate_file("DATA")
+            soil.generate_file("DATA")
+        # Both files are written here, len(files) == 2
+
+    Yields:
+        The rendered file content by absolute path
+    """
+    files: Dict[str, bytes] = {}
+    token = _rendered.set(files)
+    try:
+        yield files
+    finally:
+        _rendered.reset(token)
+    write_files(files)
+
+
+def default_working_root(min_free_bytes: int = MIN_WORKING_ROOT_BYTES) -> Optional[str]:
+    """
+    Directory for temporary working directories
+
+    AQUACROP_WORKING_ROOT is used when set (an empty value selects the system
+    temporary directory). Otherwise a writable tmpfs with at least
+    min_free_bytes free (/dev/shm) is preferred, so that the input files and
+    the outputs of AquaCrop stay in memory.
+
+    Args:
+        min_free_bytes: Free space the tmpfs must have
+
+    Returns:
+        Directory, or None for the system temporary directory
+    """
+    configured = os.environ.get(WORKING_ROOT_VARIABLE)
+    if configured is not None:
+        return configured or None
+
+    for candidate in _TMPFS_CANDIDATES:
+        if not (os.path.isdir(candidate) and os.access(candidate, os.W_OK | os.X_OK)):
+            continue
+        try:
+            if shutil.disk_usage(candidate).free >= min_free_bytes:
+                return candidate
+        except OSError:
+            continue
+    return None
@@ -0,0 +1,117 @@
+"""
+Vectorized text formatting of numeric series for AquaCrop input files
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+# Above this magnitude the tenths are no longer exact in the int64 fast path
+_FAST_PATH_LIMIT = 1e14
+
+
+def _round_tenths(values: np.ndarray) -> np.ndarray:
+    """
+    Round values * 10 to integers exactly like f"{value:.1f}" does
+
+    Python rounds the exact binary value half-to-even, so 0.35 (stored as
+    0.34999...) gives 0.3 while a plain rint(0.35 * 10) would give 4. The
+    product is computed as 8x + 2x (both exact) with its exact rounding error
+    (TwoSum), which decides the cases that land on a half.
+    """
+    a = values * 8.0
+    b = values * 2.0
+    product = a + b
+    b_virtual = product - a
+    error = (a - (product - b_virtual)) + (b - b_virtual)
+
+    rounded = np.rint(product)
+    remainder = product - rounded
+    rounded += (remainder == 0.5) & (error > 0)
+    rounded -= (remainder == -0.5) & (error < 0)
+    return rounded.astype(np.int64)
+
+
+def _format_slow(columns: Sequence[np.ndarray], delimiter: str) -> str:
+    """Reference implementation, used for values outside the fast path"""
+    row_format = delimiter.join(["{:.1f}"] * len(columns))
+    return "\n".join(map(row_format.format, *(column.tolist() for column in columns)))
+
+
+def format_one_decimal(
+    columns: Sequence[Sequence[float]], delimiter: str = "\t"
+) -> str:
+    """
+    Format numeric columns as text rows with one decimal
+
+    The result is identical to joining f"{value:.1f}" fields with delimiter
+    and rows with newlines (no trailing newline), but the digits are produced
+    with array operations instead of one string format per value.
+
+    Args:
+        columns: Columns of equal length (lists or 1-D arrays)
+        delimiter: Separator between the fields of a row
+
+    Returns:
+        Formatted rows joined by newlines
+    """
+    columns = [np.asarray(column, dtype=np.float64).ravel() for column in columns]
+    if not columns or len(columns[0]) == 0:
+        return ""
+    if any(len(column) != len(columns[0]) for column in columns):
+        raise ValueError("All columns must have the same length")
+
+    if not all(
+        np.isfinite(column).all() and (np.abs(column) < _FAST_PATH_LIMIT).all()
+        for column in columns
+    ):
+        return _format_slow(columns, delimiter)
+
+    separator = delimiter.encode("ascii")
+    fields = []
+    for column in columns:
+        tenths = np.abs(_round_tenths(column))
+        integer_part = tenths // 10
+        digits = np.ones(len(column), dtype=np.int64)
+        largest = int(integer_part.max())
+        power = 10
+        while power <= largest:
+            digits += integer_part >= power
+            power *= 10
+        negative = np.signbit(column).astype(np.int64)  # f-strings keep "-0.0"
+        fields.append((negative, integer_part, tenths % 10, digits))
+
+    # Length of every row including its delimiters and line break
+    row_lengths = np.full(len(columns[0]), (len(columns) - 1) * len(separator) + 1)
+    for negative, _, _, digits in fields:
+        row_lengths += negative + digits + 2
+    row_starts = np.concatenate(([0], np.cumsum(row_lengths)[:-1]))
+
+    buffer = np.empty(int(row_lengths.sum()), dtype=np.uint8)
+    position = row_starts.copy()
+    for index, (negative, integer_part, fraction, digits) in enumerate(fields):
+        if index:
+            for byte in separator:
+                buffer[position] = byte
+                position += 1
+
+        buffer[position[negative == 1]] = ord("-")
+        position += negative
+
+        # Integer digits, least significant first
+        remaining = integer_part.copy()
+        for place in range(int(digits.max())):
+            mask = digits > place
+            buffer[position[mask] + digits[mask] - 1 - place] = (
+                ord("0") + remaining[mask] % 10
+            )
+            remaining //= 10
+        position += digits
+
+        buffer[position] = ord(".")
+        buffer[position + 1] = ord("0") + fraction
+        position += 2
+
+    buffer[position] = ord("\n")
+
+    return buffer[:-1].tobytes().decode("ascii")
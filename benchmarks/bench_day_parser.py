@@ -0,0 +1,96 @@
+"""
+Benchmark of the daily output parser on scaled-up copies of the reference file
+
+The data rows of every run of tests/referenceFiles/OUTP/OttawaPRMday.OUT are
+repeated to build larger files, which are parsed with the vectorized table
+reader (the default) and with the line by line reader it replaced.
+
+Usage:
+    python benchmarks/bench_day_parser.py [--scales 1 10 50] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from aquacrop.output import OutputFile
+
+REFERENCE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "referenceFiles",
+    "OUTP",
+    "OttawaPRMday.OUT",
+)
+
+
+def build_scaled_file(directory: str, scale: int) -> str:
+    """Write a copy of the reference file with every data row repeated"""
+    with open(REFERENCE_FILE, "r") as f:
+        lines = f.read().split("\n")
+
+    scaled = []
+    for line in lines:
+        is_data = bool(line.strip()) and line.strip()[0].isdigit()
+        scaled.extend([line] * (scale if is_data else 1))
+
+    # A project name other than Ottawa, so every run is parsed in full
+    path = os.path.join(directory, f"Scaled{scale}PRMday.OUT")
+    with open(path, "w") as f:
+        f.write("\n".join(scaled))
+    return path
+
+
+def parse_line_by_line(path: str):
+    """Parse every run with the line by line reader only"""
+    return OutputFile(os.path.basename(path))._parse_day_file(path, vectorized=False)
+
+
+def parse_vectorized(path: str):
+    """Parse every run with the vectorized table reader"""
+    return OutputFile(os.path.basename(path))._parse_day_file(path)
+
+
+def best_time(function, path: str, repeat: int) -> float:
+    """Best wall-clock time of several calls"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'scale':>6} {'rows':>8} {'MB':>7} {'line (s)':>10} {'table (s)':>10} {'speedup':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in args.scales:
+            path = build_scaled_file(directory, scale)
+
+            table = parse_vectorized(path)
+            lines = parse_line_by_line(path)
+            for run, frame in table.items():
+                pd.testing.assert_frame_equal(frame, lines[run])
+
+            line_time = best_time(parse_line_by_line, path, args.repeat)
+            table_time = best_time(parse_vectorized, path, args.repeat)
+            rows = sum(len(frame) for frame in table.values())
+            size = os.path.getsize(path) / 1e6
+            print(
+                f"{scale:>6} {rows:>8} {size:>7.1f} {line_time:>10.3f} "
+                f"{table_time:>10.3f} {line_time / table_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Benchmark of the input file generators at realistic sizes
+
+Every generator of aquacrop/file_generators writes its file into a temporary
+directory: weather series of many years of daily records, long irrigation and
+groundwater schedules, many observations and multi-year project files. The
+small fixed-layout files (crop, soil, management, ...) are rendered from the
+templates through their entities.
+
+Usage:
+    python benchmarks/bench_generators.py [--days 20000] [--events 500] [--repeat 5]
+"""
+
+import os
+import tempfile
+from datetime import date, timedelta
+
+import numpy as np
+
+from measure import Report, measure, parser
+
+from aquacrop.file_generators.DATA.cli_generator import generate_climate_file
+from aquacrop.file_generators.DATA.co2_generator import generate_co2_file
+from aquacrop.file_generators.DATA.eto_generator import generate_eto_file
+from aquacrop.file_generators.DATA.gwt_generator import generate_groundwater_file
+from aquacrop.file_generators.DATA.irr_generator import generate_irrigation_file
+from aquacrop.file_generators.DATA.off_generator import generate_offseason_file
+from aquacrop.file_generators.DATA.plu_generator import generate_rainfall_file
+from aquacrop.file_generators.DATA.tnx_generator import generate_temperature_file
+from aquacrop.file_generators.LIST.list_projects_generator import (
+    generate_co2_file as generate_list_co2_file,
+)
+from aquacrop.file_generators.LIST.prm_generator import generate_project_file
+from aquacrop.file_generators.OBS.obs_generator import generate_observation_file
+from aquacrop.file_generators.SIMUL.aggregation_result_generator import (
+    generate_aggregation_results_settings,
+)
+from aquacrop.file_generators.SIMUL.daily_results_generator import (
+    generate_daily_results_settings,
+)
+from aquacrop.file_generators.SIMUL.particular_result_generator import (
+    generate_particular_results_settings,
+)
+from aquacrop.templates import (
+    established_crop_initial,
+    may_21_calendar,
+    ottawa_alfalfa,
+    ottawa_management,
+    ottawa_parameters,
+    ottawa_sandy_loam,
+)
+from aquacrop.utils.julianDayConverter import calculateAquaCropJulianDay
+
+
+def weather_series(days: int, seed: int = 0):
+    """Daily temperatures, ETo and rainfall with a seasonal cycle"""
+    rng = np.random.default_rng(seed)
+    season = np.sin(np.arange(days) * 2 * np.pi / 365.25)
+    tmin = 5 + 10 * season + rng.normal(0, 3, days)
+    tmax = tmin + 8 + rng.gamma(2, 2, days)
+    eto = np.clip(3 + 2 * season + rng.normal(0, 0.8, days), 0, None)
+    rain = np.where(rng.random(days) < 0.3, rng.gamma(0.8, 8, days), 0.0)
+    return np.column_stack([tmin, tmax]), eto, rain
+
+
+def project_periods(years: int):
+    """Consecutive one-year simulation periods"""
+    periods = []
+    start = date(1990, 1, 1)
+    for year in range(years):
+        first = start.replace(year=start.year + year)
+        last = first.replace(year=first.year + 1) - timedelta(days=1)
+        periods.append(
+            {
+                "year": year + 1,
+                "first_day_sim": calculateAquaCropJulianDay(first),
+                "last_day_sim": calculateAquaCropJulianDay(last),
+                "first_day_crop": calculateAquaCropJulianDay(
+                    first + timedelta(days=120)
+                ),
+                "last_day_crop": calculateAquaCropJulianDay(
+                    first + timedelta(days=270)
+                ),
+                "is_seeding_year": year == 0,
+                "cli_file": "Site.CLI",
+                "tnx_file": "Site.Tnx",
+                "eto_file": "Site.ETo",
+                "plu_file": "Site.PLU",
+                "co2_file": "MaunaLoa.CO2",
+                "cal_file": "Site.CAL",
+                "cro_file": "Crop.CRO",
+                "irr_file": "Site.IRR",
+                "man_file": "Site.MAN",
+                "sol_file": "Site.SOL",
+                "gwt_file": "(None)",
+                "sw0_file": "(None)",
+                "off_file": "(None)",
+                "obs_file": "(None)",
+            }
+        )
+    return periods
+
+
+def build_cases(directory: str, days: int, events: int):
+    """Benchmark cases: (name, size, function without arguments)"""
+    temperatures, eto, rain = weather_series(days)
+    years = days // 365
+    co2_records = [(1902 + year, 297.0 + 0.8 * year) for year in range(200)]
+    irrigation_events = [
+        {"day": 10 + 3 * index, "depth": 25.0, "ec": 0.5} for index in range(events)
+    ]
+    groundwater = [
+        {"day": 1 + 7 * index, "depth": 2.0 + np.sin(index / 8), "ec": 0.8}
+        for index in range(events)
+    ]
+    observations = [
+        {
+            "day": 1 + 3 * index,
+            "canopy_cover": (min(95.0, index / 2), 3.0),
+            "biomass": (index / 50, 0.2),
+            "soil_water": (250.0 - index / 10, 10.0),
+        }
+        for index in range(events)
+    ]
+    off_season_events = [{"day": 1 + index, "depth": 20} for index in range(50)]
+
+    def path(name):
+        return os.path.join(directory, name)
+
+    return [
+        (
+            "DATA/tnx",
+            f"{days} days",
+            lambda: generate_temperature_file(path("Site.Tnx"), "Site", temperatures),
+        ),
+        (
+            "DATA/eto",
+            f"{days} days",
+            lambda: generate_eto_file(path("Site.ETo"), "Site", eto),
+        ),
+        (
+            "DATA/plu",
+            f"{days} days",
+            lambda: generate_rainfall_file(path("Site.PLU"), "Site", rain),
+        ),
+        (
+            "DATA/cli",
+            "1 file",
+            lambda: generate_climate_file(
+                path("Site.CLI"),
+                "Site",
+                "Site.Tnx",
+                "Site.ETo",
+                "Site.PLU",
+                "MaunaLoa.CO2",
+            ),
+        ),
+        (
+            "DATA/co2",
+            f"{len(co2_records)} years",
+            lambda: generate_co2_file(path("MaunaLoa.CO2"), records=co2_records),
+        ),
+        (
+            "LIST/list_projects (CO2)",
+            f"{len(co2_records)} years",
+            lambda: generate_list_co2_file(path("List.CO2"), "CO2", co2_records),
+        ),
+        (
+            "DATA/irr events",
+            f"{events} events",
+            lambda: generate_irrigation_file(
+                path("Site.IRR"), "Events", irrigation_events=irrigation_events
+            ),
+        ),
+        (
+            "DATA/gwt variable",
+            f"{events} records",
+            lambda: generate_groundwater_file(
+                path("Site.GWT"),
+                "Variable",
+                groundwater_type=2,
+                groundwater_observations=groundwater,
+            ),
+        ),
+        (
+            "DATA/off",
+            "100 events",
+            lambda: generate_offseason_file(
+                path("Site.OFF"),
+                "Off-season",
+                num_irrigation_before=len(off_season_events),
+                irrigation_events_before=off_season_events,
+                num_irrigation_after=len(off_season_events),
+                irrigation_events_after=off_season_events,
+            ),
+        ),
+        (
+            "OBS/obs",
+            f"{events} observations",
+            lambda: generate_observation_file(path("Site.OBS"), "Site", observations),
+        ),
+        (
+            "LIST/prm",
+            f"{years} periods",
+            lambda: generate_project_file(
+                path("Site.PRM"), "Site", project_periods(years)
+            ),
+        ),
+        (
+            "DATA/cro (template)",
+            "1 crop",
+            lambda: ottawa_alfalfa.generate_file(directory),
+        ),
+        (
+            "DATA/sol (template)",
+            "1 profile",
+            lambda: ottawa_sandy_loam.generate_file(directory),
+        ),
+        (
+            "DATA/man (template)",
+            "1 file",
+            lambda: ottawa_management.generate_file(directory),
+        ),
+        (
+            "DATA/cal (template)",
+            "1 file",
+            lambda: may_21_calendar.generate_file(directory),
+        ),
+        (
+            "DATA/sw0 (template)",
+            "1 file",
+            lambda: established_crop_initial.generate_file(directory),
+        ),
+        (
+            "PARAM/ppn (template)",
+            "1 file",
+            lambda: ottawa_parameters.generate_file(directory),
+        ),
+        (
+            "SIMUL/daily results",
+            "8 types",
+            lambda: generate_daily_results_settings(
+                path("DailyResults.SIM"), list(range(1, 9))
+            ),
+        ),
+        (
+            "SIMUL/particular results",
+            "2 types",
+            lambda: generate_particular_results_settings(
+                path("ParticularResults.SIM"), [1, 2]
+            ),
+        ),
+        (
+            "SIMUL/aggregation results",
+            "1 file",
+            lambda: generate_aggregation_results_settings(
+                path("AggregationResults.SIM")
+            ),
+        ),
+    ]
+
+
+def main():
+    arguments = parser(__doc__.split("\n")[1])
+    arguments.add_argument("--days", type=int, default=20000)
+    arguments.add_argument("--events", type=int, default=500)
+    args = arguments.parse_args()
+
+    report = Report("generators", args.compare)
+    with tempfile.TemporaryDirectory() as directory:
+        for name, size, function in build_cases(directory, args.days, args.events):
+            report.add(name, size, measure(function, args.repeat))
+    report.save(args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark of the OutputFile parsers on scaled-up reference outputs
+
+Synthetic output files are built from tests/referenceFiles/OUTP: the daily
+rows of every run are repeated (see bench_day_parser.py), the season and
+harvests files get RUNS_PER_SCALE times more runs per scale and the
+evaluation files more observations. Every OutputFile._parse_* method is then
+timed on them, together with the projection and compact variants of the
+daily parser.
+
+Usage:
+    python benchmarks/bench_parsers.py [--scales 1 10 50] [--repeat 3]
+"""
+
+import os
+import re
+import tempfile
+
+from bench_day_parser import REFERENCE_FILE, build_scaled_file
+from measure import Report, measure, parser
+
+from aquacrop.output import OutputFile, compact_frame
+
+REFERENCE_OUTP = os.path.dirname(REFERENCE_FILE)
+# The season and harvests files of a scale hold this many times more runs
+RUNS_PER_SCALE = 20
+
+
+def _read_reference(filename: str):
+    with open(os.path.join(REFERENCE_OUTP, filename), "r") as f:
+        return f.read().split("\n")
+
+
+def build_scaled_season(directory: str, scale: int) -> str:
+    """Write a season file with the runs of the reference file repeated"""
+    lines = _read_reference("OttawaPRMseason.OUT")
+    header = [line for line in lines if not line.strip().startswith("Tot(")]
+    runs = [line for line in lines if line.strip().startswith("Tot(")]
+
+    scaled, number = [], 0
+    for _ in range(scale * RUNS_PER_SCALE):
+        for line in runs:
+            number += 1
+            scaled.append(re.sub(r"Tot\(\d+\)", f"Tot({number})", line, count=1))
+
+    # Data rows follow the two header lines of the table
+    insert_at = max(index for index, line in enumerate(header) if line.strip()) + 1
+    path = os.path.join(directory, f"Scaled{scale}PRMseason.OUT")
+    with open(path, "w") as f:
+        f.write("\n".join(header[:insert_at] + scaled + header[insert_at:]))
+    return path
+
+
+def build_scaled_harvests(directory: str, scale: int) -> str:
+    """Write a harvests file with the runs of the reference file repeated"""
+    text = "\n".join(_read_reference("OttawaPRMharvests.OUT"))
+    first_run = text.index("   Run:")
+    header, body = text[:first_run], text[first_run:]
+    runs = re.split(r"(?=   Run:)", body)
+    runs = [run for run in runs if run]
+
+    blocks, number = [], 0
+    for _ in range(scale * RUNS_PER_SCALE):
+        for run in runs:
+            number += 1
+            blocks.append(re.sub(r"Run:\s+\d+", f"Run:   {number}", run, count=1))
+
+    path = os.path.join(directory, f"Scaled{scale}PRMharvests.OUT")
+    with open(path, "w") as f:
+        f.write(header + "".join(blocks))
+    return path
+
+
+def build_scaled_evaluation(directory: str, scale: int) -> str:
+    """Write an evaluation file with every observation row repeated"""
+    scaled = []
+    for line in _read_reference("OttawaPRM1evaluation.OUT"):
+        is_data = bool(line.strip()) and line.strip()[0].isdigit()
+        scaled.extend([line] * (scale if is_data else 1))
+
+    path = os.path.join(directory, f"Scaled{scale}PRM1evaluation.OUT")
+    with open(path, "w") as f:
+        f.write("\n".join(scaled))
+    return path
+
+
+def build_cases(directory: str, scale: int):
+    """Benchmark cases of one scale: (name, file, function without arguments)"""
+    day = build_scaled_file(directory, scale)
+    season = build_scaled_season(directory, scale)
+    harvests = build_scaled_harvests(directory, scale)
+    evaluation = build_scaled_evaluation(directory, scale)
+
+    def parse(method, path, **options):
+        return lambda: getattr(OutputFile(os.path.basename(path)), method)(
+            path, **options
+        )
+
+    def parse_compact(path):
+        frames = OutputFile(os.path.basename(path))._parse_day_file(path)
+        return {run: compact_frame(frame) for run, frame in frames.items()}
+
+    return [
+        ("_parse_day_file", day, parse("_parse_day_file", day)),
+        (
+            "_parse_day_file (line reader)",
+            day,
+            parse("_parse_day_file", day, vectorized=False),
+        ),
+        (
+            "_parse_day_file (3 columns)",
+            day,
+            parse("_parse_day_file", day, columns=["CC", "Biomass", "Rain"]),
+        ),
+        ("_parse_day_file + compact_frame", day, lambda: parse_compact(day)),
+        ("_parse_season_file", season, parse("_parse_season_file", season)),
+        ("_parse_harvests_file", harvests, parse("_parse_harvests_file", harvests)),
+        (
+            "_parse_evaluation_file",
+            evaluation,
+            parse("_parse_evaluation_file", evaluation),
+        ),
+    ]
+
+
+def main():
+    arguments = parser(__doc__.split("\n")[1])
+    arguments.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    args = arguments.parse_args()
+
+    report = Report("parsers", args.compare)
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in args.scales:
+            for name, path, function in build_cases(directory, scale):
+                size = f"{os.path.getsize(path) / 1e6:.2f} MB"
+                report.add(f"{name} x{scale}", size, measure(function, args.repeat))
+    report.save(args.json)
+
+
+if __name__ == "__main__":
+    main()
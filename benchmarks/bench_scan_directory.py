@@ -0,0 +1,82 @@
+"""
+Benchmark of OutputReader.scan_directory on a directory of many projects
+
+The reference outputs of tests/referenceFiles/OUTP are copied under many
+project names (as left by run_multi_project or a reused working directory),
+then the directory is scanned with the default options, lazily, for one output
+type only and with a projection of the daily columns.
+
+Usage:
+    python benchmarks/bench_scan_directory.py [--projects 20 100] [--repeat 3]
+"""
+
+import os
+import shutil
+import tempfile
+
+from bench_day_parser import REFERENCE_FILE
+from measure import Report, measure, parser
+
+from aquacrop.output import OutputReader
+
+REFERENCE_OUTP = os.path.dirname(REFERENCE_FILE)
+
+
+def build_directory(directory: str, projects: int) -> str:
+    """Copy the reference outputs under several project names"""
+    output_dir = os.path.join(directory, f"OUTP_{projects}")
+    os.makedirs(output_dir)
+    for filename in os.listdir(REFERENCE_OUTP):
+        if not filename.startswith("OttawaPRM"):
+            continue
+        for project in range(projects):
+            shutil.copy(
+                os.path.join(REFERENCE_OUTP, filename),
+                os.path.join(
+                    output_dir, filename.replace("Ottawa", f"Project{project:05d}")
+                ),
+            )
+    return output_dir
+
+
+def directory_size(directory: str) -> float:
+    """Total size of the output files in MB"""
+    return sum(entry.stat().st_size for entry in os.scandir(directory)) / 1e6
+
+
+def scan(output_dir: str, **options):
+    """Case scanning the directory with a new reader"""
+    return lambda: OutputReader(output_dir).scan_directory(**options)
+
+
+def main():
+    arguments = parser(__doc__.split("\n")[1])
+    arguments.add_argument("--projects", type=int, nargs="+", default=[20, 100])
+    args = arguments.parse_args()
+
+    report = Report("scan_directory", args.compare)
+    with tempfile.TemporaryDirectory() as directory:
+        for projects in args.projects:
+            output_dir = build_directory(directory, projects)
+            size = f"{projects} x {directory_size(output_dir) / projects:.2f} MB"
+            cases = [
+                ("scan_directory", {}),
+                ("scan_directory (lazy)", {"lazy": True}),
+                ("scan_directory (season only)", {"output_types": ["season"]}),
+                (
+                    "scan_directory (3 day columns)",
+                    {"day_columns": ["CC", "Biomass", "Rain"]},
+                ),
+                ("scan_directory (compact)", {"compact": True}),
+            ]
+            for name, options in cases:
+                report.add(
+                    f"{name} n={projects}",
+                    size,
+                    measure(scan(output_dir, **options), args.repeat),
+                )
+    report.save(args.json)
+
+
+if __name__ == "__main__":
+    main()
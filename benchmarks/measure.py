@@ -0,0 +1,114 @@
+"""
+Timing and memory measurement shared by the benchmark scripts
+
+Every case is timed several times (best wall-clock time, without tracing) and
+then run once more under tracemalloc for its peak Python memory allocation.
+Results can be written as JSON to compare two versions of the package:
+
+    python benchmarks/bench_parsers.py --json before.json
+    (upgrade)
+    python benchmarks/bench_parsers.py --json after.json --compare before.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import aquacrop
+
+
+def measure(function: Callable[[], object], repeat: int = 3) -> Dict[str, float]:
+    """
+    Measure a benchmark case
+
+    Args:
+        function: Case to run, without arguments
+        repeat: Number of timed calls
+
+    Returns:
+        Dictionary with the best and median time (s) and the peak memory (MB)
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "best_s": timings[0],
+        "median_s": timings[len(timings) // 2],
+        "peak_mb": peak / 1e6,
+    }
+
+
+def parser(description: str) -> argparse.ArgumentParser:
+    """Argument parser with the options common to every benchmark script"""
+    arguments = argparse.ArgumentParser(description=description)
+    arguments.add_argument("--repeat", type=int, default=3)
+    arguments.add_argument("--json", help="Write the results to this file")
+    arguments.add_argument(
+        "--compare", help="Show the change against results written by --json"
+    )
+    return arguments
+
+
+class Report:
+    """Table of benchmark results, printed as the cases complete"""
+
+    def __init__(self, benchmark: str, compare: Optional[str] = None):
+        self.benchmark = benchmark
+        self.results: List[Dict[str, object]] = []
+        self.baseline: Dict[str, Dict[str, float]] = {}
+        if compare:
+            with open(compare, "r") as f:
+                self.baseline = {
+                    result["case"]: result for result in json.load(f)["results"]
+                }
+
+        header = f"{'case':<40} {'size':>14} {'best (s)':>10} {'median (s)':>11} {'peak MB':>9}"
+        if self.baseline:
+            header += f" {'vs base':>8}"
+        print(header)
+
+    def add(self, case: str, size: str, figures: Dict[str, float]):
+        """Record and print the figures of one case"""
+        self.results.append({"case": case, "size": size, **figures})
+        line = (
+            f"{case:<40} {size:>14} {figures['best_s']:>10.4f} "
+            f"{figures['median_s']:>11.4f} {figures['peak_mb']:>9.1f}"
+        )
+        base = self.baseline.get(case)
+        if base:
+            line += f" {figures['best_s'] / base['best_s']:>7.2f}x"
+        print(line)
+
+    def save(self, path: Optional[str]):
+        """Write the results as JSON (nothing when path is not given)"""
+        if not path:
+            return
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "benchmark": self.benchmark,
+                    "aquacrop_version": aquacrop.__version__,
+                    "python": platform.python_version(),
+                    "machine": platform.platform(),
+                    "results": self.results,
+                },
+                f,
+                indent=2,
+            )
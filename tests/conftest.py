@@ -0,0 +1,59 @@
+"""
+Shared fixtures and test backends
+"""
+
+import os
+import shutil
+from datetime import date
+
+import pytest
+
+from aquacrop import Weather
+from aquacrop.executors import ExecutionResult, Executor
+from aquacrop.templates import ottawa_alfalfa, ottawa_management, ottawa_sandy_loam
+
+REFERENCE_OUTP = os.path.join(os.path.dirname(__file__), "referenceFiles", "OUTP")
+
+
+class ReferenceExecutor(Executor):
+    """Backend answering every project with the Ottawa reference outputs"""
+
+    needs_executable = False
+
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, working_dir, project=None, executable=None):
+        self.calls.append((working_dir, project, executable))
+        name = project[: -len(".PRM")]
+        for filename in os.listdir(REFERENCE_OUTP):
+            if filename.startswith("OttawaPRM"):
+                shutil.copy(
+                    os.path.join(REFERENCE_OUTP, filename),
+                    os.path.join(working_dir, "OUTP", filename.replace("Ottawa", name)),
+                )
+        return ExecutionResult(0)
+
+
+@pytest.fixture
+def config():
+    """Fixture providing a short simulation without executable"""
+    return {
+        "simulation_periods": [
+            {"start_date": date(2014, 5, 1), "end_date": date(2014, 5, 30)}
+        ],
+        "crop": ottawa_alfalfa,
+        "soil": ottawa_sandy_loam,
+        "management": ottawa_management,
+        "climate": Weather(
+            location="Replay",
+            temperatures=[(10.0, 20.0)] * 30,
+            eto_values=[3.0] * 30,
+            rainfall_values=[1.0] * 30,
+            first_day=1,
+            first_month=5,
+            first_year=2014,
+        ),
+        "executable_path": os.path.join(os.path.dirname(__file__), "missing-binary"),
+        "verbose": False,
+    }
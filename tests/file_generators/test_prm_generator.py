@@ -272,4 +272,64 @@ def test_project_file_path_handling(temp_dir, mock_date_converter):
     assert "/full/path/to/Rain.PLU" in content
     assert "MaunaLoa.CO2" in content
     assert "../Calendar/Date.CAL" in content
-    assert "..\\Crop\\Maize.CRO" in content
\ No newline at end of file
+    assert "..\\Crop\\Maize.CRO" in content
+
+def test_project_file_custom_paths(temp_dir, mock_date_converter):
+    test_file = os.path.join(temp_dir, "P1.PRM")
+
+    periods = [
+        {
+            'year': 1,
+            'first_day_sim': 36281,
+            'last_day_sim': 36515,
+            'first_day_crop': 36281,
+            'last_day_crop': 36515,
+            'cli_file': "Bru76-05.CLI",
+            'cro_file': "Maize.CRO",
+            'sol_file': "Loam.SOL",
+            'obs_file': "Maize.OBS",
+            'data_path': "./DATA/P1/",
+            'obs_path': "./OBS/P1/",
+        }
+    ]
+
+    generate_project_file(file_path=test_file, description="Paths", periods=periods)
+
+    with open(test_file, 'r') as f:
+        lines = [line.strip() for line in f.read().splitlines()]
+
+    assert lines[lines.index("Maize.CRO") + 1] == "'./DATA/P1/'"
+    assert lines[lines.index("Maize.OBS") + 1] == "'./OBS/P1/'"
+    # The CO2 file always stays in the shared SIMUL directory
+    assert lines[lines.index("MaunaLoa.CO2") + 1] == "'./SIMUL/'"
+    assert "'./DATA/'" not in lines
+
+
+def test_project_file_per_file_paths(temp_dir, mock_date_converter):
+    test_file = os.path.join(temp_dir, "Shared.PRM")
+
+    periods = [
+        {
+            'year': 1,
+            'first_day_sim': 36281,
+            'last_day_sim': 36515,
+            'first_day_crop': 36281,
+            'last_day_crop': 36515,
+            'cli_file': "Site.CLI",
+            'tnx_file': "Site.Tnx",
+            'cro_file': "Maize.CRO",
+            'data_path': "./DATA/P1/",
+            'cli_path': "/store/climate/",
+            'tnx_path': "/store/climate/",
+        }
+    ]
+
+    generate_project_file(file_path=test_file, description="Paths", periods=periods)
+
+    with open(test_file, 'r') as f:
+        lines = [line.strip() for line in f.read().splitlines()]
+
+    assert lines[lines.index("Site.CLI") + 1] == "'/store/climate/'"
+    assert lines[lines.index("Site.Tnx") + 1] == "'/store/climate/'"
+    # Files without their own path keep the DATA directory
+    assert lines[lines.index("Maize.CRO") + 1] == "'./DATA/P1/'"
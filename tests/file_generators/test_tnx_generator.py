@@ -201,4 +201,27 @@ def test_invalid_first_day_for_monthly(temp_dir):
             temperatures=[(10.0, 20.0), (12.0, 22.0)],
             record_type=3,  # Monthly
             first_day=2     # Invalid first day for monthly records
-        )
\ No newline at end of file
+        )
+
+def test_temperature_file_from_array(temp_dir):
+    import numpy as np
+
+    values = [(7.0, 15.0), (-0.05, 0.35), (-12.25, 40.45)]
+    list_file = generate_temperature_file(
+        file_path=os.path.join(temp_dir, "list.Tnx"),
+        location="Array",
+        temperatures=values,
+    )
+    array_file = generate_temperature_file(
+        file_path=os.path.join(temp_dir, "array.Tnx"),
+        location="Array",
+        temperatures=np.array(values),
+    )
+
+    with open(list_file, 'r') as f:
+        list_content = f.read()
+    with open(array_file, 'r') as f:
+        array_content = f.read()
+
+    assert list_content == array_content
+    assert list_content.splitlines()[-3:] == ["7.0\t15.0", "-0.1\t0.3", "-12.2\t40.5"]
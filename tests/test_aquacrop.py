@@ -0,0 +1,238 @@
+import importlib
+import os
+import platform
+
+import pytest
+
+from aquacrop import AquaCrop, Weather
+from aquacrop.aquacrop import find_aquacrop_executable, install_aquacrop_executable
+
+
+@pytest.fixture
+def executable(tmp_path):
+    """Fixture providing a small executable file standing in for AquaCrop"""
+    path = tmp_path / "bin" / "aquacrop"
+    path.parent.mkdir()
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_install_links_executable(executable, tmp_path):
+    """The executable is linked into the working directory, not copied"""
+    working_dir = tmp_path / "work"
+    working_dir.mkdir()
+
+    destination = install_aquacrop_executable(executable, str(working_dir))
+
+    assert destination == str(working_dir / "aquacrop")
+    assert os.path.samefile(destination, executable)
+    assert os.access(destination, os.X_OK)
+
+    # Placing it again keeps the existing link
+    assert install_aquacrop_executable(executable, str(working_dir)) == destination
+
+
+def test_install_replaces_stale_executable(executable, tmp_path):
+    """An unrelated file with the executable's name is replaced"""
+    working_dir = tmp_path / "work"
+    working_dir.mkdir()
+    (working_dir / "aquacrop").write_text("stale")
+
+    destination = install_aquacrop_executable(executable, str(working_dir))
+
+    assert os.path.samefile(destination, executable)
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="POSIX permissions")
+def test_install_copies_non_executable_source(executable, tmp_path):
+    """A source without execute permission is copied, leaving it untouched"""
+    os.chmod(executable, 0o644)
+    working_dir = tmp_path / "work"
+    working_dir.mkdir()
+
+    destination = install_aquacrop_executable(executable, str(working_dir))
+
+    assert not os.path.samefile(destination, executable)
+    assert os.access(destination, os.X_OK)
+    assert not os.access(executable, os.X_OK)
+
+
+def test_find_executable_is_cached(executable, tmp_path, monkeypatch):
+    """The resolved executable is reused without probing the platform again"""
+    # The package re-exports names that shadow the module attribute
+    aquacrop_module = importlib.import_module("aquacrop.aquacrop")
+    root = str(tmp_path / "root")
+    monkeypatch.setitem(aquacrop_module._executable_cache, root, executable)
+
+    def fail():
+        raise AssertionError("platform detection should be skipped")
+
+    monkeypatch.setattr(aquacrop_module.platform, "system", fail)
+
+    assert find_aquacrop_executable(root, verbose=False) == executable
+
+
+def test_shared_climate_store(config, tmp_path):
+    """Weather files are referenced from the store instead of being written"""
+    store = tmp_path / "store"
+    config["climate"].generate_files(str(store), co2_directory=str(store))
+    simulation = AquaCrop(
+        working_dir=str(tmp_path / "work"), climate_dir=str(store), **config
+    )
+
+    project_file = simulation._setup_working_dir()
+
+    data_files = os.listdir(tmp_path / "work" / "DATA")
+    assert not any(name.startswith("Replay.") for name in data_files)
+    assert os.path.exists(tmp_path / "work" / "SIMUL" / "MaunaLoa.CO2")
+
+    with open(project_file) as f:
+        lines = [line.strip() for line in f.read().splitlines()]
+    for name in ("Replay.CLI", "Replay.Tnx", "Replay.ETo", "Replay.PLU"):
+        assert lines[lines.index(name) + 1] == f"'{store}{os.sep}'"
+    assert lines[lines.index("MaunaLoa.CO2") + 1] == "'./SIMUL/'"
+
+
+def test_shared_climate_store_missing_files(config, tmp_path):
+    """A store without the weather files is reported with a hint"""
+    simulation = AquaCrop(
+        working_dir=str(tmp_path / "work"),
+        climate_dir=str(tmp_path / "empty"),
+        **config,
+    )
+
+    with pytest.raises(FileNotFoundError, match="Replay.Tnx"):
+        simulation._setup_working_dir()
+
+
+def test_trim_weather(config, tmp_path):
+    """Only the simulated window (plus margin) is written and validated"""
+    config["climate"] = Weather(
+        location="Long",
+        temperatures=[(10.0, 20.0)] * 3650,
+        eto_values=[3.0] * 3650,
+        rainfall_values=[1.0] * 3650,
+        first_day=1,
+        first_month=1,
+        first_year=2010,
+    )
+    simulation = AquaCrop(
+        working_dir=str(tmp_path / "work"),
+        trim_weather=True,
+        weather_margin_days=5,
+        **config,
+    )
+
+    assert len(simulation.climate.eto_values) == 30 + 2 * 5
+    assert simulation._validate_weather_data(strict=True)["all_sufficient"]
+
+    files = simulation._generate_input_files(
+        str(tmp_path / "work" / "DATA"), str(tmp_path / "work" / "OBS")
+    )
+    with open(files["climate"]["eto"]) as f:
+        lines = f.read().splitlines()
+    assert lines[2].split()[0] == "26"  # First day of record
+    assert lines[3].split()[0] == "4"  # First month of record
+    assert lines[4].split()[0] == "2014"  # First year of record
+    assert len(lines) == 8 + 40
+
+
+def test_daily_columns_select_output_types(config, tmp_path):
+    """Only the daily output types holding the requested columns are enabled"""
+    simulation = AquaCrop(
+        working_dir=str(tmp_path / "work"),
+        daily_columns=["CC", "Biomass", "Rain"],
+        **config,
+    )
+    simulation._setup_working_dir()
+
+    with open(tmp_path / "work" / "SIMUL" / "DailyResults.SIM") as f:
+        types = [int(line.split(":")[0]) for line in f if line.strip()]
+    assert types == [2, 7]
+
+    with pytest.raises(ValueError, match="Unknown daily output column"):
+        AquaCrop(daily_columns=["Yield"], **config)
+
+
+def test_setup_removes_stale_inputs(config, tmp_path):
+    """Inputs of the previous setup not written again are removed, others kept"""
+    work = tmp_path / "work"
+    AquaCrop(working_dir=str(work), **config)._setup_working_dir()
+    (work / "DATA" / "notes.txt").write_text("kept")
+
+    config["climate"].location = "Other"
+    AquaCrop(working_dir=str(work), **config)._setup_working_dir()
+
+    data_files = os.listdir(work / "DATA")
+    assert "Other.CLI" in data_files and "notes.txt" in data_files
+    assert not any(name.startswith("Replay.") for name in data_files)
+
+
+@pytest.fixture
+def simulation_with_results(config, tmp_path):
+    """Fixture providing a simulation holding results of two runs"""
+    import pandas as pd
+
+    simulation = AquaCrop(working_dir=str(tmp_path / "work"), **config)
+    day = {
+        run: pd.DataFrame({"Day": [1, 2], "Biomass": [0.1 * run, 0.2 * run]})
+        for run in (1, 2)
+    }
+    simulation.results = {
+        "day": day,
+        "season": pd.DataFrame({"RunNr": [1, 2], "Y(dry)": [1.5, 2.5]}),
+        "harvests": None,
+        "evaluation": {"biomass": None, "statistics": {"RMSE": 0.5}},
+    }
+    return simulation
+
+
+def test_save_results_csv(simulation_with_results, tmp_path):
+    """Runs are saved one file each and combined with a Run column"""
+    import pandas as pd
+
+    output_dir = simulation_with_results.save_results(str(tmp_path / "csv"))
+
+    combined = pd.read_csv(os.path.join(output_dir, "daily_results_all_runs.csv"))
+    assert list(combined["Run"]) == [1, 1, 2, 2]
+    assert os.path.exists(os.path.join(output_dir, "daily_results_run_2.csv"))
+    assert os.path.exists(os.path.join(output_dir, "seasonal_results.csv"))
+    assert os.path.exists(os.path.join(output_dir, "evaluation_statistics.json"))
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "feather"])
+def test_save_results_columnar(simulation_with_results, tmp_path, file_format):
+    """Columnar results are partitioned by run and read back as one table"""
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    output_dir = simulation_with_results.save_results(
+        str(tmp_path / file_format), file_format=file_format
+    )
+
+    partition = os.path.join(output_dir, "daily_results", "Run=2")
+    assert os.listdir(partition) == [f"part-0.{file_format}"]
+    season = getattr(pd, f"read_{file_format}")(
+        os.path.join(output_dir, f"seasonal_results.{file_format}")
+    )
+    assert list(season["Y(dry)"]) == [1.5, 2.5]
+    if file_format == "parquet":
+        daily = pd.read_parquet(os.path.join(output_dir, "daily_results"))
+        assert sorted(daily["Run"].astype(int)) == [1, 1, 2, 2]
+
+
+def test_save_results_without_pyarrow(simulation_with_results, tmp_path, monkeypatch):
+    """Without pyarrow the results are saved as CSV with a warning"""
+    import sys
+
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    with pytest.warns(UserWarning, match="pyarrow"):
+        output_dir = simulation_with_results.save_results(
+            str(tmp_path / "fallback"), file_format="parquet"
+        )
+
+    assert os.path.exists(os.path.join(output_dir, "seasonal_results.csv"))
+    with pytest.raises(ValueError, match="format"):
+        simulation_with_results.save_results(str(tmp_path), file_format="xlsx")
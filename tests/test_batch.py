@@ -0,0 +1,298 @@
+import os
+import sys
+import textwrap
+from datetime import date
+
+import pytest
+
+from aquacrop import Weather
+from aquacrop.batch import (
+    ScenarioResult,
+    _project_names,
+    run_many,
+    run_multi_project,
+    run_scenario,
+)
+from tests.conftest import ReferenceExecutor
+
+
+@pytest.fixture
+def base_config(config):
+    """Fixture providing the shared configuration over a whole season"""
+    del config["executable_path"]
+    config["climate"] = Weather(
+        location="Batch",
+        temperatures=[(10.0, 20.0)] * 200,
+        eto_values=[3.0] * 200,
+        rainfall_values=[1.0] * 200,
+        first_day=1,
+        first_month=5,
+        first_year=2014,
+    )
+    config["simulation_periods"] = [
+        {
+            "start_date": date(2014, 5, 1),
+            "end_date": date(2014, 9, 30),
+            "planting_date": date(2014, 5, 1),
+        }
+    ]
+    return config
+
+
+def test_run_scenario_records_failure(base_config):
+    """A failing scenario is reported on its result instead of raising"""
+    config = dict(base_config, climate=None)
+
+    result = run_scenario("missing-climate", config, executable_path="unused")
+
+    assert isinstance(result, ScenarioResult)
+    assert result.key == "missing-climate"
+    assert not result.ok
+    assert result.results is None
+    assert "Climate data is not provided" in result.error
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_many_keeps_going_after_failures(base_config, tmp_path, workers):
+    """Every scenario of the batch is reported, failed ones included"""
+    configs = {
+        "no-climate": dict(base_config, climate=None),
+        "no-crop": dict(base_config, crop=None),
+        "bad-executable": dict(base_config, working_dir=str(tmp_path / "bad")),
+    }
+
+    results = list(
+        run_many(
+            configs,
+            workers=workers,
+            executable_path=str(tmp_path / "does-not-exist"),
+        )
+    )
+
+    assert sorted(r.key for r in results) == sorted(configs)
+    assert all(not r.ok for r in results)
+
+    by_key = {r.key: r for r in results}
+    assert "Crop data is not provided" in by_key["no-crop"].error
+    # Input files were still generated for the scenario that reached the executable
+    assert os.path.exists(tmp_path / "bad" / "LIST" / "PROJECT.PRM")
+
+
+def _unpicklable_extract(results):
+    """Extraction whose value cannot be sent back by a worker"""
+    return lambda: results
+
+
+def _crashing_extract(results):
+    """Extraction killing its worker process"""
+    os._exit(1)
+
+
+@pytest.mark.parametrize("extract", [_unpicklable_extract, _crashing_extract])
+def test_run_many_reports_lost_results(base_config, extract):
+    """Results lost between worker and parent are reported, not raised"""
+    configs = {key: base_config for key in ("a", "b", "c")}
+
+    results = list(
+        run_many(configs, workers=2, backend=ReferenceExecutor(), extract=extract)
+    )
+
+    assert sorted(r.key for r in results) == ["a", "b", "c"]
+    assert all(not r.ok for r in results)
+
+
+def test_run_many_sequence_keys(base_config):
+    """Scenarios given as a sequence are keyed by their position"""
+    configs = [dict(base_config, climate=None) for _ in range(3)]
+
+    results = run_many(configs, workers=1, executable_path="unused")
+
+    assert sorted(r.key for r in results) == [0, 1, 2]
+
+
+REFERENCE_OUTP = os.path.join(os.path.dirname(__file__), "referenceFiles", "OUTP")
+
+
+@pytest.fixture
+def fake_executable(tmp_path):
+    """
+    Stand-in for the AquaCrop executable that answers every project in LIST/
+    with a renamed copy of the Ottawa reference outputs
+    """
+    if sys.platform.startswith("win"):
+        pytest.skip("The fake executable is a POSIX script")
+
+    script = tmp_path / "aquacrop"
+    script.write_text(textwrap.dedent(f"""\
+            #!{sys.executable}
+            import os, shutil
+            for project in sorted(os.listdir("LIST")):
+                name = project[: -len(".PRM")]
+                for filename in os.listdir({REFERENCE_OUTP!r}):
+                    if filename.startswith("OttawaPRM"):
+                        shutil.copy(
+                            os.path.join({REFERENCE_OUTP!r}, filename),
+                            os.path.join("OUTP", filename.replace("Ottawa", name)),
+                        )
+            """))
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_run_multi_project(base_config, fake_executable, tmp_path):
+    """All scenarios run as projects of one working directory"""
+    configs = {
+        "dry": base_config,
+        "wet year": dict(base_config, need_daily_output=False),
+        "broken": dict(base_config, soil=None),
+    }
+    working_dir = tmp_path / "shared"
+
+    results = run_multi_project(
+        configs, working_dir=str(working_dir), executable_path=fake_executable
+    )
+
+    assert [r.key for r in results] == ["dry", "wet year", "broken"]
+    dry, wet, broken = results
+    assert dry.ok and wet.ok
+    assert "Soil data is not provided" in broken.error
+
+    assert not dry.results["day"].empty
+    assert wet.results["day"] is None
+    assert not wet.results["season"].empty
+
+    assert sorted(os.listdir(working_dir / "LIST")) == ["dry.PRM", "wet_year.PRM"]
+    assert os.path.exists(working_dir / "DATA" / "dry" / "Batch.CLI")
+    assert os.path.exists(working_dir / "SIMUL" / "MaunaLoa.CO2")
+    with open(working_dir / "LIST" / "wet_year.PRM") as f:
+        assert "'./DATA/wet_year/'" in f.read()
+
+
+def test_project_names_are_unique():
+    """Colliding keys get a suffix that is not the name of another key"""
+    assert _project_names(["a_2", "a", "a"]) == ["a_2", "a", "a_3"]
+    assert _project_names(["x y", "x-y", "X_Y", ""]) == ["x_y", "x-y", "X_Y_2", "P3"]
+
+
+def test_run_multi_project_requires_shared_co2(base_config):
+    """Scenarios with different CO2 records cannot share SIMUL/"""
+    other_climate = Weather(
+        location="Other",
+        temperatures=[(10.0, 20.0)] * 200,
+        eto_values=[3.0] * 200,
+        rainfall_values=[1.0] * 200,
+        first_day=1,
+        first_month=5,
+        first_year=2014,
+        co2_records=[(2014, 400.0)],
+    )
+    configs = [base_config, dict(base_config, climate=other_climate)]
+
+    with pytest.raises(ValueError, match="CO2"):
+        run_multi_project(configs, executable_path="unused")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_many_reuses_working_dirs(base_config, fake_executable, workers):
+    """Scenarios run in pooled working directories give independent results"""
+    configs = {
+        "with-day": base_config,
+        "without-day": dict(base_config, need_daily_output=False),
+        "again": base_config,
+    }
+
+    results = {
+        r.key: r
+        for r in run_many(
+            configs,
+            workers=workers,
+            executable_path=fake_executable,
+            reuse_working_dirs=True,
+        )
+    }
+
+    assert all(r.ok for r in results.values()), [r.error for r in results.values()]
+    assert not results["with-day"].results["day"].empty
+    assert results["without-day"].results["day"] is None
+    assert not results["again"].results["season"].empty
+
+
+def test_run_multi_project_daily_columns(base_config, fake_executable, tmp_path):
+    """Projects share the union of the daily output types and keep their columns"""
+    configs = {
+        "crop": dict(base_config, daily_columns=["CC", "Biomass"]),
+        "weather": dict(base_config, daily_columns=["ETo", "Tmax"]),
+    }
+    working_dir = tmp_path / "shared"
+
+    crop, weather = run_multi_project(
+        configs, working_dir=str(working_dir), executable_path=fake_executable
+    )
+
+    with open(working_dir / "SIMUL" / "DailyResults.SIM") as f:
+        assert [int(line.split(":")[0]) for line in f if line.strip()] == [2, 7]
+    assert list(crop.results["day"].columns)[5:] == ["CC", "Biomass"]
+    assert list(weather.results["day"].columns)[5:] == ["ETo", "Tmax"]
+
+
+def test_run_async(base_config, fake_executable):
+    """run_async runs the executable as an asyncio subprocess"""
+    import asyncio
+
+    from aquacrop import AquaCrop
+
+    simulation = AquaCrop(executable_path=fake_executable, **base_config)
+
+    results = asyncio.run(simulation.run_async())
+
+    assert set(results.parsed) == {"day", "season", "harvests", "evaluation"}
+    assert not results["season"].empty
+
+
+def test_run_scenario_async_loads_lazy_results(base_config, fake_executable):
+    """Lazy results are parsed before the working directory is removed"""
+    import asyncio
+
+    from aquacrop.batch import run_scenario_async
+
+    result = asyncio.run(
+        run_scenario_async(
+            "lazy",
+            base_config,
+            run_options={"load_results": False},
+            executable_path=fake_executable,
+        )
+    )
+
+    assert result.ok
+    assert not os.path.exists(result.results.output_dir)
+    assert not result.results["season"].empty
+
+
+def test_run_many_async(base_config, fake_executable):
+    """Scenarios run concurrently up to the limit and stream their results"""
+    import asyncio
+
+    from aquacrop.batch import run_many_async
+
+    configs = {f"s{i}": base_config for i in range(4)}
+    configs["broken"] = dict(base_config, crop=None)
+
+    async def collect():
+        semaphore = asyncio.Semaphore(2)
+        results = [
+            result
+            async for result in run_many_async(
+                configs, executable_path=fake_executable, semaphore=semaphore
+            )
+        ]
+        # Every slot is given back
+        assert not semaphore.locked()
+        return results
+
+    results = {result.key: result for result in asyncio.run(collect())}
+
+    assert sorted(results) == sorted(configs)
+    assert all(results[f"s{i}"].ok for i in range(4))
+    assert not results["s0"].results["day"].empty
+    assert "Crop data is not provided" in results["broken"].error
@@ -0,0 +1,202 @@
+import copy
+import filecmp
+import os
+import stat
+import sys
+import textwrap
+
+import pandas as pd
+import pytest
+
+from aquacrop import AquaCrop, Crop
+from aquacrop.cache import (
+    InputFileCache,
+    ResultCache,
+    executable_fingerprint,
+    fingerprint,
+)
+from aquacrop.templates import ottawa_alfalfa, ottawa_sandy_loam
+
+REFERENCE_OUTP = os.path.join(os.path.dirname(__file__), "referenceFiles", "OUTP")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture providing an empty input file cache"""
+    return InputFileCache(str(tmp_path / "cache"))
+
+
+def test_fingerprint_is_content_based():
+    """Equal entities share a fingerprint, any change gives a new one"""
+    twin = copy.deepcopy(ottawa_alfalfa)
+    assert fingerprint(twin) == fingerprint(ottawa_alfalfa)
+
+    twin.params = dict(twin.params, description_extra=1)
+    assert fingerprint(twin) != fingerprint(ottawa_alfalfa)
+
+    # Nested entities (soil layers) are part of the fingerprint
+    soil = copy.deepcopy(ottawa_sandy_loam)
+    soil.soil_layers[0].thickness += 0.1
+    assert fingerprint(soil) != fingerprint(ottawa_sandy_loam)
+
+
+def test_cached_file_matches_direct_rendering(cache, tmp_path):
+    """A cached file has the same name and content as a rendered one"""
+    direct = ottawa_alfalfa.generate_file(str(tmp_path / "direct"))
+    cached = cache.generate_file(ottawa_alfalfa, str(tmp_path / "cached"))
+
+    assert os.path.basename(cached) == os.path.basename(direct)
+    assert filecmp.cmp(direct, cached, shallow=False)
+
+
+def test_cached_file_is_not_rendered_again(cache, tmp_path, monkeypatch):
+    """Once cached, an entity is linked without being rendered"""
+    first = cache.generate_file(ottawa_alfalfa, str(tmp_path / "first"))
+
+    def fail(self, directory):
+        raise AssertionError("entity should not be rendered again")
+
+    monkeypatch.setattr(Crop, "generate_file", fail)
+
+    second = cache.generate_file(
+        copy.deepcopy(ottawa_alfalfa), str(tmp_path / "second")
+    )
+
+    assert os.path.samefile(first, second)
+
+
+def test_cached_weather_files(cache, config, tmp_path):
+    """Weather files keep their layout, with the CO2 file in SIMUL"""
+    data_dir = tmp_path / "work" / "DATA"
+
+    files = cache.generate_files(config["climate"], str(data_dir))
+
+    assert files["climate"] == str(data_dir / "Replay.CLI")
+    assert files["co2"] == str(tmp_path / "work" / "SIMUL" / "MaunaLoa.CO2")
+    assert all(os.path.exists(path) for path in files.values())
+    # Not read-only, so that Windows can remove the links
+    assert all(os.stat(path).st_mode & stat.S_IWUSR for path in files.values())
+
+
+def test_simulation_with_input_cache(cache, config, tmp_path):
+    """A working directory set up through the cache matches a regular one"""
+    regular = AquaCrop(working_dir=str(tmp_path / "regular"), **config)
+    cached = AquaCrop(working_dir=str(tmp_path / "cached"), input_cache=cache, **config)
+
+    regular._setup_working_dir()
+    cached._setup_working_dir()
+
+    for subdirectory in ("DATA", "SIMUL", "LIST"):
+        comparison = filecmp.dircmp(
+            os.path.join(regular.working_dir, subdirectory),
+            os.path.join(cached.working_dir, subdirectory),
+        )
+        assert comparison.left_only == comparison.right_only == []
+        _, mismatch, errors = filecmp.cmpfiles(
+            comparison.left, comparison.right, comparison.common_files, shallow=False
+        )
+        assert mismatch == errors == []
+
+
+@pytest.fixture
+def counting_executable(tmp_path):
+    """
+    Stand-in for the AquaCrop executable answering with the Ottawa reference
+    outputs and counting its runs in a 'calls' file next to it
+    """
+    if sys.platform.startswith("win"):
+        pytest.skip("The fake executable is a POSIX script")
+
+    script = tmp_path / "bin" / "aquacrop"
+    script.parent.mkdir()
+    calls = tmp_path / "bin" / "calls"
+    script.write_text(textwrap.dedent(f"""\
+            #!{sys.executable}
+            import os, shutil
+            with open({str(calls)!r}, "a") as f:
+                f.write("run\\n")
+            for filename in os.listdir({REFERENCE_OUTP!r}):
+                if filename.startswith("OttawaPRM"):
+                    shutil.copy(
+                        os.path.join({REFERENCE_OUTP!r}, filename),
+                        os.path.join("OUTP", filename.replace("Ottawa", "PROJECT")),
+                    )
+            """))
+    script.chmod(0o755)
+    return str(script)
+
+
+def _run_count(executable):
+    calls = os.path.join(os.path.dirname(executable), "calls")
+    if not os.path.exists(calls):
+        return 0
+    with open(calls) as f:
+        return len(f.readlines())
+
+
+def test_result_cache_skips_repeated_runs(config, counting_executable, tmp_path):
+    """Identical inputs are answered from the cache, changed inputs are run"""
+    config["executable_path"] = counting_executable
+    config["result_cache"] = ResultCache(str(tmp_path / "results"))
+
+    first = AquaCrop(working_dir=str(tmp_path / "first"), **config).run()
+    assert _run_count(counting_executable) == 1
+
+    # Another working directory with the same inputs
+    second = AquaCrop(working_dir=str(tmp_path / "second"), **config).run()
+    assert _run_count(counting_executable) == 1
+    assert second.output_dir is None
+    pd.testing.assert_frame_equal(second["day"], first["day"])
+    pd.testing.assert_frame_equal(second["season"], first["season"])
+
+    wetter = copy.deepcopy(config["climate"])
+    wetter.rainfall_values = [2.0] * 30
+    AquaCrop(working_dir=str(tmp_path / "third"), **dict(config, climate=wetter)).run()
+    assert _run_count(counting_executable) == 2
+
+
+def test_result_cache_eviction(tmp_path):
+    """Least recently used entries are evicted beyond the size limit"""
+    results_cache = ResultCache(str(tmp_path / "results"))
+    value = {"season": os.urandom(2000)}
+    for key, used in (("a", 3), ("b", 1), ("c", 2)):
+        results_cache.put(key, value)
+        os.utime(results_cache._path(key), ns=(used, used))
+    entry_size = max(
+        os.path.getsize(results_cache._path(key)) for key in ("a", "b", "c")
+    )
+
+    # Room for two entries: "b" and "c" are the least recently used
+    results_cache.max_bytes = 2 * entry_size + 16
+    results_cache.put("d", value)
+
+    assert results_cache.get("b") is None
+    assert results_cache.get("c") is None
+    assert results_cache.get("a") == value
+    assert results_cache.get("d") == value
+
+
+def test_executable_fingerprint_follows_content(tmp_path):
+    """A new executable version gives a new fingerprint"""
+    executable = tmp_path / "aquacrop"
+    executable.write_bytes(b"version 1")
+    first = executable_fingerprint(str(executable))
+
+    executable.write_bytes(b"version 2")
+    os.utime(executable, ns=(1, 1))
+
+    assert executable_fingerprint(str(executable)) != first
+
+
+def test_executable_fingerprint_shared_by_links(tmp_path, monkeypatch):
+    """Links to the same executable are hashed once"""
+    executable = tmp_path / "aquacrop"
+    executable.write_bytes(b"version 1")
+    first = executable_fingerprint(str(executable))
+    os.link(executable, tmp_path / "linked")
+
+    def fail(digest, path):
+        raise AssertionError(f"{path} hashed again")
+
+    monkeypatch.setattr("aquacrop.cache._update_file_digest", fail)
+    assert executable_fingerprint(str(tmp_path / "linked")) == first
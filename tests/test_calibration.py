@@ -0,0 +1,160 @@
+import glob
+import os
+import re
+from datetime import date
+
+import numpy as np
+import pytest
+
+from aquacrop.experiments.calibration import (
+    calibrate,
+    evaluation_pairs,
+    evaluation_statistics,
+)
+from aquacrop.experiments.optimizers import DifferentialEvolution
+from aquacrop.experiments.parameters import ParameterRange
+from aquacrop.output import OutputReader
+from tests.conftest import REFERENCE_OUTP, ReferenceExecutor
+
+# Water productivity for which the simulated biomass matches the observations
+TRUE_WATER_PRODUCTIVITY = 17.0
+# Written with one decimal to the crop file
+WATER_PRODUCTIVITY = [ParameterRange("crop.water_productivity", 10, 25, step=0.1)]
+
+
+class WaterProductivityExecutor(ReferenceExecutor):
+    """
+    Reference backend simulating biomass proportional to water productivity
+
+    Only the evaluation files of the simulated periods are kept, with the
+    simulated biomass set to observed * WP / TRUE_WATER_PRODUCTIVITY.
+    """
+
+    def execute(self, working_dir, project=None, executable=None):
+        result = super().execute(working_dir, project, executable)
+        with open(os.path.join(working_dir, "LIST", project)) as f:
+            periods = f.read().count("-- 3. Crop (CRO) file")
+        (crop_file,) = glob.glob(os.path.join(working_dir, "DATA", "*.CRO"))
+        with open(crop_file) as f:
+            water_productivity = float(
+                re.search(r"(\S+)\s+: Water Productivity", f.read()).group(1)
+            )
+        scale = water_productivity / TRUE_WATER_PRODUCTIVITY
+
+        def simulate(match):
+            simulated = float(match.group(2)) * scale
+            return f"{match.group(1)}{simulated:14.3f}{match.group(3)}"
+
+        for path in glob.glob(os.path.join(working_dir, "OUTP", "*evaluation.OUT")):
+            run = int(re.search(r"(\d+)evaluation", path).group(1))
+            if run > periods:
+                os.remove(path)
+                continue
+            with open(path) as f:
+                content = f.read()
+            content = re.sub(
+                r"(\n\s+\d+\s+(\d+\.\d+)\s+-?\d+\.\d+)\s+\d+\.\d+(\s+\d+ \w+ \d+)",
+                simulate,
+                content,
+            )
+            with open(path, "w") as f:
+                f.write(content)
+        return result
+
+
+@pytest.fixture
+def seasons(config):
+    """Config of three seasons without executable"""
+    del config["executable_path"]
+    config["simulation_periods"] = [
+        {"start_date": date(year, 5, 1), "end_date": date(year, 5, 30)}
+        for year in (2014, 2015, 2016)
+    ]
+    return config
+
+
+def test_evaluation_statistics_match_evaluation_file():
+    """The statistics are those of the AquaCrop evaluation file"""
+    reader = OutputReader(REFERENCE_OUTP).scan_directory(prefix="OttawaPRM")
+    pairs = reader.output_files["OttawaPRM1evaluation.OUT"].get_data()["biomass"][1]
+
+    statistics = evaluation_statistics(pairs["Observed"], pairs["Simulated"])
+
+    assert statistics["n"] == 15
+    assert round(statistics["rmse"], 3) == 0.974
+    assert round(statistics["cv_rmse"], 1) == 24.8
+    assert round(statistics["ef"], 2) == 0.84
+    assert round(statistics["d"], 2) == 0.96
+    assert round(statistics["pearson_r"], 2) == 0.99
+
+
+def test_differential_evolution():
+    """The optimizer finds the minimum of a smooth function"""
+    optimizer = DifferentialEvolution(2, seed=0)
+    target = np.array([0.3, 0.8])
+    for _ in range(100):
+        trials = optimizer.ask()
+        assert trials.min() >= 0 and trials.max() <= 1
+        optimizer.tell(trials, np.sum((trials - target) ** 2, axis=1))
+        if optimizer.converged(1e-3, 1e-10):
+            break
+
+    np.testing.assert_allclose(optimizer.best, target, atol=1e-3)
+
+
+def test_calibrate(seasons):
+    """Water productivity is calibrated, repeated candidates are not run again"""
+    options = {
+        "statistic": "rmse",
+        "generations": 15,
+        "population_size": 8,
+        "seed": 1,
+        "workers": 1,
+        "run_options": {"validate_data": False},
+    }
+    backend = WaterProductivityExecutor()
+    result = calibrate(seasons, WATER_PRODUCTIVITY, backend=backend, **options)
+
+    assert result.best["crop.water_productivity"] == TRUE_WATER_PRODUCTIVITY
+    assert result.statistics["n"] == 44
+    assert result.loss == pytest.approx(result.statistics["rmse"])
+    assert result.history == sorted(result.history, reverse=True)
+    # Values are rounded to the step, so candidates repeat
+    assert result.cache_hits > 0
+    assert result.evaluations == len(backend.calls)
+    assert result.config["crop"].params["water_productivity"] == (
+        result.best["crop.water_productivity"]
+    )
+
+    # Screening on the first season stops candidates without changing the search
+    screened = calibrate(
+        seasons,
+        WATER_PRODUCTIVITY,
+        backend=WaterProductivityExecutor(),
+        screen_periods=1,
+        **options,
+    )
+    assert screened.rejected > 0
+    assert screened.best == result.best
+    assert screened.history == result.history
+
+
+def test_calibrate_options(seasons):
+    """Invalid statistics and screening settings are refused"""
+    with pytest.raises(ValueError, match="Unknown statistic"):
+        calibrate(seasons, {"crop.kc_max": (1.0, 1.2)}, statistic="mae")
+    with pytest.raises(ValueError, match="Screening runs"):
+        calibrate(seasons, {"crop.kc_max": (1.0, 1.2)}, statistic="d", screen_periods=1)
+    with pytest.raises(ValueError, match="fewer than"):
+        calibrate(seasons, {"crop.kc_max": (1.0, 1.2)}, screen_periods=3)
+
+
+def test_evaluation_pairs_of_results():
+    """Pairs of every season are extracted from the results"""
+    from aquacrop.output import SimulationResults
+
+    results = SimulationResults(
+        REFERENCE_OUTP, prefix="OttawaPRM", sections=["evaluation"]
+    )
+
+    assert evaluation_pairs(results).shape == (44, 2)
@@ -0,0 +1,50 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from aquacrop import Weather
+
+
+@pytest.fixture
+def weather():
+    """Fixture providing two years of daily weather starting on 2014-01-01"""
+    days = 730
+    return Weather(
+        location="Window",
+        temperatures=np.column_stack([np.arange(days), np.arange(days) + 10.0]),
+        eto_values=np.arange(days, dtype=float),
+        rainfall_values=np.arange(days, dtype=float),
+        first_day=1,
+        first_month=1,
+        first_year=2014,
+    )
+
+
+def test_window_slices_records(weather):
+    """The window keeps the records of the requested dates and margin"""
+    window = weather.window(date(2014, 5, 1), date(2014, 9, 30), margin_days=10)
+
+    first_index = (date(2014, 4, 21) - date(2014, 1, 1)).days
+    assert (window.first_day, window.first_month, window.first_year) == (21, 4, 2014)
+    assert len(window.eto_values) == (date(2014, 10, 10) - date(2014, 4, 21)).days + 1
+    assert window.eto_values[0] == first_index
+    assert window.temperatures[0].tolist() == [first_index, first_index + 10.0]
+    # Slices share the original arrays
+    assert np.shares_memory(window.rainfall_values, weather.rainfall_values)
+
+
+def test_window_is_clipped_to_records(weather):
+    """Dates outside the records are dropped instead of invented"""
+    window = weather.window(date(2013, 12, 1), date(2016, 1, 1))
+
+    assert (window.first_day, window.first_month, window.first_year) == (1, 1, 2014)
+    assert len(window.temperatures) == len(weather.temperatures)
+
+    assert len(weather.window(date(2017, 1, 1), date(2017, 2, 1)).eto_values) == 0
+
+
+def test_window_requires_dated_daily_records(weather):
+    weather.record_type = 3
+    with pytest.raises(ValueError):
+        weather.window(date(2014, 5, 1), date(2014, 9, 30))
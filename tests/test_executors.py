@@ -0,0 +1,133 @@
+import asyncio
+import copy
+import os
+
+import pandas as pd
+import pytest
+
+from aquacrop import AquaCrop, Irrigation
+from aquacrop.batch import run_many
+from aquacrop.executors import ReplayExecutor
+from tests.conftest import ReferenceExecutor
+
+
+def test_custom_executor(config, tmp_path):
+    """A backend gets the prepared working directory and fills OUTP"""
+    backend = ReferenceExecutor()
+    simulation = AquaCrop(working_dir=str(tmp_path / "run"), executor=backend, **config)
+
+    results = simulation.run()
+
+    assert backend.calls == [(simulation.working_dir, "PROJECT.PRM", None)]
+    assert not results["season"].empty
+    assert os.path.exists(os.path.join(simulation.working_dir, "LIST", "PROJECT.PRM"))
+
+
+def test_replay_executor_records_and_replays(config, tmp_path):
+    """Recorded outputs are served for identical inputs without running"""
+    recordings = str(tmp_path / "recordings")
+    backend = ReferenceExecutor()
+    recorder = ReplayExecutor(recordings, record_with=backend)
+
+    recorded = AquaCrop(
+        working_dir=str(tmp_path / "first"), executor=recorder, **config
+    ).run()
+    assert len(backend.calls) == 1
+    assert len(os.listdir(recordings)) == 1
+
+    replay = ReplayExecutor(recordings)
+    replayed = AquaCrop(
+        working_dir=str(tmp_path / "second"), executor=replay, **config
+    ).run()
+
+    assert len(backend.calls) == 1
+    pd.testing.assert_frame_equal(replayed["day"], recorded["day"])
+    pd.testing.assert_frame_equal(replayed["season"], recorded["season"])
+
+
+def test_replay_key_covers_climate_store(config, tmp_path):
+    """Runs reading different weather from a shared store are not replayed"""
+    recorder = ReplayExecutor(str(tmp_path / "recordings"))
+    store = str(tmp_path / "store")
+    keys = []
+    for rainfall in (1.0, 2.0):
+        climate = copy.deepcopy(config["climate"])
+        climate.rainfall_values = [rainfall] * 30
+        climate.generate_files(store, co2_directory=store)
+        simulation = AquaCrop(
+            working_dir=str(tmp_path / "work"),
+            climate_dir=store,
+            **dict(config, climate=climate),
+        )
+        simulation._setup_working_dir()
+        keys.append(recorder.key(simulation.working_dir, "PROJECT.PRM"))
+
+    assert keys[0] != keys[1]
+
+
+def test_replay_through_reused_working_dir(config, tmp_path):
+    """Inputs of the previous run of a pooled directory do not change the key"""
+    del config["executable_path"]
+    irrigated = dict(
+        config,
+        irrigation=Irrigation(
+            name="One event",
+            description="One sprinkler event",
+            params={
+                "irrigation_method": 1,
+                "surface_wetted": 100,
+                "irrigation_mode": 1,
+                "reference_day": -9,
+                "irrigation_events": [{"day": 10, "depth": 20, "ec": 0.0}],
+            },
+        ),
+    )
+    scenarios = {"irrigated": irrigated, "rainfed": config}
+    recordings = str(tmp_path / "recordings")
+    recorder = ReplayExecutor(recordings, record_with=ReferenceExecutor())
+    for name, scenario in scenarios.items():
+        AquaCrop(working_dir=str(tmp_path / name), executor=recorder, **scenario).run()
+
+    batch = list(
+        run_many(
+            scenarios,
+            workers=1,
+            reuse_working_dirs=True,
+            backend=ReplayExecutor(recordings),
+        )
+    )
+
+    assert [result.error for result in batch] == [None, None]
+
+
+def test_replay_executor_without_recording(config, tmp_path):
+    """Inputs without a recording are an error"""
+    replay = ReplayExecutor(str(tmp_path / "recordings"))
+    simulation = AquaCrop(working_dir=str(tmp_path / "run"), executor=replay, **config)
+
+    with pytest.raises(RuntimeError, match="No recorded outputs"):
+        simulation.run()
+
+    config["climate"].rainfall_values = [2.0] * 30
+    recorder = ReplayExecutor(replay.root, record_with=ReferenceExecutor())
+    other = AquaCrop(working_dir=str(tmp_path / "other"), executor=recorder, **config)
+    other.run()
+    assert not replay.has_recording(simulation.working_dir, "PROJECT.PRM")
+    assert replay.has_recording(other.working_dir, "PROJECT.PRM")
+
+
+def test_executor_async_and_batch(config, tmp_path):
+    """run_async and run_many go through the backend as well"""
+    backend = ReferenceExecutor()
+    simulation = AquaCrop(working_dir=str(tmp_path / "run"), executor=backend, **config)
+
+    results = asyncio.run(simulation.run_async())
+
+    assert len(backend.calls) == 1
+    assert not results["season"].empty
+
+    del config["executable_path"]
+    batch = list(
+        run_many({"a": config, "b": config}, workers=1, backend=ReferenceExecutor())
+    )
+    assert [result.ok for result in batch] == [True, True]
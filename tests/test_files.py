@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from aquacrop.templates import ottawa_alfalfa, ottawa_sandy_loam
+from aquacrop.utils import files
+from aquacrop.utils.files import default_working_root, render_in_memory
+
+
+def test_render_in_memory_writes_on_exit(tmp_path):
+    """Files are kept in memory in the block and all written when it exits"""
+    data_dir = tmp_path / "DATA"
+
+    with render_in_memory() as rendered:
+        crop_file = ottawa_alfalfa.generate_file(str(data_dir))
+        soil_file = ottawa_sandy_loam.generate_file(str(data_dir))
+        assert not os.path.exists(crop_file)
+
+    assert sorted(rendered) == sorted([crop_file, soil_file])
+    for path, content in rendered.items():
+        with open(path, "rb") as f:
+            assert f.read() == content
+
+    direct = ottawa_alfalfa.generate_file(str(tmp_path / "direct"))
+    with open(direct, "rb") as f:
+        assert f.read() == rendered[crop_file]
+
+
+def test_render_in_memory_writes_nothing_on_error(tmp_path):
+    """A failing block leaves no partial set of files behind"""
+    with pytest.raises(RuntimeError):
+        with render_in_memory():
+            ottawa_alfalfa.generate_file(str(tmp_path / "DATA"))
+            raise RuntimeError("setup failed")
+
+    assert not (tmp_path / "DATA").exists()
+
+
+def test_rewrite_does_not_modify_hardlinks(tmp_path):
+    """A linked file is replaced, never modified in place"""
+    shared = tmp_path / "shared.CRO"
+    shared.write_text("cached")
+    target = tmp_path / "DATA" / "shared.CRO"
+    target.parent.mkdir()
+    os.link(shared, target)
+
+    files.write_text_file(str(target), "new")
+
+    assert target.read_text() == "new"
+    assert shared.read_text() == "cached"
+
+
+def test_default_working_root(tmp_path, monkeypatch):
+    """A tmpfs is used when big enough, the environment variable wins"""
+    monkeypatch.delenv(files.WORKING_ROOT_VARIABLE, raising=False)
+    monkeypatch.setattr(files, "_TMPFS_CANDIDATES", (str(tmp_path),))
+
+    assert default_working_root(min_free_bytes=1) == str(tmp_path)
+    assert default_working_root(min_free_bytes=2**62) is None
+
+    monkeypatch.setenv(files.WORKING_ROOT_VARIABLE, "")
+    assert default_working_root(min_free_bytes=1) is None
+    monkeypatch.setenv(files.WORKING_ROOT_VARIABLE, "/scratch")
+    assert default_working_root() == "/scratch"
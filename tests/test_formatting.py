@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from aquacrop.utils.formatting import format_one_decimal
+
+
+def reference(columns, delimiter="\t"):
+    """Row by row f-string formatting the fast path must reproduce"""
+    return "\n".join(
+        delimiter.join(f"{value:.1f}" for value in row)
+        for row in zip(
+            *[np.asarray(column, dtype=float).tolist() for column in columns]
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        # Halves that are exact, and ones stored just below or above the half
+        [0.05, 0.15, 0.25, 0.35, 0.45, 1.45, 2.675, 9.95, 99.95],
+        [-0.05, -0.04, -0.0, 0.0, -123.45, 2.5e-17],
+        np.arange(-20000, 20000) / 100.0,
+        np.random.default_rng(0).normal(10.0, 8.0, 5000),
+        np.random.default_rng(1).uniform(-1, 1, 5000)
+        * 10.0 ** np.arange(-6, 13).repeat(5000 // 19 + 1)[:5000],
+    ],
+)
+def test_matches_fstring_formatting(values):
+    values = np.asarray(values, dtype=float)
+    assert format_one_decimal([values]) == reference([values])
+    assert format_one_decimal([values, values[::-1]], " ") == reference(
+        [values, values[::-1]], " "
+    )
+
+
+def test_non_finite_and_huge_values():
+    values = [np.nan, np.inf, -np.inf, 1e20, 3.0]
+    assert format_one_decimal([values]) == reference([values])
+
+
+def test_empty_and_mismatched_columns():
+    assert format_one_decimal([[]]) == ""
+    with pytest.raises(ValueError):
+        format_one_decimal([[1.0, 2.0], [1.0]])
@@ -0,0 +1,117 @@
+import glob
+import os
+import re
+
+import pytest
+
+from aquacrop import Irrigation
+from aquacrop.experiments.irrigation import event_ranges, optimize_irrigation
+from tests.conftest import ReferenceExecutor
+
+# Days of the crop stage responding to irrigation
+SENSITIVE_DAYS = range(30, 61)
+RAINFED_YIELD = 5.0
+YIELD_PER_MM = 0.05
+
+
+class ScheduleExecutor(ReferenceExecutor):
+    """
+    Reference backend simulating the yield of a fixed irrigation schedule
+
+    The seasons get the scheduled irrigation as 'Irri' and a yield growing
+    with the irrigation applied on SENSITIVE_DAYS as 'Y(dry)'.
+    """
+
+    def execute(self, working_dir, project=None, executable=None):
+        result = super().execute(working_dir, project, executable)
+        (irrigation_file,) = glob.glob(os.path.join(working_dir, "DATA", "*.IRR"))
+        with open(irrigation_file) as f:
+            events = [
+                (int(day), float(depth))
+                for day, depth, _ in re.findall(r"\n (\d+) (\d+) (\d+\.\d)", f.read())
+            ]
+        applied = sum(depth for _, depth in events)
+        sensitive = sum(depth for day, depth in events if day in SENSITIVE_DAYS)
+        values = {
+            "Irri": f"{applied:.1f}",
+            "Y(dry)": f"{RAINFED_YIELD + YIELD_PER_MM * sensitive:.3f}",
+        }
+
+        (season_file,) = glob.glob(os.path.join(working_dir, "OUTP", "*season.OUT"))
+        with open(season_file) as f:
+            lines = f.read().split("\n")
+        columns = lines[2].split()
+        for number, line in enumerate(lines):
+            if not line.lstrip().startswith("Tot("):
+                continue
+            fields = list(re.finditer(r"\s+\S+", line))
+            for name, value in values.items():
+                start, end = fields[columns.index(name)].span()
+                line = line[:start] + value.rjust(end - start) + line[end:]
+            lines[number] = line
+        with open(season_file, "w") as f:
+            f.write("\n".join(lines))
+        return result
+
+
+@pytest.fixture
+def scheduled(config):
+    """Config with two irrigation events and without executable"""
+    del config["executable_path"]
+    config["irrigation"] = Irrigation(
+        name="Two events",
+        description="Two sprinkler events",
+        params={
+            "irrigation_method": 1,
+            "surface_wetted": 100,
+            "irrigation_mode": 1,
+            "reference_day": -9,
+            "irrigation_events": [
+                {"day": 10, "depth": 20, "ec": 0.0},
+                {"day": 80, "depth": 20, "ec": 0.0},
+            ],
+        },
+    )
+    return config
+
+
+def test_optimize_irrigation_within_budget(scheduled):
+    """The budget goes to the sensitive days, over-budget schedules are not run"""
+    backend = ScheduleExecutor()
+    result = optimize_irrigation(
+        scheduled,
+        event_ranges(scheduled["irrigation"], days=(1, 90), depths=(0, 40)),
+        budget=60,
+        maximize="Y(dry)",
+        generations=40,
+        population_size=16,
+        seed=3,
+        workers=1,
+        backend=backend,
+        run_options={"validate_data": False},
+    )
+
+    assert result.feasible
+    assert result.outputs["Irri"] <= 60
+    assert result.outputs["Y(dry)"] >= RAINFED_YIELD + YIELD_PER_MM * 55
+    events = result.irrigation.params["irrigation_events"]
+    assert [event["day"] for event in events] == sorted(
+        event["day"] for event in events
+    )
+    assert result.rejected > 0
+    assert result.evaluations == len(backend.calls)
+    assert result.history == sorted(result.history, reverse=True)
+    # The base configuration is left untouched
+    assert scheduled["irrigation"].params["irrigation_events"][0]["day"] == 10
+
+
+def test_optimize_irrigation_options(scheduled):
+    """Only irrigation parameters of a mode 1 schedule are accepted"""
+    with pytest.raises(ValueError, match="Not irrigation parameters"):
+        optimize_irrigation(scheduled, {"crop.kc_max": (1.0, 1.2)})
+    scheduled["irrigation"].params["irrigation_mode"] = 3
+    with pytest.raises(ValueError, match="mode 1"):
+        event_ranges(scheduled["irrigation"], days=(1, 90))
+    del scheduled["irrigation"]
+    with pytest.raises(ValueError, match="needs an irrigation"):
+        optimize_irrigation(scheduled, {"irrigation.depletion_threshold": (20, 80)})
@@ -326,6 +326,26 @@ class TestOutputReader:
 
         # Day file might be named differently, so not checking for it
 
+    def test_scan_directory_prefix(self, test_files_dir, tmp_path):
+        """Test restricting a scan to the outputs of one project"""
+        import shutil
+
+        for filename in os.listdir(test_files_dir):
+            if filename.startswith("OttawaPRM") and "day" not in filename:
+                shutil.copy(os.path.join(test_files_dir, filename), tmp_path)
+                shutil.copy(
+                    os.path.join(test_files_dir, filename),
+                    tmp_path / filename.replace("OttawaPRM", "SundayPRM"),
+                )
+
+        reader = OutputReader().scan_directory(str(tmp_path), prefix="SundayPRM")
+
+        assert reader.output_files
+        assert all(name.startswith("SundayPRM") for name in reader.output_files)
+        # The project name must not decide the output type
+        assert reader.output_files["SundayPRMseason.OUT"].output_type == "season"
+        assert not reader.get_season_data().empty
+
     def test_get_season_data(self, output_reader):
         """Test getting season data from reader"""
         season_data = output_reader.get_season_data(project_name="Ottawa")
@@ -664,3 +684,217 @@ def test_output_integration(output_reader, day_file):
     evaluation_data = output_reader.get_evaluation_data(
         project_name="Ottawa", run_number=1, assessment_type="biomass"
     )
+
+
+def test_day_parsers_agree(day_file, tmp_path):
+    """The vectorized and the line by line day readers give the same frames"""
+    import shutil
+
+    # Renamed so that every run is parsed in full
+    path = str(tmp_path / "SitePRMday.OUT")
+    shutil.copy(day_file, path)
+    output_file = OutputFile("SitePRMday.OUT")
+
+    vectorized = output_file._parse_day_file(path)
+    line_by_line = output_file._parse_day_file(path, vectorized=False)
+
+    assert sorted(vectorized) == [1, 2, 3]
+    for run, frame in vectorized.items():
+        pd.testing.assert_frame_equal(frame, line_by_line[run], check_exact=True)
+    assert frame["Day"].dtype == np.int64
+    assert frame["Rain"].dtype == np.float64
+    assert frame.iloc[:, -1].isna().all()
+
+
+def test_day_parser_fused_values(day_file, tmp_path):
+    """Values run together fall back to the line by line reader"""
+    with open(day_file, "r") as f:
+        lines = f.read().split("\n")
+    first_data = next(i for i, line in enumerate(lines) if line.strip()[:1].isdigit())
+    # Make the last two values of a row touch each other
+    lines[first_data] = lines[first_data].rstrip()[:-8] + "-9.00-9.00"
+    path = str(tmp_path / "FusedPRMday.OUT")
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+    output_file = OutputFile("FusedPRMday.OUT")
+
+    vectorized = output_file._parse_day_file(path)
+    line_by_line = output_file._parse_day_file(path, vectorized=False)
+
+    pd.testing.assert_frame_equal(vectorized[1], line_by_line[1], check_exact=True)
+
+
+def test_daily_output_groups():
+    """The fewest (then smallest) output types holding the columns are chosen"""
+    from aquacrop.output import daily_output_groups
+
+    assert daily_output_groups(["CC", "Biomass", "Tr", "ET", "Z"]) == [1, 2]
+    assert daily_output_groups(["Z"]) == [3]
+    assert daily_output_groups(["WC(3.00)", "Wr(3.00)"]) == [3]
+    assert daily_output_groups(["Rain", "WC05"]) == [5, 7]
+    assert daily_output_groups(["Day", "DAP"]) == [7]
+
+    with pytest.raises(ValueError, match="Biomas"):
+        daily_output_groups(["Biomas"])
+
+
+def test_day_parser_projection(day_file, tmp_path):
+    """Projected columns hold the same values as in the full table"""
+    import shutil
+
+    path = str(tmp_path / "SitePRMday.OUT")
+    shutil.copy(day_file, path)
+    output_file = OutputFile("SitePRMday.OUT")
+    columns = ["CC", "Biomass", "Tr", "ET", "Z", "WC02"]
+
+    full = output_file._parse_day_file(path)
+    projected = output_file._parse_day_file(path, columns=columns)
+    line_by_line = output_file._parse_day_file(path, vectorized=False, columns=columns)
+
+    assert sorted(projected) == [1, 2, 3]
+    for run, frame in projected.items():
+        assert list(frame.columns) == ["Day", "Month", "Year", "DAP", "Stage"] + columns
+        pd.testing.assert_frame_equal(frame, line_by_line[run], check_exact=True)
+        for column in columns[:-1]:
+            pd.testing.assert_series_equal(frame[column], full[run][column])
+        # The 'WC 2' header field is read as one column, the 69th value
+        np.testing.assert_array_equal(frame["WC02"], full[run].iloc[:, 69])
+
+    with pytest.raises(ValueError, match="Bogus"):
+        output_file._parse_day_file(path, columns=["CC", "Bogus"])
+
+
+def test_day_parser_projection_partial_output(day_file, tmp_path):
+    """A daily output with only some output types is projected by name"""
+    from aquacrop.output import DAILY_OUTPUT_GROUPS, DAY_INDEX_COLUMNS
+
+    # Rebuild the file as written with output types 2 and 7 only
+    full = OutputFile("SitePRMday.OUT")._parse_day_file(day_file, vectorized=False)[1]
+    start = len(DAY_INDEX_COLUMNS) + len(DAILY_OUTPUT_GROUPS[1])
+    crop = list(range(start, start + len(DAILY_OUTPUT_GROUPS[2])))
+    climate = list(range(92, 98))
+    table = full.iloc[:, list(range(5)) + crop + climate]
+    header = list(DAY_INDEX_COLUMNS) + list(DAILY_OUTPUT_GROUPS[2])
+    header += list(DAILY_OUTPUT_GROUPS[7])
+    path = tmp_path / "PartPRMday.OUT"
+    path.write_text(
+        "AquaCrop 7.2\n\n   Run:   1\n   "
+        + " ".join(header)
+        + "\n"
+        + table.to_string(header=False, index=False)
+        + "\n"
+    )
+
+    frame = OutputFile("PartPRMday.OUT")._parse_day_file(
+        str(path), columns=["Tr", "CC", "ETo"]
+    )[1]
+
+    np.testing.assert_array_equal(frame["Tr"], full["Tr_1"])
+    np.testing.assert_array_equal(frame["CC"], full["CC"])
+    np.testing.assert_array_equal(frame["ETo"], full.iloc[:, 93])
+
+
+def test_simulation_results_are_lazy(test_files_dir, monkeypatch):
+    """Sections are parsed on first access only, and once"""
+    import pickle
+
+    from aquacrop.output import SimulationResults
+
+    owner = object()
+    results = SimulationResults(
+        test_files_dir,
+        prefix="OttawaPRM",
+        sections=["day", "season", "harvests"],
+        owner=owner,
+    )
+    assert results.parsed == ()
+
+    season = results["season"]
+    assert not season.empty
+    assert results.parsed == ("season",)
+    assert results["season"] is season
+    assert results["evaluation"] == {"biomass": None, "statistics": None}
+    assert sorted(results) == ["day", "evaluation", "harvests", "season"]
+
+    # Pickling (e.g. from a worker process) parses the remaining sections
+    restored = pickle.loads(pickle.dumps(results))
+    assert set(results.parsed) == {"day", "season", "harvests"}
+    assert results._owner is None
+    pd.testing.assert_frame_equal(restored["day"], results["day"])
+
+    def fail(self, *args, **kwargs):
+        raise AssertionError("results should not be parsed again")
+
+    monkeypatch.setattr(OutputReader, "scan_directory", fail)
+    assert restored["harvests"] is not None
+
+
+def test_iter_runs_streams_day_file(day_file, tmp_path):
+    """Runs are yielded one at a time with the same frames as a full parse"""
+    import shutil
+
+    from aquacrop.output import SimulationResults
+
+    path = str(tmp_path / "SitePRMday.OUT")
+    shutil.copy(day_file, path)
+
+    runs = OutputFile.iter_runs(path, columns=["CC", "Biomass"])
+    run, frame = next(runs)
+    assert run == 1
+    assert list(frame.columns)[5:] == ["CC", "Biomass"]
+
+    full = OutputFile("SitePRMday.OUT")._parse_day_file(path)
+    streamed = dict(SimulationResults(str(tmp_path), prefix="SitePRM").iter_day_runs())
+    assert sorted(streamed) == [1, 2, 3]
+    for run, frame in streamed.items():
+        pd.testing.assert_frame_equal(frame, full[run])
+
+
+def test_iter_runs_without_run_marker(day_file, tmp_path):
+    """A table without 'Run:' marker is read as run 1"""
+    with open(day_file, "r") as f:
+        content = f.read()
+    end = content.index("Run:", content.index("Run:") + 1)
+    path = tmp_path / "SinglePRMday.OUT"
+    path.write_text(content[:end].replace("Run:   1", ""))
+
+    runs = list(OutputFile.iter_runs(str(path)))
+
+    assert [run for run, _ in runs] == [1]
+    assert len(runs[0][1]) > 26
+
+
+def test_compact_dtypes(day_file, season_file, harvests_file):
+    """Compact mode picks small dtypes from the meaning of the columns"""
+    day = OutputFile.from_file(day_file, compact=True).get_data(1)
+    reference = OutputFile.from_file(day_file).get_data(1)
+
+    assert day["Day"].dtype == np.int8
+    assert day["Year"].dtype == np.int16
+    assert day["StExp"].dtype == np.int8
+    assert day["Biomass"].dtype == np.float32
+    assert day.iloc[:, -1].dtype == np.float32
+    np.testing.assert_allclose(day["Biomass"], reference["Biomass"], rtol=1e-6)
+    assert (
+        day.memory_usage(deep=True).sum() < reference.memory_usage(deep=True).sum() / 2
+    )
+
+    season = OutputFile.from_file(season_file, compact=True).get_data()
+    assert season["Project"].dtype == "category"
+    assert season["Y(dry)"].dtype == np.float32
+
+    harvests = OutputFile.from_file(harvests_file, compact=True).get_data(1)
+    assert harvests["Month"].dtype == np.int8
+
+
+def test_compact_integer_columns_widen():
+    """Integer columns are widened when the values do not fit their dtype"""
+    from aquacrop.output import compact_frame
+
+    df = compact_frame(
+        pd.DataFrame({"DAP": [1, 40000], "Stage": [1, 4], "X": [0, 300]})
+    )
+
+    assert df["DAP"].dtype == np.int32
+    assert df["Stage"].dtype == np.int8
+    assert df["X"].dtype == np.int16
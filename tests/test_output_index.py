@@ -0,0 +1,85 @@
+import os
+import shutil
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aquacrop.output import OutputFile
+from aquacrop.output_index import OutputIndex
+
+
+@pytest.fixture
+def day_file(tmp_path):
+    """Fixture providing a copy of the reference daily output (all runs parsed)"""
+    source = os.path.join(
+        os.path.dirname(__file__), "referenceFiles", "OUTP", "OttawaPRMday.OUT"
+    )
+    path = str(tmp_path / "SitePRMday.OUT")
+    shutil.copy(source, path)
+    return path
+
+
+def test_index_runs_and_rows(day_file):
+    """Every run and every dated row of the file is indexed"""
+    full = OutputFile("SitePRMday.OUT")._parse_day_file(day_file)
+
+    index = OutputIndex.build(day_file)
+
+    assert list(index.run_numbers) == [1, 2, 3]
+    assert len(index.row_offsets) == sum(len(df) for df in full.values())
+    first = full[1].iloc[0]
+    assert index.row_dates[0] == np.datetime64(
+        date(first["Year"], first["Month"], first["Day"])
+    )
+    with open(day_file, "rb") as f:
+        f.seek(index.row_offsets[0])
+        assert f.readline().split()[:3] == [b"21", b"5", b"2014"]
+
+
+def test_index_is_cached_next_to_file(day_file, monkeypatch):
+    """The cached index is reused until the file changes"""
+    OutputIndex.load(day_file)
+    assert os.path.exists(day_file + OutputIndex.SUFFIX)
+
+    def fail(cls, filepath):
+        raise AssertionError("index should come from the cache")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(OutputIndex, "build", classmethod(fail))
+        cached = OutputIndex.load(day_file)
+    assert list(cached.run_numbers) == [1, 2, 3]
+
+    # A modified file is indexed again
+    with open(day_file, "r") as f:
+        content = f.read()
+    with open(day_file, "w") as f:
+        f.write(content[: content.index("Run:", content.index("Run:") + 1)])
+    assert list(OutputIndex.load(day_file).run_numbers) == [1]
+
+
+def test_lazy_get_data_parses_one_run(day_file):
+    """A lazily loaded daily output parses only the requested run"""
+    eager = OutputFile.from_file(day_file)
+    lazy = OutputFile.from_file(day_file, lazy=True)
+
+    pd.testing.assert_frame_equal(lazy.get_data(3), eager.get_data(3))
+    assert lazy.data is None
+    assert lazy.get_data(7).empty
+
+
+def test_get_date_range(day_file):
+    """Date range queries return the rows of the period, by run"""
+    eager = OutputFile.from_file(day_file)
+    lazy = OutputFile.from_file(day_file, lazy=True, day_columns=["Biomass"])
+
+    june = lazy.get_date_range(date(2015, 6, 1), date(2015, 6, 30))
+
+    assert list(june) == [2]
+    assert len(june[2]) == 30
+    assert list(june[2].columns)[5:] == ["Biomass"]
+    assert (june[2]["Month"] == 6).all()
+    expected = eager.get_date_range(date(2015, 6, 1), date(2015, 6, 30), run_number=2)
+    pd.testing.assert_series_equal(june[2]["Biomass"], expected["Biomass"])
+    assert lazy.data is None
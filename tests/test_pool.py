@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from aquacrop import AquaCrop
+from aquacrop.aquacrop import WORKING_SUBDIRECTORIES
+from aquacrop.cache import InputFileCache
+from aquacrop.pool import WorkingDirPool
+from aquacrop.utils.files import write_text_file
+
+
+@pytest.fixture
+def executable(tmp_path):
+    """Fixture providing a small executable file standing in for AquaCrop"""
+    path = tmp_path / "aquacrop"
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def pool(executable, tmp_path):
+    """Fixture providing a pool of two working directories"""
+    with WorkingDirPool(
+        size=2, root=str(tmp_path / "pool"), executable_path=executable
+    ) as pool:
+        yield pool
+
+
+def test_pool_builds_working_dirs(pool):
+    """Every directory has the AquaCrop layout and the executable"""
+    with pool.lease() as first, pool.lease() as second:
+        assert first != second
+        for directory in (first, second):
+            for subdirectory in WORKING_SUBDIRECTORIES:
+                assert os.path.isdir(os.path.join(directory, subdirectory))
+            assert os.access(os.path.join(directory, "aquacrop"), os.X_OK)
+
+
+def test_lease_resets_directory(pool):
+    """Outputs are cleared and the executable restored, inputs are kept"""
+    with pool.lease() as directory:
+        with open(os.path.join(directory, "OUTP", "PROJECTPRMday.OUT"), "w") as f:
+            f.write("day")
+        with open(os.path.join(directory, "LIST", "PROJECT.PRM"), "w") as f:
+            f.write("project")
+        os.remove(os.path.join(directory, "aquacrop"))
+
+    # Lease both directories to be sure to get the one used above
+    with pool.lease() as first, pool.lease() as second:
+        for directory in (first, second):
+            assert os.listdir(os.path.join(directory, "OUTP")) == []
+            assert os.path.exists(os.path.join(directory, "aquacrop"))
+        assert os.listdir(os.path.join(first, "LIST")) + os.listdir(
+            os.path.join(second, "LIST")
+        ) == ["PROJECT.PRM"]
+
+
+def test_lease_keeps_unchanged_inputs(executable, tmp_path):
+    """Inputs written again with the same content are not replaced"""
+    path = os.path.join("DATA", "Ottawa.CRO")
+    with WorkingDirPool(
+        size=1, root=str(tmp_path / "pool"), executable_path=executable
+    ) as pool:
+        with pool.lease() as directory:
+            write_text_file(os.path.join(directory, path), "crop")
+        inode = os.stat(os.path.join(directory, path)).st_ino
+
+        for _ in range(2):
+            with pool.lease() as directory:
+                write_text_file(os.path.join(directory, path), "crop")
+                assert os.stat(os.path.join(directory, path)).st_ino == inode
+            # Still there for the next lease
+            assert os.path.exists(os.path.join(directory, path))
+
+        with pool.lease() as directory:
+            write_text_file(os.path.join(directory, path), "new crop")
+            with open(os.path.join(directory, path)) as f:
+                assert f.read() == "new crop"
+
+
+def test_lease_keeps_cached_inputs(config, executable, tmp_path):
+    """Inputs linked from the input cache are not removed between leases"""
+    del config["executable_path"]
+    cache = InputFileCache(str(tmp_path / "inputs"))
+    with WorkingDirPool(
+        size=1, root=str(tmp_path / "pool"), executable_path=executable
+    ) as pool:
+        for _ in range(3):
+            with pool.lease() as directory:
+                AquaCrop(
+                    working_dir=directory, input_cache=cache, **config
+                )._setup_working_dir()
+            assert os.path.exists(os.path.join(directory, "DATA", "Replay.CLI"))
+
+
+def test_lease_timeout(pool):
+    """Leasing from an exhausted pool times out"""
+    with pool.lease(), pool.lease():
+        with pytest.raises(TimeoutError):
+            with pool.lease(timeout=0.01):
+                pass
+
+
+def test_temporary_pool_is_removed():
+    """A pool without root cleans up its temporary directory"""
+    pool = WorkingDirPool(size=1)
+    root = pool.root
+    assert os.path.isdir(root)
+
+    pool.close()
+
+    assert not os.path.exists(root)
@@ -0,0 +1,131 @@
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aquacrop import Weather
+from aquacrop.regional import run_regional, site_periods
+from aquacrop.templates import ottawa_alfalfa, ottawa_management, ottawa_sandy_loam
+from tests.conftest import ReferenceExecutor
+
+# Y(dry) of the three seasons of the reference outputs
+REFERENCE_YIELDS = [9.014, 11.947, 12.579]
+CLIMATE = Weather(
+    location="Regional",
+    temperatures=[(10.0, 20.0)] * 30,
+    eto_values=[3.0] * 30,
+    rainfall_values=[1.0] * 30,
+    first_day=1,
+    first_month=5,
+    first_year=2014,
+)
+
+
+@pytest.fixture
+def sites():
+    """Site table of four cells, the third with an unknown soil"""
+    return pd.DataFrame(
+        {
+            "soil": ["sandy_loam", "sandy_loam", "peat", "sandy_loam"],
+            "weather": ["ottawa"] * 4,
+            "management": ["ottawa", None, "ottawa", None],
+            "planting_date": [date(2000, 5, 21)] * 4,
+            "lat": [45.3, 45.4, 45.5, 45.6],
+        },
+        index=["c0", "c1", "c2", "c3"],
+    )
+
+
+def test_site_periods():
+    """One period per year, from planting to the day before the next one"""
+    periods = site_periods(date(2000, 2, 29), [2014, 2015])
+
+    assert periods[0]["start_date"] == date(2014, 2, 28)
+    assert periods[0]["end_date"] == date(2015, 2, 27)
+    assert periods[1]["planting_date"] == date(2015, 2, 28)
+    assert site_periods("2000-05-01", [2014], 120)[0]["end_date"] == date(2014, 8, 28)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_regional(config, sites, workers):
+    """Season outputs are gathered by cell, year and variable"""
+    result = run_regional(
+        sites,
+        [2014, 2015, 2016],
+        ottawa_alfalfa,
+        {"sandy_loam": ottawa_sandy_loam},
+        {"ottawa": config["climate"]},
+        managements={"ottawa": ottawa_management},
+        variables=["Y(dry)", "Irri"],
+        chunk_size=3,
+        workers=workers,
+        config={"management": ottawa_management},
+        run_options={"validate_data": False},
+        backend=ReferenceExecutor(),
+    )
+
+    assert result.data.shape == (4, 3, 2)
+    assert result.data.dtype == np.float32
+    np.testing.assert_allclose(
+        result.variable("Y(dry)")[[0, 1, 3]], [REFERENCE_YIELDS] * 3, rtol=1e-6
+    )
+    assert np.isnan(result.data[2]).all()
+    assert list(result.errors) == ["c2"]
+    assert "peat" in result.errors["c2"]
+
+
+def _crashing_weather(key):
+    """Weather loader killing its worker process for the 'crash' key"""
+    if key == "crash":
+        os._exit(1)
+    return CLIMATE
+
+
+def test_run_regional_survives_worker_crash(sites):
+    """The sites of a crashed chunk are failed, gathered values are kept"""
+    sites["weather"] = ["ottawa", "ottawa", "ottawa", "crash"]
+    result = run_regional(
+        sites,
+        [2014],
+        ottawa_alfalfa,
+        {"sandy_loam": ottawa_sandy_loam},
+        _crashing_weather,
+        config={"management": ottawa_management},
+        chunk_size=1,
+        workers=2,
+        run_options={"validate_data": False},
+        backend=ReferenceExecutor(),
+    )
+
+    assert "c3" in result.errors
+    # Every cell has either its values or an error
+    done = ~np.isnan(result.data).all(axis=(1, 2))
+    assert all(
+        done[i] != (cell in result.errors) for i, cell in enumerate(result.cells)
+    )
+
+
+def test_run_regional_netcdf(config, sites, tmp_path):
+    """Results are exported with the numeric site columns as coordinates"""
+    xr = pytest.importorskip("xarray")
+    result = run_regional(
+        sites,
+        [2014, 2015],
+        ottawa_alfalfa,
+        {"sandy_loam": ottawa_sandy_loam, "peat": ottawa_sandy_loam},
+        {"ottawa": config["climate"]},
+        managements={"ottawa": ottawa_management},
+        config={"management": ottawa_management},
+        workers=1,
+        run_options={"validate_data": False},
+        backend=ReferenceExecutor(),
+    )
+
+    data = result.to_xarray()
+    assert data.dims == ("cell", "year", "variable")
+    assert list(data["lat"].values) == list(sites["lat"])
+    path = result.to_netcdf(str(tmp_path / "regional.nc"))
+    loaded = xr.open_dataarray(path)
+    np.testing.assert_allclose(loaded.values, result.data)
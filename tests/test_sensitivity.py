@@ -0,0 +1,145 @@
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from aquacrop.experiments.parameters import (
+    ParameterRange,
+    apply_parameters,
+    get_parameter,
+    parameter_ranges,
+)
+from aquacrop.experiments.sensitivity import (
+    morris_design,
+    morris_indices,
+    run_sensitivity,
+    saltelli_design,
+    sobol_indices,
+)
+from tests.conftest import ReferenceExecutor
+
+
+def ishigami(design: np.ndarray) -> np.ndarray:
+    """Ishigami function (a=7, b=0.1) of a unit design"""
+    x = -np.pi + 2 * np.pi * design
+    return (
+        np.sin(x[:, 0])
+        + 7 * np.sin(x[:, 1]) ** 2
+        + 0.1 * x[:, 2] ** 4 * np.sin(x[:, 0])
+    )
+
+
+def test_sobol_indices_of_ishigami():
+    """The estimates match the analytical indices of the Ishigami function"""
+    design = saltelli_design(3, 8192, seed=0)
+    assert design.shape == (8192 * 5, 3)
+
+    indices = sobol_indices(ishigami(design), 3, resamples=50, seed=0)
+
+    np.testing.assert_allclose(indices["S1"][0], [0.314, 0.442, 0.0], atol=0.05)
+    np.testing.assert_allclose(indices["ST"][0], [0.558, 0.442, 0.244], atol=0.05)
+    assert (indices["S1_conf"] > 0).all()
+
+
+def test_sobol_indices_skip_failed_runs():
+    """Base samples with a failed run are left out"""
+    design = saltelli_design(3, 2048, seed=1)
+    outputs = ishigami(design)
+    outputs[::7] = np.nan
+
+    indices = sobol_indices(outputs, 3, resamples=0)
+
+    assert set(indices) == {"S1", "ST"}
+    np.testing.assert_allclose(indices["ST"][0], [0.558, 0.442, 0.244], atol=0.1)
+
+
+def test_morris_design_and_indices():
+    """Trajectories move one parameter at a time, effects rank the parameters"""
+    levels = 4
+    design = morris_design(4, 20, levels=levels, seed=0)
+    assert design.shape == (20 * 5, 4)
+    assert design.min() >= 0 and design.max() <= 1
+
+    moves = np.diff(design.reshape(20, 5, 4), axis=1)
+    assert ((moves != 0).sum(axis=2) == 1).all()
+    delta = levels / (2 * (levels - 1))
+    np.testing.assert_allclose(np.abs(moves).sum(axis=2), delta)
+
+    outputs = design @ np.array([10.0, -5.0, 1.0, 0.0])
+    indices = morris_indices(design, np.column_stack([outputs, 2 * outputs]))
+
+    np.testing.assert_allclose(indices["mu"][0], [10.0, -5.0, 1.0, 0.0])
+    np.testing.assert_allclose(indices["mu_star"][1], [20.0, 10.0, 2.0, 0.0])
+    np.testing.assert_allclose(indices["sigma"], 0, atol=1e-9)
+
+
+def test_apply_parameters(config):
+    """Only the entities holding a changed parameter are copied"""
+    changed = apply_parameters(
+        config,
+        {
+            "crop.water_productivity": 18.5,
+            "soil.soil_layers.0.fc": 30.0,
+            "management.fertility_stress": 10,
+        },
+    )
+
+    assert changed["climate"] is config["climate"]
+    assert changed["crop"] is not config["crop"]
+    assert changed["crop"].params["water_productivity"] == 18.5
+    assert config["crop"].params["water_productivity"] != 18.5
+    assert get_parameter(changed, "soil.soil_layers.0.fc") == 30.0
+    assert get_parameter(config, "soil.soil_layers.0.fc") != 30.0
+
+    with pytest.raises(ValueError, match="not found"):
+        apply_parameters(config, {"crop.no_such_parameter": 1})
+
+    ranges = parameter_ranges(
+        {"crop.days_emergence": (2, 10), "crop.water_productivity": (15, 20)}, config
+    )
+    assert [parameter.integer for parameter in ranges] == [True, False]
+    with pytest.raises(ValueError, match="Empty range"):
+        parameter_ranges([ParameterRange("crop.kc_max", 1.2, 1.0)])
+
+
+class CropRecordingExecutor(ReferenceExecutor):
+    """Reference backend keeping the crop file of every run"""
+
+    def __init__(self):
+        super().__init__()
+        self.crop_files = []
+
+    def execute(self, working_dir, project=None, executable=None):
+        (crop_file,) = glob.glob(os.path.join(working_dir, "DATA", "*.CRO"))
+        with open(crop_file) as f:
+            self.crop_files.append(f.read())
+        return super().execute(working_dir, project, executable)
+
+
+def test_run_sensitivity(config):
+    """Every design row is run with its parameter values"""
+    del config["executable_path"]
+    backend = CropRecordingExecutor()
+
+    result = run_sensitivity(
+        config,
+        {"crop.water_productivity": (15, 20), "crop.kc_max": (1.0, 1.2)},
+        method="morris",
+        samples=3,
+        outputs=["Y(dry)", "BioMass"],
+        seed=0,
+        workers=1,
+        backend=backend,
+    )
+
+    assert result.outputs.shape == (3 * 3, 2)
+    assert not result.errors
+    assert len(backend.crop_files) == 9
+    assert len(set(backend.crop_files)) > 1
+    # The reference outputs do not depend on the parameters
+    np.testing.assert_allclose(result.indices["mu_star"], 0)
+    assert result.to_frame("mu_star").shape == (2, 2)
+
+    with pytest.raises(ValueError, match="Unknown method"):
+        run_sensitivity(config, {"crop.kc_max": (1.0, 1.2)}, method="fast")
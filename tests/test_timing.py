@@ -0,0 +1,99 @@
+import logging
+import pickle
+
+from aquacrop import AquaCrop
+from aquacrop.cache import ResultCache
+from aquacrop.executors import SubprocessExecutor
+from aquacrop.timing import PhaseTimer
+from tests.conftest import ReferenceExecutor
+
+
+def test_phase_timer():
+    """Phases are recorded with their details and passed to the hook"""
+    received = []
+    timer = PhaseTimer(hook=received.append)
+
+    with timer.phase("generate", entity="Crop") as details:
+        details["file"] = "Ottawa.CRO"
+    timer.add("generate", 0.5, entity="Soil")
+    timer.add("execute", 2.0)
+
+    assert received == timer.records
+    assert timer.records[0]["entity"] == "Crop"
+    assert timer.records[0]["file"] == "Ottawa.CRO"
+    assert timer.records[0]["seconds"] >= 0
+    assert timer.total("generate") >= 0.5
+    assert list(timer.summary()) == ["generate", "execute"]
+
+    restored = pickle.loads(pickle.dumps(timer))
+    assert restored.hook is None
+    assert restored.records == timer.records
+
+
+def test_run_records_phases(config, tmp_path, capsys, caplog):
+    """A quiet run prints nothing, logs its progress and times every phase"""
+    received = []
+    simulation = AquaCrop(
+        working_dir=str(tmp_path / "run"),
+        executor=ReferenceExecutor(),
+        timing_hook=received.append,
+        **config,
+    )
+
+    with caplog.at_level(logging.DEBUG, logger="aquacrop"):
+        results = simulation.run()
+        results.load()
+
+    assert capsys.readouterr().out == ""
+    assert any("completed successfully" in r.message for r in caplog.records)
+    assert any(r.name == "aquacrop.timing" for r in caplog.records)
+
+    assert results.timings is simulation.timer
+    assert received == results.timings.records
+    phases = [record["phase"] for record in results.timings]
+    assert phases[0] == "validation"
+    assert {"setup", "execute", "parse"} <= set(phases)
+
+    entities = {
+        record["entity"] for record in results.timings if record["phase"] == "generate"
+    }
+    assert {"Weather", "Crop", "Soil", "FieldManagement", "Project"} <= entities
+
+    execute = next(r for r in results.timings if r["phase"] == "execute")
+    assert execute["executor"] == "ReferenceExecutor"
+    assert execute["returncode"] == 0
+    parsed = {r["file"] for r in results.timings if r["phase"] == "parse"}
+    assert "PROJECTPRMseason.OUT" in parsed
+
+
+def test_cached_run_timings(config, tmp_path):
+    """Cache lookups are timed, and each run gets its own timings"""
+    simulation = AquaCrop(
+        working_dir=str(tmp_path / "run"),
+        executor=ReferenceExecutor(),
+        result_cache=ResultCache(str(tmp_path / "cache")),
+        **config,
+    )
+    first = simulation.run()
+    second = simulation.run()
+
+    assert first.timings is not second.timings
+    lookups = [r for r in second.timings if r["phase"] == "result_cache"]
+    assert [r["hit"] for r in lookups] == [True]
+    assert "execute" not in second.timings.summary()
+    assert [r["action"] for r in first.timings if r["phase"] == "result_cache"] == [
+        "get",
+        "put",
+    ]
+
+
+def test_subprocess_executor_cpu_time(tmp_path):
+    """The CPU time of the child process is reported"""
+    script = tmp_path / "busy.sh"
+    script.write_text("#!/bin/sh\ni=0\nwhile [ $i -lt 20000 ]; do i=$((i+1)); done\n")
+    script.chmod(0o755)
+
+    result = SubprocessExecutor().execute(str(tmp_path), executable=str(script))
+
+    assert result.returncode == 0
+    assert result.cpu_seconds is None or result.cpu_seconds > 0